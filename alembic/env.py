@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.core.database import Base
-from app.models import User, Protein, ProteinVersion, AuditLog
+from app.models import User, Protein, ProteinVersion, AuditLog, ImportJob, Job, SequenceIndexState, SequenceIndexBlock, KmerPosting, MotifScanHit, ClusterAssignment, SpectrumIndexState, SpectrumBlock, ProteinNeighbor
 from app.core.config import get_settings
 
 config = context.config
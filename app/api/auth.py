@@ -1,31 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.schemas.user import UserCreate, User, Token
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, AsyncAuthService
 from app.models.user import UserRole
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/register", response_model=User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = AuthService.get_user_by_email(db, email=user.email)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await AsyncAuthService.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    db_user = AuthService.get_user_by_username(db, username=user.username)
+    db_user = await AsyncAuthService.get_user_by_username(db, username=user.username)
     if db_user:
         raise HTTPException(status_code=400, detail="Username already taken")
 
-    return AuthService.create_user(db=db, user=user)
+    return await AsyncAuthService.create_user(db=db, user=user)
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = AuthService.authenticate_user(db, form_data.username, form_data.password)
+    user = await AsyncAuthService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
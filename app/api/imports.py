@@ -0,0 +1,91 @@
+import os
+import uuid
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.core.config import get_settings
+from app.core.database import get_async_db
+from app.schemas.import_job import ImportJob
+from app.services.import_service import AsyncImportService
+from app.services.job_service import AsyncJobService
+from app.utils.dependencies import get_current_active_user, require_role
+from app.models.user import User, UserRole
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+settings = get_settings()
+
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+FILE_TYPES = {".csv": "csv", ".xlsx": "xlsx", ".fasta": "fasta", ".fa": "fasta", ".faa": "fasta"}
+COMPRESSED_TYPES = {"fasta"}
+
+def _file_type(filename: str):
+    name = filename.lower()
+    compressed = name.endswith(".gz")
+    extension = os.path.splitext(name[:-3] if compressed else name)[1]
+    file_type = FILE_TYPES.get(extension)
+    if compressed and file_type not in COMPRESSED_TYPES:
+        return None, None
+    return file_type, extension + (".gz" if compressed else "")
+
+@router.post("/", response_model=ImportJob, status_code=202)
+async def create_import(
+    file: UploadFile = File(...),
+    validate_sequences: bool = Form(True),
+    validate_uniprot: bool = Form(False),
+    check_duplicates: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_role(UserRole.RESEARCHER))
+):
+    file_type, extension = _file_type(file.filename or "")
+    if not file_type:
+        raise HTTPException(status_code=400, detail="Only .csv, .xlsx and FASTA (.fasta, .fa, .faa, optionally .gz) files are supported")
+
+    upload_dir = os.path.join(settings.job_storage_dir, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, f"{uuid.uuid4().hex}{extension}")
+    with open(path, "wb") as out:
+        while block := await file.read(UPLOAD_BLOCK_SIZE):
+            out.write(block)
+
+    job = await AsyncImportService.create_job(
+        db,
+        filename=file.filename,
+        file_type=file_type,
+        options={
+            "validate_sequences": validate_sequences,
+            "validate_uniprot": validate_uniprot,
+            "check_duplicates": check_duplicates
+        },
+        user=current_user
+    )
+    queued = await AsyncJobService.enqueue(
+        db,
+        "import",
+        {"import_job_id": job.id, "path": path, "chunk_size": settings.import_chunk_size},
+        user=current_user
+    )
+    job.job_id = queued.id
+    await db.commit()
+    return job
+
+@router.get("/", response_model=List[ImportJob])
+async def list_imports(
+    skip: int = 0,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await AsyncImportService.list_jobs(db, skip=skip, limit=limit)
+
+@router.get("/{job_id}", response_model=ImportJob)
+async def get_import(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    job = await AsyncImportService.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
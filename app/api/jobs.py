@@ -0,0 +1,161 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.config import get_settings
+from app.core.database import get_async_db
+from app.models.job import JobStatus
+from app.schemas.job import Job, JobCreate, JobResult
+from app.schemas.sequence import MotifScanHit, ClusterMember
+from app.services.job_service import AsyncJobService, FINISHED_STATUSES
+from app.services.motif_scan_service import MotifScanService, AsyncMotifScanService
+from app.services.cluster_service import ClusterService, AsyncClusterService
+from app.utils.dependencies import get_current_active_user, require_role
+from app.models.user import User, UserRole
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+settings = get_settings()
+
+SIZE_PARAMS = ("workers", "chunk_size", "batch_size", "max_candidates")
+
+SUBMITTABLE_KINDS = {
+    "export", "quality_scan", "sequence_index", "duplicate_report", "sequence_hash_backfill",
+    "property_backfill", "sequence_store", "motif_scan", "sequence_cluster",
+    "kmer_spectrum", "vector_index", "protein_neighbors"
+}
+
+async def _get_owned_job(db: AsyncSession, job_id: int, user: User):
+    job = await AsyncJobService.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.created_by != user.id and user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return job
+
+@router.post("/", response_model=Job, status_code=202)
+async def create_job(
+    job: JobCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_role(UserRole.RESEARCHER))
+):
+    if job.kind not in SUBMITTABLE_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {job.kind}")
+    for key in SIZE_PARAMS:
+        value = job.params.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+            raise HTTPException(status_code=400, detail=f"{key} must be a positive integer")
+    if job.kind == "motif_scan":
+        try:
+            MotifScanService.motif_specs(
+                job.params.get("patterns"),
+                include_library=job.params.get("include_library", False),
+                library_path=settings.prosite_patterns_path
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if job.kind == "sequence_cluster":
+        try:
+            ClusterService.word_size(float(job.params.get("threshold", 0.9)), job.params.get("word_size"))
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await AsyncJobService.enqueue(db, job.kind, job.params, user=current_user)
+
+@router.get("/", response_model=List[Job])
+async def list_jobs(
+    skip: int = 0,
+    limit: int = 50,
+    kind: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    owner = None if current_user.role == UserRole.ADMIN else current_user
+    return await AsyncJobService.list_jobs(db, skip=skip, limit=limit, kind=kind, status=status, user=owner)
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await _get_owned_job(db, job_id, current_user)
+
+@router.post("/{job_id}/cancel", response_model=Job)
+async def cancel_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.status in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status.value}")
+
+    return await AsyncJobService.request_cancel(db, job_id)
+
+@router.get("/{job_id}/result", response_model=JobResult)
+async def get_job_result(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+    return job
+
+@router.get("/{job_id}/motif-hits", response_model=List[MotifScanHit])
+async def list_motif_hits(
+    job_id: int,
+    pattern: Optional[str] = None,
+    protein_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.kind != "motif_scan":
+        raise HTTPException(status_code=400, detail="Job is not a motif scan")
+
+    return await AsyncMotifScanService.list_hits(
+        db, job_id, pattern=pattern, protein_id=protein_id, skip=skip, limit=limit
+    )
+
+@router.get("/{job_id}/clusters", response_model=List[ClusterMember])
+async def list_cluster_members(
+    job_id: int,
+    representative_id: Optional[int] = None,
+    protein_id: Optional[int] = None,
+    representatives_only: bool = False,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.kind != "sequence_cluster":
+        raise HTTPException(status_code=400, detail="Job is not a sequence clustering")
+
+    return await AsyncClusterService.list_members(
+        db, job_id, representative_id=representative_id, protein_id=protein_id,
+        representatives_only=representatives_only, skip=skip, limit=limit
+    )
+
+@router.get("/{job_id}/download")
+async def download_job_result(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+
+    result = job.result or {}
+    if not result.get("path") or not os.path.exists(result["path"]):
+        raise HTTPException(status_code=404, detail="Job has no downloadable result")
+
+    return FileResponse(result["path"], media_type=result.get("media_type"), filename=result.get("filename"))
@@ -2,8 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from app.api import auth, proteins
+from app.api import auth, proteins, imports, jobs, sequences
 from app.core.rate_limiter import limiter
+from app.core.cache import cache
 
 app = FastAPI(
     title="Protein Lab API",
@@ -20,10 +21,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(proteins.router, prefix="/api")
+app.include_router(imports.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(sequences.router, prefix="/api")
 
 @app.get("/")
 def root():
@@ -32,3 +37,7 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics/cache")
+def cache_metrics():
+    return {**cache.stats.snapshot(), "local_entries": len(cache.local)}
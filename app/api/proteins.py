@@ -1,39 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.database import get_db
-from app.schemas.protein import Protein, ProteinCreate, ProteinUpdate, ProteinSearch
-from app.services.protein_service import ProteinService
+from app.core.database import get_async_db, SessionLocal
+from app.schemas.protein import (
+    Protein, ProteinCreate, ProteinUpdate, ProteinBulkResponse, ProteinSearch, ProteinSort, ProteinView, ProteinFormat,
+    ProteinNeighbor, parse_protein_fields
+)
+from app.services.protein_service import ProteinService, AsyncProteinService
+from app.services.protein_neighbor_service import AsyncProteinNeighborService
+from app.services.vector_index_service import VectorIndexService
+from app.utils.streaming import iter_ndjson, iter_csv
+from app.utils.sequence_tools import SequenceTools
 from app.utils.dependencies import get_current_active_user, require_role
 from app.models.user import User, UserRole
 
 router = APIRouter(prefix="/proteins", tags=["proteins"])
 
 @router.post("/", response_model=Protein)
-def create_protein(
+async def create_protein(
     protein: ProteinCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_role(UserRole.RESEARCHER))
 ):
-    existing = ProteinService.get_protein_by_uniprot_id(db, protein.uniprot_id)
+    existing = await AsyncProteinService.get_protein_by_uniprot_id(db, protein.uniprot_id)
     if existing:
         raise HTTPException(status_code=400, detail="Protein with this UniProt ID already exists")
 
-    return ProteinService.create_protein(db=db, protein=protein, user=current_user)
+    return await AsyncProteinService.create_protein(db=db, protein=protein, user=current_user)
 
-@router.get("/", response_model=List[Protein])
-def list_proteins(
+@router.post("/bulk", response_model=ProteinBulkResponse)
+async def bulk_create_proteins(
+    proteins: List[ProteinCreate],
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_role(UserRole.RESEARCHER))
+):
+    results = await AsyncProteinService.bulk_create(
+        db=db, proteins=proteins, user=current_user, chunk_size=chunk_size
+    )
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"created": created, "conflicts": len(results) - created, "results": results}
+
+@router.get("/", response_model=None)
+async def list_proteins(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    sort: ProteinSort = ProteinSort.ID,
+    fields: Optional[str] = None,
+    view: ProteinView = ProteinView.SUMMARY,
+    output_format: ProteinFormat = Query(ProteinFormat.JSON, alias="format"),
     query: Optional[str] = None,
     organism: Optional[str] = None,
     protein_family: Optional[str] = None,
     gene_name: Optional[str] = None,
     min_length: Optional[int] = None,
     max_length: Optional[int] = None,
+    min_molecular_weight: Optional[float] = None,
+    max_molecular_weight: Optional[float] = None,
+    min_isoelectric_point: Optional[float] = None,
+    max_isoelectric_point: Optional[float] = None,
+    min_gravy: Optional[float] = None,
+    max_gravy: Optional[float] = None,
+    min_instability_index: Optional[float] = None,
+    max_instability_index: Optional[float] = None,
+    min_aromaticity: Optional[float] = None,
+    max_aromaticity: Optional[float] = None,
     has_pdb: Optional[bool] = None,
     is_validated: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     search = ProteinSearch(
@@ -43,31 +81,98 @@ def list_proteins(
         gene_name=gene_name,
         min_length=min_length,
         max_length=max_length,
+        min_molecular_weight=min_molecular_weight,
+        max_molecular_weight=max_molecular_weight,
+        min_isoelectric_point=min_isoelectric_point,
+        max_isoelectric_point=max_isoelectric_point,
+        min_gravy=min_gravy,
+        max_gravy=max_gravy,
+        min_instability_index=min_instability_index,
+        max_instability_index=max_instability_index,
+        min_aromaticity=min_aromaticity,
+        max_aromaticity=max_aromaticity,
         has_pdb=has_pdb,
         is_validated=is_validated
     )
-    return ProteinService.get_proteins(db=db, skip=skip, limit=limit, search=search)
+
+    try:
+        selected_fields = parse_protein_fields(fields, view)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    after_key = None
+    if after:
+        try:
+            after_key = ProteinService.decode_cursor(after, sort)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    if output_format != ProteinFormat.JSON:
+        return _stream_proteins(output_format, skip, limit, search, sort, after_key, selected_fields)
+
+    limit = limit or 100
+    page = await AsyncProteinService.list_protein_data(
+        db=db, skip=skip, limit=limit, search=search, sort=sort, after=after_key,
+        fields=selected_fields
+    )
+
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+def _stream_proteins(output_format, skip, limit, search, sort, after_key, fields):
+    def rows():
+        db = SessionLocal()
+        try:
+            yield from ProteinService.stream_proteins(
+                db=db, skip=skip, limit=limit, search=search, sort=sort, after=after_key,
+                fields=fields
+            )
+        finally:
+            db.close()
+
+    if output_format == ProteinFormat.CSV:
+        return StreamingResponse(
+            iter_csv(rows(), fields),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=proteins.csv"}
+        )
+    return StreamingResponse(iter_ndjson(rows(), fields), media_type="application/x-ndjson")
+
+@router.get("/by-sequence", response_model=List[Protein])
+async def get_proteins_by_sequence(
+    sequence: Optional[str] = None,
+    sequence_hash: Optional[str] = Query(None, pattern="^[0-9a-fA-F]{64}$"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if bool(sequence) == bool(sequence_hash):
+        raise HTTPException(status_code=400, detail="Provide exactly one of sequence or sequence_hash")
+
+    digest = SequenceTools.sequence_hash(sequence) if sequence else sequence_hash.lower()
+    return await AsyncProteinService.get_proteins_by_sequence_hash(db, digest, limit=limit)
 
 @router.get("/{protein_id}", response_model=Protein)
-def get_protein(
+async def get_protein(
     protein_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    protein = ProteinService.get_protein(db, protein_id=protein_id)
+    protein = await AsyncProteinService.get_protein_data(db, protein_id=protein_id)
     if not protein:
         raise HTTPException(status_code=404, detail="Protein not found")
     return protein
 
 @router.put("/{protein_id}", response_model=Protein)
-def update_protein(
+async def update_protein(
     protein_id: int,
     protein_update: ProteinUpdate,
     change_description: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_role(UserRole.RESEARCHER))
 ):
-    protein = ProteinService.update_protein(
+    protein = await AsyncProteinService.update_protein(
         db=db,
         protein_id=protein_id,
         protein_update=protein_update,
@@ -79,21 +184,53 @@ def update_protein(
     return protein
 
 @router.delete("/{protein_id}")
-def delete_protein(
+async def delete_protein(
     protein_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
-    success = ProteinService.delete_protein(db=db, protein_id=protein_id, user=current_user)
+    success = await AsyncProteinService.delete_protein(db=db, protein_id=protein_id, user=current_user)
     if not success:
         raise HTTPException(status_code=404, detail="Protein not found")
     return {"message": "Protein deleted successfully"}
 
+def _neighbors(protein_id: int, k: int):
+    db = SessionLocal()
+    try:
+        return VectorIndexService.neighbors(db, protein_id, k=k)
+    finally:
+        db.close()
+
+@router.get("/{protein_id}/neighbors", response_model=List[ProteinNeighbor])
+async def get_protein_neighbors(
+    protein_id: int,
+    k: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        neighbors = await run_in_threadpool(_neighbors, protein_id, k)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if neighbors is None:
+        raise HTTPException(status_code=404, detail="Protein not found")
+    return neighbors
+
+@router.get("/{protein_id}/related", response_model=List[ProteinNeighbor])
+async def get_related_proteins(
+    protein_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    related = await AsyncProteinNeighborService.related(db, protein_id)
+    if not related and not await AsyncProteinService.get_protein(db, protein_id):
+        raise HTTPException(status_code=404, detail="Protein not found")
+    return related
+
 @router.get("/{protein_id}/versions")
-def get_protein_versions(
+async def get_protein_versions(
     protein_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    versions = ProteinService.get_protein_versions(db=db, protein_id=protein_id)
+    versions = await AsyncProteinService.get_protein_versions(db=db, protein_id=protein_id)
     return versions
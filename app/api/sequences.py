@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import List
+from app.core.database import SessionLocal
+from app.core.config import get_settings
+from app.schemas.sequence import (
+    SequenceSearchRequest, SequenceSearchResponse, DuplicateCheckRequest, DuplicateMatch, MotifScanRequest, MotifHit,
+    SequencePropertiesRequest, SequenceProperties, MultipleAlignmentRequest, MultipleAlignmentResponse,
+    SpectrumSimilarityRequest, SpectrumSimilarityResponse
+)
+from app.services.duplicate_service import DuplicateService
+from app.services.kmer_spectrum_service import KmerSpectrumService
+from app.services.sequence_search_service import SequenceSearchService, IndexNotBuilt
+from app.utils.sequence_tools import SequenceTools
+from app.utils.validators import ProteinValidator
+from app.utils.dependencies import get_current_active_user
+from app.models.user import User
+
+router = APIRouter(prefix="/sequences", tags=["sequences"])
+
+settings = get_settings()
+
+def _search(request: SequenceSearchRequest):
+    db = SessionLocal()
+    try:
+        return SequenceSearchService.search(
+            db, request.sequence, evalue_threshold=request.evalue, max_hits=request.max_hits
+        )
+    finally:
+        db.close()
+
+def _find_duplicates(request: DuplicateCheckRequest):
+    db = SessionLocal()
+    try:
+        return DuplicateService.find_duplicates(db, request.sequence, threshold=request.threshold, limit=request.limit)
+    finally:
+        db.close()
+
+def _similar(request: SpectrumSimilarityRequest):
+    db = SessionLocal()
+    try:
+        return KmerSpectrumService.rank(
+            db, request.sequences, request.protein_ids, metric=request.metric.value, limit=request.limit,
+            min_score=request.min_score
+        )
+    finally:
+        db.close()
+
+@router.post("/search", response_model=SequenceSearchResponse)
+async def search_sequences(
+    request: SequenceSearchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        return await run_in_threadpool(_search, request)
+    except IndexNotBuilt as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/similar", response_model=SpectrumSimilarityResponse)
+async def find_similar(
+    request: SpectrumSimilarityRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        return await run_in_threadpool(_similar, request)
+    except IndexNotBuilt as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/duplicates", response_model=List[DuplicateMatch])
+async def find_duplicates(
+    request: DuplicateCheckRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    return await run_in_threadpool(_find_duplicates, request)
+
+@router.post("/motifs", response_model=List[MotifHit])
+async def find_motifs(
+    request: MotifScanRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        return await run_in_threadpool(
+            SequenceTools.find_motifs,
+            request.sequence,
+            request.patterns,
+            request.include_library,
+            settings.prosite_patterns_path
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/properties", response_model=List[SequenceProperties])
+async def calculate_properties(
+    request: SequencePropertiesRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    return await run_in_threadpool(ProteinValidator.calculate_properties_batch, request.sequences)
+
+@router.post("/msa", response_model=MultipleAlignmentResponse)
+async def align_sequences(
+    request: MultipleAlignmentRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        return await run_in_threadpool(
+            SequenceTools.align_multiple,
+            [item.sequence for item in request.sequences],
+            [item.id for item in request.sequences],
+            request.tree.value,
+            gap_open=request.gap_open,
+            gap_extend=request.gap_extend,
+            workers=settings.msa_workers or None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,54 +1,490 @@
-import redis
+import asyncio
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
 from functools import wraps
-import json
-import pickle
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.core.config import get_settings
 
 settings = get_settings()
 
 try:
     redis_client = redis.from_url(settings.redis_url, decode_responses=False)
-except:
+    async_redis_client = aioredis.from_url(settings.redis_url, decode_responses=False)
+except Exception:
     redis_client = None
+    async_redis_client = None
+
+_MISSING = object()
 
 def get_redis():
     return redis_client
 
-def cache_result(expire: int = 300, key_prefix: str = ""):
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            if not redis_client:
-                return func(*args, **kwargs)
+def get_async_redis():
+    return async_redis_client
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(exclude_none=True)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+def make_key(prefix: str, *args, **kwargs) -> str:
+    args = [arg for arg in args if not isinstance(arg, (Session, AsyncSession))]
+    kwargs = {
+        name: value for name, value in kwargs.items()
+        if not isinstance(value, (Session, AsyncSession))
+    }
+    payload = orjson.dumps([args, kwargs], default=_canonical, option=orjson.OPT_SORT_KEYS)
+    return f"cache:{prefix}:{hashlib.sha256(payload).hexdigest()[:32]}"
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_canonical, option=orjson.OPT_NON_STR_KEYS)
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.compute_seconds = 0.0
+        self.lookup_seconds = 0.0
+
+    def record(self, name: str, amount: float = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.local_hits + self.redis_hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+                "avg_lookup_ms": round(self.lookup_seconds / lookups * 1000, 3) if lookups else 0.0,
+                "avg_compute_ms": round(self.compute_seconds / self.misses * 1000, 3) if self.misses else 0.0,
+            }
+
+class LRUCache:
+    def __init__(self, max_entries: int = 10000, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class TwoTierCache:
+    def __init__(
+        self,
+        local: LRUCache,
+        client: Optional[redis.Redis] = None,
+        async_client: Optional[aioredis.Redis] = None,
+        lock_timeout: float = 10.0,
+        lock_poll_interval: float = 0.05
+    ):
+        self.local = local
+        self.client = client
+        self.async_client = async_client
+        self.lock_timeout = lock_timeout
+        self.lock_poll_interval = lock_poll_interval
+        self.stats = CacheStats()
+        self._thread_locks: Dict[str, threading.Lock] = {}
+        self._async_locks: Dict[str, asyncio.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._generations: Dict[str, Tuple[float, int]] = {}
+        self._generations_guard = threading.Lock()
+
+    def _thread_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._thread_locks.setdefault(key, threading.Lock())
+
+    def _async_lock(self, key: str) -> asyncio.Lock:
+        with self._locks_guard:
+            return self._async_locks.setdefault(key, asyncio.Lock())
+
+    def _release_lock(self, key: str, locks: Dict[str, Any], lock: Any):
+        with self._locks_guard:
+            if locks.get(key) is lock and not lock.locked():
+                del locks[key]
+
+    def _local_generations(self, tags: Sequence[str]) -> Dict[str, int]:
+        now = time.monotonic()
+        found = {}
+        with self._generations_guard:
+            for tag in tags:
+                entry = self._generations.get(tag)
+                if entry is not None and entry[0] >= now:
+                    found[tag] = entry[1]
+        return found
+
+    def _remember_generations(self, generations: Dict[str, int]):
+        expires_at = time.monotonic() + self.local.ttl
+        with self._generations_guard:
+            for tag, generation in generations.items():
+                self._generations[tag] = (expires_at, generation)
+
+    def generations(self, tags: Sequence[str]) -> List[int]:
+        known = self._local_generations(tags)
+        missing = [tag for tag in tags if tag not in known]
+        if missing:
+            values = [None] * len(missing)
+            if self.client is not None:
+                try:
+                    values = self.client.mget([f"cachegen:{tag}" for tag in missing])
+                except Exception:
+                    self.stats.record("errors")
+            fetched = {tag: int(value or 0) for tag, value in zip(missing, values)}
+            self._remember_generations(fetched)
+            known.update(fetched)
+        return [known[tag] for tag in tags]
+
+    async def agenerations(self, tags: Sequence[str]) -> List[int]:
+        known = self._local_generations(tags)
+        missing = [tag for tag in tags if tag not in known]
+        if missing:
+            values = [None] * len(missing)
+            if self.async_client is not None:
+                try:
+                    values = await self.async_client.mget([f"cachegen:{tag}" for tag in missing])
+                except Exception:
+                    self.stats.record("errors")
+            fetched = {tag: int(value or 0) for tag, value in zip(missing, values)}
+            self._remember_generations(fetched)
+            known.update(fetched)
+        return [known[tag] for tag in tags]
+
+    def invalidate_tags(self, *tags: str):
+        bumped = None
+        if self.client is not None and tags:
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.incr(f"cachegen:{tag}")
+                bumped = dict(zip(tags, pipe.execute()))
+            except Exception:
+                self.stats.record("errors")
+        self._bump_local(tags, bumped)
+
+    async def ainvalidate_tags(self, *tags: str):
+        bumped = None
+        if self.async_client is not None and tags:
+            try:
+                pipe = self.async_client.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.incr(f"cachegen:{tag}")
+                bumped = dict(zip(tags, await pipe.execute()))
+            except Exception:
+                self.stats.record("errors")
+        self._bump_local(tags, bumped)
+
+    def _bump_local(self, tags: Sequence[str], bumped: Optional[Dict[str, int]]):
+        if bumped is None:
+            current = self._local_generations(tags)
+            bumped = {tag: current.get(tag, 0) + 1 for tag in tags}
+        self._remember_generations(bumped)
 
-            cache_key = f"{key_prefix}:{func.__name__}:{str(args)}:{str(kwargs)}"
+    @staticmethod
+    def tagged_key(key: str, generations: Sequence[int]) -> str:
+        if not generations:
+            return key
+        return f"{key}:g{'.'.join(str(generation) for generation in generations)}"
 
+    def get(self, key: str) -> Any:
+        started = time.perf_counter()
+        try:
+            data = self.local.get(key)
+            if data is not None:
+                self.stats.record("local_hits")
+                return loads(data)
+
+            if self.client is not None:
+                try:
+                    data = self.client.get(key)
+                except Exception:
+                    self.stats.record("errors")
+                    data = None
+                if data is not None:
+                    self.local.set(key, data)
+                    self.stats.record("redis_hits")
+                    return loads(data)
+
+            return _MISSING
+        finally:
+            self.stats.record("lookup_seconds", time.perf_counter() - started)
+
+    async def aget(self, key: str) -> Any:
+        started = time.perf_counter()
+        try:
+            data = self.local.get(key)
+            if data is not None:
+                self.stats.record("local_hits")
+                return loads(data)
+
+            if self.async_client is not None:
+                try:
+                    data = await self.async_client.get(key)
+                except Exception:
+                    self.stats.record("errors")
+                    data = None
+                if data is not None:
+                    self.local.set(key, data)
+                    self.stats.record("redis_hits")
+                    return loads(data)
+
+            return _MISSING
+        finally:
+            self.stats.record("lookup_seconds", time.perf_counter() - started)
+
+    def set(self, key: str, value: Any, ttl: int):
+        data = dumps(value)
+        self.local.set(key, data, ttl)
+        if self.client is not None:
+            try:
+                self.client.set(key, data, ex=ttl)
+            except Exception:
+                self.stats.record("errors")
+
+    async def aset(self, key: str, value: Any, ttl: int):
+        data = dumps(value)
+        self.local.set(key, data, ttl)
+        if self.async_client is not None:
             try:
-                cached = redis_client.get(cache_key)
-                if cached:
-                    return pickle.loads(cached)
-            except:
-                pass
+                await self.async_client.set(key, data, ex=ttl)
+            except Exception:
+                self.stats.record("errors")
 
-            result = func(*args, **kwargs)
+    def delete(self, *keys: str):
+        for key in keys:
+            self.local.delete(key)
+        if self.client is not None and keys:
+            try:
+                self.client.delete(*keys)
+            except Exception:
+                self.stats.record("errors")
 
+    async def adelete(self, *keys: str):
+        for key in keys:
+            self.local.delete(key)
+        if self.async_client is not None and keys:
             try:
-                redis_client.setex(cache_key, expire, pickle.dumps(result))
-            except:
-                pass
+                await self.async_client.delete(*keys)
+            except Exception:
+                self.stats.record("errors")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: int) -> Any:
+        value = self.get(key)
+        if value is not _MISSING:
+            return value
+
+        lock = self._thread_lock(key)
+        try:
+            with lock:
+                value = self.get(key)
+                if value is not _MISSING:
+                    return value
+
+                owns_lock = self._acquire_distributed(key)
+                if not owns_lock:
+                    value = self._wait_for_value(key)
+                    if value is not _MISSING:
+                        return value
+
+                try:
+                    return self._compute_and_store(key, compute, ttl)
+                finally:
+                    if owns_lock:
+                        self._release_distributed(key)
+        finally:
+            self._release_lock(key, self._thread_locks, lock)
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        value = await self.aget(key)
+        if value is not _MISSING:
+            return value
+
+        lock = self._async_lock(key)
+        try:
+            async with lock:
+                value = await self.aget(key)
+                if value is not _MISSING:
+                    return value
+
+                owns_lock = await self._aacquire_distributed(key)
+                if not owns_lock:
+                    value = await self._await_value(key)
+                    if value is not _MISSING:
+                        return value
+
+                try:
+                    started = time.perf_counter()
+                    value = await compute()
+                    self.stats.record("misses")
+                    self.stats.record("compute_seconds", time.perf_counter() - started)
+                    await self.aset(key, value, ttl)
+                    return loads(dumps(value))
+                finally:
+                    if owns_lock:
+                        await self._arelease_distributed(key)
+        finally:
+            self._release_lock(key, self._async_locks, lock)
 
-            return result
+    def _compute_and_store(self, key: str, compute: Callable[[], Any], ttl: int) -> Any:
+        started = time.perf_counter()
+        value = compute()
+        self.stats.record("misses")
+        self.stats.record("compute_seconds", time.perf_counter() - started)
+        self.set(key, value, ttl)
+        return loads(dumps(value))
+
+    def _acquire_distributed(self, key: str) -> bool:
+        if self.client is None:
+            return True
+        try:
+            return bool(self.client.set(f"lock:{key}", b"1", nx=True, px=int(self.lock_timeout * 1000)))
+        except Exception:
+            self.stats.record("errors")
+            return True
+
+    async def _aacquire_distributed(self, key: str) -> bool:
+        if self.async_client is None:
+            return True
+        try:
+            return bool(await self.async_client.set(f"lock:{key}", b"1", nx=True, px=int(self.lock_timeout * 1000)))
+        except Exception:
+            self.stats.record("errors")
+            return True
+
+    def _release_distributed(self, key: str):
+        try:
+            self.client.delete(f"lock:{key}")
+        except Exception:
+            self.stats.record("errors")
+
+    async def _arelease_distributed(self, key: str):
+        try:
+            await self.async_client.delete(f"lock:{key}")
+        except Exception:
+            self.stats.record("errors")
+
+    def _wait_for_value(self, key: str) -> Any:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.lock_poll_interval)
+            value = self.get(key)
+            if value is not _MISSING:
+                return value
+        return _MISSING
+
+    async def _await_value(self, key: str) -> Any:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.lock_poll_interval)
+            value = await self.aget(key)
+            if value is not _MISSING:
+                return value
+        return _MISSING
+
+cache = TwoTierCache(
+    LRUCache(max_entries=settings.cache_local_max_entries, ttl=settings.cache_local_ttl),
+    client=redis_client,
+    async_client=async_redis_client
+)
+
+def cache_result(expire: int = 300, key_prefix: str = "", tags: Sequence[str] = ()):
+    def decorator(func: Callable) -> Callable:
+        prefix = f"{key_prefix}:{func.__qualname__}" if key_prefix else func.__qualname__
+        signature = inspect.signature(func)
+
+        def bind(*args, **kwargs) -> Dict[str, Any]:
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+
+        def cache_key(*args, **kwargs) -> str:
+            return make_key(prefix, **bind(*args, **kwargs))
+
+        def cache_tags(*args, **kwargs) -> List[str]:
+            arguments = bind(*args, **kwargs)
+            return [tag.format(**arguments) for tag in tags]
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = cache_key(*args, **kwargs)
+                if tags:
+                    key = cache.tagged_key(key, await cache.agenerations(cache_tags(*args, **kwargs)))
+                return await cache.aget_or_compute(key, lambda: func(*args, **kwargs), expire)
+            async_wrapper.cache_key = cache_key
+            async_wrapper.cache_tags = cache_tags
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(*args, **kwargs)
+            if tags:
+                key = cache.tagged_key(key, cache.generations(cache_tags(*args, **kwargs)))
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs), expire)
+        wrapper.cache_key = cache_key
+        wrapper.cache_tags = cache_tags
         return wrapper
     return decorator
 
-def invalidate_cache(pattern: str):
-    if not redis_client:
-        return
+def invalidate_tags(*tags: str):
+    cache.invalidate_tags(*tags)
 
-    try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
-    except:
-        pass
+async def ainvalidate_tags(*tags: str):
+    await cache.ainvalidate_tags(*tags)
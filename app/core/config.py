@@ -1,9 +1,41 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     database_url: str
+    async_database_url: Optional[str] = None
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
     redis_url: str
+    cache_local_max_entries: int = 10000
+    cache_local_ttl: int = 5
+    import_chunk_size: int = 5000
+    job_storage_dir: str = "data/jobs"
+    job_poll_interval: int = 5
+    job_stale_after: int = 300
+    job_max_attempts: int = 3
+    job_worker_concurrency: int = 1
+    job_max_workers: int = 0
+    job_merge_limit: int = 10000
+    sequence_index_block_size: int = 50000
+    sequence_search_candidates: int = 500
+    sequence_store_dir: str = "data/sequence_store"
+    duplicate_identity_threshold: float = 0.95
+    prosite_patterns_path: Optional[str] = None
+    motif_scan_chunk_size: int = 2000
+    motif_scan_workers: int = 0
+    motif_scan_max_chunk_size: int = 20000
+    msa_workers: int = 0
+    cluster_batch_size: int = 2000
+    cluster_workers: int = 0
+    cluster_max_batch_size: int = 20000
+    cluster_max_candidates: int = 200
+    kmer_spectrum_block_size: int = 50000
+    kmer_spectrum_cache_blocks: int = 64
+    vector_index_dir: str = "data/vector_index"
+    vector_index_probes: int = 16
+    protein_neighbors_k: int = 10
     openai_api_key: str
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
@@ -1,5 +1,14 @@
 from app.models.user import User
 from app.models.protein import Protein, ProteinVersion
 from app.models.audit_log import AuditLog
+from app.models.import_job import ImportJob
+from app.models.job import Job
+from app.models.sequence_index import SequenceIndexState, SequenceIndexBlock, KmerPosting
+from app.models.motif_scan import MotifScanHit
+from app.models.cluster import ClusterAssignment
+from app.models.kmer_spectrum import SpectrumIndexState, SpectrumBlock
+from app.models.protein_neighbor import ProteinNeighbor
 
-__all__ = ["User", "Protein", "ProteinVersion", "AuditLog"]
+__all__ = ["User", "Protein", "ProteinVersion", "AuditLog", "ImportJob", "Job", "SequenceIndexState", "SequenceIndexBlock",
+           "KmerPosting", "MotifScanHit", "ClusterAssignment", "SpectrumIndexState", "SpectrumBlock",
+           "ProteinNeighbor"]
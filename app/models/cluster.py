@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, BigInteger, Float, ForeignKey, Index
+from app.core.database import Base
+
+class ClusterAssignment(Base):
+    __tablename__ = "cluster_assignments"
+    __table_args__ = (
+        Index("ix_cluster_assignments_job_representative", "job_id", "representative_id"),
+        Index("ix_cluster_assignments_job_protein", "job_id", "protein_id"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    protein_id = Column(Integer, ForeignKey("proteins.id", ondelete="CASCADE"), nullable=False)
+    representative_id = Column(Integer, ForeignKey("proteins.id", ondelete="CASCADE"), nullable=False)
+    identity = Column(Float, nullable=False)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+class ImportStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, nullable=False)
+    file_type = Column(String, nullable=False)
+    status = Column(Enum(ImportStatus), default=ImportStatus.PENDING, nullable=False)
+    options = Column(JSON)
+    rows_total = Column(Integer, default=0)
+    rows_imported = Column(Integer, default=0)
+    rows_failed = Column(Integer, default=0)
+    rows_per_second = Column(Float)
+    errors = Column(JSON)
+    warnings = Column(JSON)
+    job_id = Column(Integer, ForeignKey("jobs.id"))
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SpectrumIndexState(Base):
+    __tablename__ = "kmer_spectrum_state"
+
+    id = Column(Integer, primary_key=True)
+    k = Column(Integer, nullable=False)
+    generation = Column(Integer, nullable=False, default=0)
+    block_count = Column(Integer, nullable=False, default=0)
+    protein_count = Column(Integer, nullable=False, default=0)
+    max_protein_id = Column(Integer, nullable=False, default=0)
+    stale_count = Column(Integer, nullable=False, default=0)
+    built_at = Column(DateTime(timezone=True))
+    synced_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class SpectrumBlock(Base):
+    __tablename__ = "kmer_spectrum_blocks"
+
+    generation = Column(Integer, primary_key=True)
+    block = Column(Integer, primary_key=True)
+    protein_ids = Column(LargeBinary, nullable=False)
+    indptr = Column(LargeBinary, nullable=False)
+    indices = Column(LargeBinary, nullable=False)
+    counts = Column(LargeBinary, nullable=False)
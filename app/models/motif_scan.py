@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Index
+from app.core.database import Base
+
+class MotifScanHit(Base):
+    __tablename__ = "motif_scan_hits"
+    __table_args__ = (
+        Index("ix_motif_scan_hits_job_pattern", "job_id", "pattern"),
+        Index("ix_motif_scan_hits_job_protein", "job_id", "protein_id"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    protein_id = Column(Integer, ForeignKey("proteins.id", ondelete="CASCADE"), nullable=False)
+    pattern = Column(String, nullable=False)
+    start = Column(Integer, nullable=False)
+    end = Column(Integer, nullable=False)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Float, Boolean, DateTime, ForeignKey, JSON, LargeBinary, Index, Computed, DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR, ARRAY
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
 
 class Protein(Base):
@@ -10,12 +11,17 @@ class Protein(Base):
     uniprot_id = Column(String, unique=True, index=True)
     name = Column(String, nullable=False, index=True)
     sequence = Column(Text, nullable=False)
+    sequence_hash = Column(String(64), index=True)
     organism = Column(String, index=True)
     gene_name = Column(String, index=True)
     protein_family = Column(String, index=True)
     function = Column(Text)
     molecular_weight = Column(Float)
     length = Column(Integer)
+    isoelectric_point = Column(Float)
+    gravy = Column(Float)
+    instability_index = Column(Float)
+    aromaticity = Column(Float)
     pdb_id = Column(String)
     subcellular_location = Column(String)
     post_translational_modifications = Column(JSON)
@@ -28,9 +34,44 @@ class Protein(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     version = Column(Integer, default=1)
+    minhash = deferred(Column(LargeBinary))
+    minhash_bands = deferred(Column(ARRAY(BigInteger)))
+    kmer_spectrum = deferred(Column(LargeBinary))
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(gene_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(keywords::text, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(function, '')), 'C')",
+            persisted=True
+        )
+    ))
 
     versions = relationship("ProteinVersion", back_populates="protein", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_proteins_name_id", "name", "id"),
+        Index("ix_proteins_created_at_id", "created_at", "id"),
+        Index("ix_proteins_updated_at", "updated_at"),
+        Index("ix_proteins_molecular_weight_id", "molecular_weight", "id"),
+        Index("ix_proteins_isoelectric_point_id", "isoelectric_point", "id"),
+        Index("ix_proteins_gravy_id", "gravy", "id"),
+        Index("ix_proteins_instability_index_id", "instability_index", "id"),
+        Index("ix_proteins_aromaticity_id", "aromaticity", "id"),
+        Index("ix_proteins_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_proteins_minhash_bands", "minhash_bands", postgresql_using="gin"),
+        Index("ix_proteins_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_proteins_gene_name_trgm", "gene_name", postgresql_using="gin", postgresql_ops={"gene_name": "gin_trgm_ops"}),
+        Index("ix_proteins_uniprot_id_trgm", "uniprot_id", postgresql_using="gin", postgresql_ops={"uniprot_id": "gin_trgm_ops"}),
+    )
+
+event.listen(
+    Protein.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 class ProteinVersion(Base):
     __tablename__ = "protein_versions"
 
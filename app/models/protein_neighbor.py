@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index
+from app.core.database import Base
+
+class ProteinNeighbor(Base):
+    __tablename__ = "protein_neighbors"
+    __table_args__ = (
+        Index("ix_protein_neighbors_neighbor_id", "neighbor_id"),
+    )
+
+    protein_id = Column(Integer, ForeignKey("proteins.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    neighbor_id = Column(Integer, nullable=False)
+    distance = Column(Float, nullable=False)
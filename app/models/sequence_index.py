@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SequenceIndexState(Base):
+    __tablename__ = "sequence_index_state"
+
+    id = Column(Integer, primary_key=True)
+    k = Column(Integer, nullable=False)
+    generation = Column(Integer, nullable=False, default=0)
+    block_count = Column(Integer, nullable=False, default=0)
+    protein_count = Column(Integer, nullable=False, default=0)
+    residue_count = Column(BigInteger, nullable=False, default=0)
+    max_protein_id = Column(Integer, nullable=False, default=0)
+    built_at = Column(DateTime(timezone=True))
+    synced_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class KmerPosting(Base):
+    __tablename__ = "kmer_postings"
+
+    generation = Column(Integer, primary_key=True)
+    kmer = Column(Integer, primary_key=True)
+    block = Column(Integer, primary_key=True)
+    protein_ids = Column(LargeBinary, nullable=False)
+
+class SequenceIndexBlock(Base):
+    __tablename__ = "sequence_index_blocks"
+
+    generation = Column(Integer, primary_key=True)
+    block = Column(Integer, primary_key=True)
+    first_protein_id = Column(Integer, nullable=False)
+    last_protein_id = Column(Integer, nullable=False)
+    protein_count = Column(Integer, nullable=False)
+    residue_count = Column(BigInteger, nullable=False)
@@ -2,6 +2,7 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import requests
 
 st.set_page_config(page_title="Analytics", page_icon="📊", layout="wide")
 
@@ -11,6 +12,9 @@ if not st.session_state.get('authenticated', False):
     st.warning("Please login to access this page")
     st.stop()
 
+API_URL = "http://localhost:8000"
+headers = {"Authorization": f"Bearer {st.session_state.token}"}
+
 st.markdown("### Database Insights and Statistics")
 
 col1, col2, col3, col4 = st.columns(4)
@@ -78,6 +82,16 @@ with col2:
 with col3:
     st.metric("Missing Functions", "156", "13%")
 with col4:
-    st.metric("Duplicates", "3", "0.2%")
+    response = requests.get(
+        f"{API_URL}/api/jobs/",
+        headers=headers,
+        params={"kind": "duplicate_report", "status": "completed", "limit": 1}
+    )
+    reports = response.json() if response.status_code == 200 else []
+    if reports:
+        report = requests.get(f"{API_URL}/api/jobs/{reports[0]['id']}/result", headers=headers).json()["result"]
+        st.metric("Duplicates", report["duplicate_proteins"], f"{report['clusters']} clusters", delta_color="off")
+    else:
+        st.metric("Duplicates", "N/A", help="Submit a duplicate_report job to compute near-duplicates")
 with col5:
     st.metric("Quality Score", "8.7/10", "+0.3")
@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+import requests
+import time
 
 st.set_page_config(page_title="Batch Upload", page_icon="📦", layout="wide")
 
@@ -9,56 +11,103 @@ if not st.session_state.get('authenticated', False):
     st.warning("Please login to access this page")
     st.stop()
 
+API_URL = "http://localhost:8000"
+headers = {"Authorization": f"Bearer {st.session_state.token}"}
+
 st.markdown("### Upload Multiple Proteins")
 
 tab1, tab2, tab3 = st.tabs(["Upload File", "Template", "History"])
 
 with tab1:
-    st.markdown("#### Upload CSV or Excel File")
+    st.markdown("#### Upload CSV, Excel or FASTA File")
 
-    file_type = st.radio("File Format", ["CSV", "Excel (.xlsx)"], horizontal=True)
+    file_type = st.radio("File Format", ["CSV", "Excel (.xlsx)", "FASTA"], horizontal=True)
 
     uploaded_file = st.file_uploader(
         "Choose a file",
-        type=["csv", "xlsx"],
-        help="Upload a file with protein data"
+        type=["csv", "xlsx", "fasta", "fa", "faa", "gz"],
+        help="Upload a file with protein data. FASTA files may be gzip-compressed (.fasta.gz)"
     )
 
     if uploaded_file:
         st.success(f"File '{uploaded_file.name}' uploaded successfully!")
 
         if file_type == "CSV":
-            df = pd.read_csv(uploaded_file)
+            preview_df = pd.read_csv(uploaded_file, nrows=10)
+        elif file_type == "FASTA":
+            head = uploaded_file.read(65536)
+            if head[:2] == b"\x1f\x8b":
+                head = b""
+            lines = head.decode("utf-8", "replace").splitlines()
+            preview_df = pd.DataFrame({
+                "Header": [line[1:] for line in lines if line.startswith(">")][:10]
+            })
         else:
-            df = pd.read_excel(uploaded_file)
-
-        st.markdown(f"**Found {len(df)} proteins**")
+            preview_df = pd.read_excel(uploaded_file, nrows=10)
+        uploaded_file.seek(0)
 
-        st.dataframe(df.head(10), use_container_width=True)
+        st.markdown("**Preview (first 10 rows)**")
+        st.dataframe(preview_df, use_container_width=True)
 
         st.markdown("---")
         st.markdown("#### Validation")
 
         col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Valid Rows", len(df))
-        with col2:
-            st.metric("Errors", "0")
-        with col3:
-            st.metric("Warnings", "0")
-
-        col1, col2 = st.columns(2)
         with col1:
             validate_sequences = st.checkbox("Validate sequences", value=True)
-            check_duplicates = st.checkbox("Check for duplicates", value=True)
         with col2:
             validate_uniprot = st.checkbox("Verify UniProt IDs", value=False)
-            auto_fetch = st.checkbox("Auto-fetch missing data", value=False)
+        with col3:
+            check_duplicates = st.checkbox("Check for duplicates", value=True)
 
         if st.button("Import Proteins", type="primary"):
-            with st.spinner("Importing proteins..."):
-                st.success(f"Successfully imported {len(df)} proteins!")
-                st.balloons()
+            response = requests.post(
+                f"{API_URL}/api/imports/",
+                headers=headers,
+                files={"file": (uploaded_file.name, uploaded_file, uploaded_file.type)},
+                data={
+                    "validate_sequences": str(validate_sequences).lower(),
+                    "validate_uniprot": str(validate_uniprot).lower(),
+                    "check_duplicates": str(check_duplicates).lower()
+                }
+            )
+            if response.status_code != 202:
+                st.error(f"Import failed: {response.json().get('detail', 'Unknown error')}")
+                st.stop()
+
+            job = response.json()
+            progress = st.empty()
+            while job["status"] in ("pending", "running"):
+                progress.info(
+                    f"Processed {job['rows_total']} rows "
+                    f"({job['rows_per_second'] or 0:.0f} rows/sec)..."
+                )
+                time.sleep(1)
+                job = requests.get(f"{API_URL}/api/imports/{job['id']}", headers=headers).json()
+            progress.empty()
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Imported Rows", job["rows_imported"])
+            with col2:
+                st.metric("Errors", job["rows_failed"])
+            with col3:
+                st.metric("Warnings", len(job["warnings"] or []))
+
+            if job["status"] == "completed":
+                st.success(
+                    f"Imported {job['rows_imported']} of {job['rows_total']} proteins "
+                    f"({job['rows_per_second'] or 0:.0f} rows/sec)"
+                )
+            else:
+                st.error("Import failed")
+
+            if job["errors"]:
+                st.markdown("**Errors**")
+                st.dataframe(pd.DataFrame(job["errors"]), use_container_width=True, hide_index=True)
+            if job["warnings"]:
+                st.markdown("**Warnings**")
+                st.dataframe(pd.DataFrame(job["warnings"]), use_container_width=True, hide_index=True)
 
 with tab2:
     st.markdown("#### Download Template")
@@ -67,9 +116,11 @@ with tab2:
     Download a template file to ensure your data is in the correct format.
 
     **Required Columns:**
-    - uniprot_id
     - name
     - sequence
+
+    **Recommended Columns (missing values are reported as warnings):**
+    - uniprot_id
     - organism
 
     **Optional Columns:**
@@ -115,12 +166,20 @@ with tab2:
 with tab3:
     st.markdown("#### Upload History")
 
-    history_df = pd.DataFrame({
-        "Date": ["2024-10-15", "2024-10-10"],
-        "Filename": ["proteins_batch1.csv", "proteins_batch2.xlsx"],
-        "Records": [45, 78],
-        "Status": ["Success", "Success"],
-        "User": ["researcher1", "admin"]
-    })
-
-    st.dataframe(history_df, use_container_width=True, hide_index=True)
+    response = requests.get(f"{API_URL}/api/imports/", headers=headers)
+    if response.status_code == 200 and response.json():
+        history_df = pd.DataFrame(response.json())
+        history_df = history_df[[
+            "created_at", "filename", "status", "rows_total", "rows_imported", "rows_failed", "rows_per_second"
+        ]].rename(columns={
+            "created_at": "Date",
+            "filename": "Filename",
+            "status": "Status",
+            "rows_total": "Records",
+            "rows_imported": "Imported",
+            "rows_failed": "Failed",
+            "rows_per_second": "Rows/sec"
+        })
+        st.dataframe(history_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No imports yet")
@@ -82,9 +82,16 @@ if selected_protein and proteins:
     protein = next((p for p in proteins if p['name'] == selected_protein), None)
 
     if protein:
+        try:
+            detail_response = requests.get(f"{API_URL}/api/proteins/{protein['id']}", headers=headers)
+            if detail_response.status_code == 200:
+                protein = detail_response.json()
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+
         st.markdown("### Protein Details")
 
-        tab1, tab2, tab3, tab4 = st.tabs(["Info", "Sequence", "History", "Actions"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["Info", "Sequence", "Related", "History", "Actions"])
 
         with tab1:
             col1, col2 = st.columns(2)
@@ -110,6 +117,25 @@ if selected_protein and proteins:
                 st.info("No sequence available")
 
         with tab3:
+            try:
+                related_response = requests.get(f"{API_URL}/api/proteins/{protein['id']}/related", headers=headers)
+                related = related_response.json() if related_response.status_code == 200 else []
+                if related:
+                    st.markdown("**Related Proteins**")
+                    st.dataframe(pd.DataFrame({
+                        "ID": [r['protein_id'] for r in related],
+                        "UniProt ID": [r.get('uniprot_id') or 'N/A' for r in related],
+                        "Name": [r['name'] for r in related],
+                        "Organism": [r.get('organism') or 'N/A' for r in related],
+                        "Length": [r.get('length', 0) for r in related],
+                        "Distance": [r['distance'] for r in related]
+                    }), use_container_width=True, hide_index=True)
+                else:
+                    st.info("No related proteins computed yet")
+            except:
+                st.info("Could not load related proteins")
+
+        with tab4:
             try:
                 version_response = requests.get(f"{API_URL}/api/proteins/{protein['id']}/versions", headers=headers)
                 if version_response.status_code == 200:
@@ -122,7 +148,7 @@ if selected_protein and proteins:
             except:
                 st.info("Could not load version history")
 
-        with tab4:
+        with tab5:
             col1, col2, col3 = st.columns(3)
             with col1:
                 if st.button("Edit"):
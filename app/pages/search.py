@@ -32,6 +32,20 @@ with st.form("search_form"):
         ec_number = st.text_input("EC Number")
         max_length = st.number_input("Max Length", min_value=0, value=10000)
 
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        min_pi = st.number_input("Min pI", min_value=0.0, max_value=14.0, value=0.0, step=0.5)
+
+    with col2:
+        max_pi = st.number_input("Max pI", min_value=0.0, max_value=14.0, value=14.0, step=0.5)
+
+    with col3:
+        min_mw = st.number_input("Min MW (Da)", min_value=0.0, value=0.0, step=1000.0)
+
+    with col4:
+        max_mw = st.number_input("Max MW (Da)", min_value=0.0, value=0.0, step=1000.0, help="0 means no limit")
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
@@ -64,11 +78,21 @@ if submit or 'search_results' not in st.session_state:
             params['min_length'] = min_length
         if max_length < 10000:
             params['max_length'] = max_length
+        if min_pi > 0:
+            params['min_isoelectric_point'] = min_pi
+        if max_pi < 14:
+            params['max_isoelectric_point'] = max_pi
+        if min_mw > 0:
+            params['min_molecular_weight'] = min_mw
+        if max_mw > 0:
+            params['max_molecular_weight'] = max_mw
         if has_pdb:
             params['has_pdb'] = True
         if is_validated:
             params['is_validated'] = True
 
+        params['fields'] = "uniprot_id,name,organism,length,protein_family,pdb_id,is_validated,molecular_weight,isoelectric_point"
+
         response = requests.get(f"{API_URL}/api/proteins/", headers=headers, params=params)
 
         if response.status_code == 200:
@@ -89,6 +113,8 @@ if results:
         "Name": [p['name'] for p in results],
         "Organism": [p.get('organism', 'N/A') for p in results],
         "Length": [p.get('length', 0) for p in results],
+        "MW (Da)": [p.get('molecular_weight') for p in results],
+        "pI": [p.get('isoelectric_point') for p in results],
         "Family": [p.get('protein_family', 'N/A') for p in results],
         "PDB": [p.get('pdb_id', 'N/A') for p in results],
         "Validated": ["✓" if p.get('is_validated') else "✗" for p in results]
@@ -1,4 +1,7 @@
 import streamlit as st
+import pandas as pd
+import requests
+import time
 
 st.set_page_config(page_title="Sequence Analysis", page_icon="🧬", layout="wide")
 
@@ -8,6 +11,9 @@ if not st.session_state.get('authenticated', False):
     st.warning("Please login to access this page")
     st.stop()
 
+API_URL = "http://localhost:8000"
+headers = {"Authorization": f"Bearer {st.session_state.token}"}
+
 st.markdown("### Analyze Protein Sequences")
 
 tab1, tab2, tab3, tab4 = st.tabs(["BLAST Search", "Sequence Alignment", "Motif Detection", "Properties"])
@@ -24,20 +30,78 @@ with tab1:
     with col2:
         max_hits = st.number_input("Max hits", value=50, min_value=1)
     with col3:
-        db_choice = st.selectbox("Database", ["Local DB", "UniProt", "PDB"])
+        db_choice = st.selectbox("Database", ["Local DB"])
 
     if st.button("Run BLAST", type="primary"):
-        st.info("BLAST functionality will be implemented")
-        st.markdown("**Results will show:**")
-        st.markdown("- Similar sequences")
-        st.markdown("- Alignment scores")
-        st.markdown("- E-values")
-        st.markdown("- Identity percentages")
+        if not sequence.strip():
+            st.warning("Please enter a protein sequence")
+        else:
+            with st.spinner("Searching..."):
+                response = requests.post(
+                    f"{API_URL}/api/sequences/search",
+                    headers=headers,
+                    json={"sequence": sequence, "evalue": evalue, "max_hits": int(max_hits)}
+                )
+
+            if response.status_code != 200:
+                st.error(f"Search failed: {response.json().get('detail', 'Unknown error')}")
+            else:
+                result = response.json()
+                st.caption(
+                    f"Query length {result['query_length']} | "
+                    f"{result['database_proteins']} proteins searched | "
+                    f"{result['candidates_scanned']} candidates extended"
+                )
+
+                if not result["hits"]:
+                    st.info("No hits below the E-value threshold")
+                else:
+                    hits_df = pd.DataFrame(result["hits"])
+                    hits_df["identity"] = (hits_df["identity"] * 100).round(1)
+                    st.dataframe(
+                        hits_df[[
+                            "uniprot_id", "name", "organism", "bit_score", "evalue", "identity", "length",
+                            "query_start", "query_end", "subject_start", "subject_end"
+                        ]].rename(columns={
+                            "uniprot_id": "UniProt ID",
+                            "name": "Name",
+                            "organism": "Organism",
+                            "bit_score": "Bit Score",
+                            "evalue": "E-value",
+                            "identity": "Identity (%)",
+                            "length": "Alignment Length",
+                            "query_start": "Query Start",
+                            "query_end": "Query End",
+                            "subject_start": "Subject Start",
+                            "subject_end": "Subject End"
+                        }),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+
+                    for hit in result["hits"][:10]:
+                        with st.expander(f"{hit['uniprot_id'] or hit['protein_id']} - {hit['name']} (E = {hit['evalue']:.2e})"):
+                            midline = "".join(
+                                a if a == b else " " for a, b in zip(hit["query_aligned"], hit["subject_aligned"])
+                            )
+                            st.code(
+                                f"Query {hit['query_start']:>6} {hit['query_aligned']} {hit['query_end']}\n"
+                                f"             {midline}\n"
+                                f"Sbjct {hit['subject_start']:>6} {hit['subject_aligned']} {hit['subject_end']}"
+                            )
 
 with tab2:
     st.markdown("#### Multiple Sequence Alignment")
 
-    alignment_method = st.selectbox("Alignment Method", ["ClustalW", "MUSCLE", "T-Coffee"])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        guide_tree = st.selectbox(
+            "Guide Tree", ["upgma", "nj"], format_func=lambda tree: {"upgma": "UPGMA", "nj": "Neighbor Joining"}[tree]
+        )
+    with col2:
+        msa_gap_open = st.number_input("Gap open", value=11, min_value=0, max_value=100)
+    with col3:
+        msa_gap_extend = st.number_input("Gap extend", value=1, min_value=0, max_value=100)
 
     sequences = st.text_area(
         "Enter sequences (FASTA format)",
@@ -46,23 +110,142 @@ with tab2:
     )
 
     if st.button("Align Sequences", type="primary"):
-        st.info("Alignment functionality will be implemented")
+        records = []
+        for number, record in enumerate(sequences.strip().lstrip(">").split("\n>"), start=1):
+            title, _, body = record.partition("\n")
+            records.append({"id": title.strip() or f"seq{number}", "sequence": "".join(body.split())})
+        records = [record for record in records if record["sequence"]]
+
+        if len(records) < 2:
+            st.warning("Please enter at least two FASTA sequences")
+        else:
+            with st.spinner(f"Aligning {len(records)} sequences..."):
+                response = requests.post(
+                    f"{API_URL}/api/sequences/msa",
+                    headers=headers,
+                    json={
+                        "sequences": records,
+                        "tree": guide_tree,
+                        "gap_open": int(msa_gap_open),
+                        "gap_extend": int(msa_gap_extend)
+                    }
+                )
+
+            if response.status_code != 200:
+                st.error(f"Alignment failed: {response.json().get('detail', 'Unknown error')}")
+            else:
+                result = response.json()
+                st.caption(f"{len(result['sequences'])} sequences | alignment length {result['length']}")
+
+                width = max(len(row["id"]) for row in result["sequences"] + [{"id": "Consensus"}])
+                lines = []
+                for start in range(0, result["length"], 60):
+                    for row in result["sequences"]:
+                        lines.append(f"{row['id'][:width]:<{width}}  {row['aligned'][start:start + 60]}")
+                    lines.append(f"{'Consensus':<{width}}  {result['consensus'][start:start + 60]}")
+                    lines.append("")
+                st.code("\n".join(lines))
+
+                fasta_text = "".join(f">{row['id']}\n{row['aligned']}\n" for row in result["sequences"])
+                st.download_button("Download aligned FASTA", fasta_text, file_name="alignment.fasta")
+
+                with st.expander("Guide tree (Newick)"):
+                    st.code(result["newick"])
 
 with tab3:
     st.markdown("#### Motif and Domain Detection")
 
     sequence_motif = st.text_area("Enter protein sequence", height=150, key="motif_seq")
 
+    search_prosite = st.checkbox("Search PROSITE patterns", value=True)
+    custom_patterns = st.text_area(
+        "Custom patterns (one per line, optionally NAME: PATTERN)",
+        height=100,
+        placeholder="GLYCO: N-{P}-[ST]-{P}\n[ST]-x(2)-[DE]",
+        key="motif_patterns"
+    )
+
+    patterns = {}
+    for number, line in enumerate(custom_patterns.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        name, _, pattern = line.rpartition(":")
+        patterns[name.strip() or f"custom_{number}"] = pattern.strip()
+
     col1, col2 = st.columns(2)
     with col1:
-        search_prosite = st.checkbox("Search PROSITE patterns", value=True)
-        search_pfam = st.checkbox("Search Pfam domains", value=True)
+        detect_clicked = st.button("Detect Motifs", type="primary")
     with col2:
-        search_smart = st.checkbox("Search SMART domains", value=True)
-        search_interpro = st.checkbox("Search InterPro", value=True)
+        scan_clicked = st.button("Scan Database", help="Find every stored protein containing these patterns")
 
-    if st.button("Detect Motifs", type="primary"):
-        st.info("Motif detection functionality will be implemented")
+    if detect_clicked:
+        if not sequence_motif.strip():
+            st.warning("Please enter a protein sequence")
+        elif not search_prosite and not patterns:
+            st.warning("Select PROSITE patterns or enter at least one custom pattern")
+        else:
+            with st.spinner("Scanning..."):
+                response = requests.post(
+                    f"{API_URL}/api/sequences/motifs",
+                    headers=headers,
+                    json={"sequence": sequence_motif, "patterns": patterns, "include_library": search_prosite}
+                )
+
+            if response.status_code != 200:
+                st.error(f"Motif scan failed: {response.json().get('detail', 'Unknown error')}")
+            else:
+                hits = response.json()
+                if not hits:
+                    st.info("No motifs found")
+                else:
+                    st.caption(f"{len(hits)} motif occurrences from {len({hit['pattern'] for hit in hits})} patterns")
+                    st.dataframe(
+                        pd.DataFrame(hits)[["pattern", "description", "start", "end", "match"]].rename(columns={
+                            "pattern": "Pattern",
+                            "description": "Description",
+                            "start": "Start",
+                            "end": "End",
+                            "match": "Match"
+                        }),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+
+    if scan_clicked:
+        if not search_prosite and not patterns:
+            st.warning("Select PROSITE patterns or enter at least one custom pattern")
+        else:
+            response = requests.post(
+                f"{API_URL}/api/jobs/",
+                headers=headers,
+                json={"kind": "motif_scan", "params": {"patterns": patterns, "include_library": search_prosite}}
+            )
+            if response.status_code != 202:
+                st.error(f"Database scan failed: {response.json().get('detail', 'Unknown error')}")
+            else:
+                job = response.json()
+                progress = st.progress(0.0)
+                while job["status"] in ("queued", "running"):
+                    progress.progress(job["progress"] or 0.0, text=job["message"] or "Waiting for a worker...")
+                    time.sleep(1)
+                    job = requests.get(f"{API_URL}/api/jobs/{job['id']}", headers=headers).json()
+                progress.empty()
+
+                if job["status"] != "completed":
+                    st.error(f"Database scan {job['status']}: {job['error'] or ''}")
+                else:
+                    result = requests.get(f"{API_URL}/api/jobs/{job['id']}/result", headers=headers).json()["result"]
+                    st.success(
+                        f"{result['hits']} hits in {result['proteins_with_hits']} of {result['scanned']} proteins "
+                        f"({result['proteins_per_second'] or 0:.0f} proteins/sec on {result['workers']} workers)"
+                    )
+                    if result["patterns"]:
+                        st.bar_chart(pd.Series(result["patterns"], name="Hits"))
+                        hits = requests.get(
+                            f"{API_URL}/api/jobs/{job['id']}/motif-hits", headers=headers, params={"limit": 1000}
+                        ).json()
+                        st.dataframe(pd.DataFrame(hits), use_container_width=True, hide_index=True)
 
 with tab4:
     st.markdown("#### Sequence Properties Calculator")
@@ -70,16 +253,33 @@ with tab4:
     sequence_prop = st.text_area("Enter protein sequence", height=150, key="prop_seq")
 
     if st.button("Calculate Properties", type="primary"):
-        st.info("Properties calculation will be implemented")
-
-        st.markdown("**Basic Properties:**")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Length", "N/A")
-            st.metric("Molecular Weight", "N/A")
-        with col2:
-            st.metric("Isoelectric Point", "N/A")
-            st.metric("Charge at pH 7", "N/A")
-        with col3:
-            st.metric("Hydrophobicity", "N/A")
-            st.metric("Instability Index", "N/A")
+        if not sequence_prop.strip():
+            st.warning("Please enter a protein sequence")
+        else:
+            response = requests.post(
+                f"{API_URL}/api/sequences/properties", headers=headers, json={"sequences": [sequence_prop]}
+            )
+            if response.status_code != 200:
+                st.error(f"Calculation failed: {response.json().get('detail', 'Unknown error')}")
+            else:
+                properties = response.json()[0]
+                display = {name: "N/A" if value is None else value for name, value in properties.items()}
+
+                st.markdown("**Basic Properties:**")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Length", display["length"])
+                    st.metric("Molecular Weight (Da)", display["molecular_weight"])
+                with col2:
+                    st.metric("Isoelectric Point", display["isoelectric_point"])
+                    st.metric("Charge at pH 7", display["charge_at_ph7"])
+                with col3:
+                    st.metric("Hydrophobicity (GRAVY)", display["gravy"])
+                    st.metric("Instability Index", display["instability_index"])
+                st.metric("Aromaticity", display["aromaticity"])
+
+                if properties["instability_index"] is not None:
+                    if properties["instability_index"] > 40:
+                        st.caption("Instability index above 40: the protein is predicted to be unstable")
+                    else:
+                        st.caption("Instability index up to 40: the protein is predicted to be stable")
@@ -1,9 +1,16 @@
 from app.schemas.user import User, UserCreate, UserUpdate, UserInDB, Token
-from app.schemas.protein import Protein, ProteinCreate, ProteinUpdate, ProteinSearch
+from app.schemas.protein import (
+    Protein, ProteinCreate, ProteinUpdate, ProteinSearch, ProteinSort,
+    ProteinBulkResponse
+)
 from app.schemas.audit_log import AuditLog
+from app.schemas.import_job import ImportJob
+from app.schemas.job import Job, JobCreate, JobResult
+from app.schemas.sequence import SequenceSearchRequest, SequenceSearchResponse
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserInDB", "Token",
-    "Protein", "ProteinCreate", "ProteinUpdate", "ProteinSearch",
-    "AuditLog"
+    "Protein", "ProteinCreate", "ProteinUpdate", "ProteinSearch", "ProteinSort", "ProteinBulkResponse",
+    "AuditLog", "ImportJob", "Job", "JobCreate", "JobResult",
+    "SequenceSearchRequest", "SequenceSearchResponse"
 ]
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, List
+from datetime import datetime
+from app.models.import_job import ImportStatus
+
+class ImportJob(BaseModel):
+    id: int
+    filename: str
+    file_type: str
+    status: ImportStatus
+    options: Optional[Dict] = None
+    rows_total: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    rows_per_second: Optional[float] = None
+    errors: Optional[List[Dict]] = None
+    warnings: Optional[List[Dict]] = None
+    job_id: Optional[int] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+from app.models.job import JobStatus
+
+class JobCreate(BaseModel):
+    kind: str
+    params: Dict[str, Any] = {}
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    params: Optional[Dict[str, Any]] = None
+    progress: float = 0.0
+    message: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobResult(BaseModel):
+    id: int
+    status: JobStatus
+    result: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
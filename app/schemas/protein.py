@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
+from pydantic import BaseModel, Field, create_model
+from typing import Optional, Dict, List, Tuple, Type
 from datetime import datetime
+from functools import lru_cache
+import enum
 
 class ProteinBase(BaseModel):
     uniprot_id: Optional[str] = None
@@ -37,6 +39,11 @@ class ProteinUpdate(BaseModel):
 
 class Protein(ProteinBase):
     id: int
+    sequence_hash: Optional[str] = None
+    isoelectric_point: Optional[float] = None
+    gravy: Optional[float] = None
+    instability_index: Optional[float] = None
+    aromaticity: Optional[float] = None
     is_validated: bool
     quality_score: Optional[float] = None
     created_by: Optional[int] = None
@@ -48,6 +55,83 @@ class Protein(ProteinBase):
     class Config:
         from_attributes = True
 
+class ProteinBulkResult(BaseModel):
+    index: int
+    uniprot_id: Optional[str] = None
+    status: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class ProteinBulkResponse(BaseModel):
+    created: int
+    conflicts: int
+    results: List[ProteinBulkResult]
+
+class ProteinNeighbor(BaseModel):
+    protein_id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    organism: Optional[str] = None
+    length: Optional[int] = None
+    distance: float
+
+class ProteinSummary(BaseModel):
+    id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    organism: Optional[str] = None
+    gene_name: Optional[str] = None
+    protein_family: Optional[str] = None
+    length: Optional[int] = None
+    molecular_weight: Optional[float] = None
+    pdb_id: Optional[str] = None
+    is_validated: bool
+
+    class Config:
+        from_attributes = True
+
+class ProteinView(str, enum.Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+class ProteinFormat(str, enum.Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+PROTEIN_FIELDS = tuple(Protein.model_fields)
+
+def parse_protein_fields(fields: Optional[str], view: ProteinView = ProteinView.SUMMARY) -> Tuple[str, ...]:
+    if not fields:
+        if view == ProteinView.FULL:
+            return PROTEIN_FIELDS
+        return tuple(ProteinSummary.model_fields)
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(PROTEIN_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    requested.add("id")
+    return tuple(field for field in PROTEIN_FIELDS if field in requested)
+
+@lru_cache(maxsize=128)
+def protein_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    if fields == PROTEIN_FIELDS:
+        return Protein
+    if fields == tuple(ProteinSummary.model_fields):
+        return ProteinSummary
+
+    definitions = {
+        name: (Protein.model_fields[name].annotation, Protein.model_fields[name].default)
+        for name in fields
+    }
+    return create_model(
+        "ProteinProjection",
+        __config__={"from_attributes": True},
+        **definitions
+    )
+
 class ProteinSearch(BaseModel):
     query: Optional[str] = None
     organism: Optional[str] = None
@@ -55,5 +139,26 @@ class ProteinSearch(BaseModel):
     gene_name: Optional[str] = None
     min_length: Optional[int] = None
     max_length: Optional[int] = None
+    min_molecular_weight: Optional[float] = None
+    max_molecular_weight: Optional[float] = None
+    min_isoelectric_point: Optional[float] = None
+    max_isoelectric_point: Optional[float] = None
+    min_gravy: Optional[float] = None
+    max_gravy: Optional[float] = None
+    min_instability_index: Optional[float] = None
+    max_instability_index: Optional[float] = None
+    min_aromaticity: Optional[float] = None
+    max_aromaticity: Optional[float] = None
     has_pdb: Optional[bool] = None
     is_validated: Optional[bool] = None
+
+class ProteinSort(str, enum.Enum):
+    ID = "id"
+    NAME = "name"
+    CREATED_AT = "created_at"
+    MOLECULAR_WEIGHT = "molecular_weight"
+    ISOELECTRIC_POINT = "isoelectric_point"
+    GRAVY = "gravy"
+    INSTABILITY_INDEX = "instability_index"
+    AROMATICITY = "aromaticity"
+    RELEVANCE = "relevance"
@@ -0,0 +1,141 @@
+import enum
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
+
+class SequenceSearchRequest(BaseModel):
+    sequence: str = Field(..., min_length=3, max_length=50000)
+    evalue: float = Field(10.0, gt=0)
+    max_hits: int = Field(50, ge=1, le=1000)
+
+class SequenceSearchHit(BaseModel):
+    protein_id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    organism: Optional[str] = None
+    subject_length: int
+    score: int
+    bit_score: float
+    evalue: float
+    identity: float
+    length: int
+    query_start: int
+    query_end: int
+    subject_start: int
+    subject_end: int
+    query_aligned: str
+    subject_aligned: str
+
+class SequenceSearchResponse(BaseModel):
+    query_length: int
+    database_proteins: int
+    database_residues: int
+    candidates_scanned: int
+    hits: List[SequenceSearchHit]
+
+class DuplicateCheckRequest(BaseModel):
+    sequence: str = Field(..., min_length=4, max_length=50000)
+    threshold: float = Field(0.95, gt=0, le=1)
+    limit: int = Field(10, ge=1, le=100)
+
+class DuplicateMatch(BaseModel):
+    protein_id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    organism: Optional[str] = None
+    identity: float
+
+class MotifScanRequest(BaseModel):
+    sequence: str = Field(..., min_length=1, max_length=50000)
+    patterns: Dict[str, str] = Field(default_factory=dict, max_length=5000)
+    include_library: bool = True
+
+class MotifHit(BaseModel):
+    pattern: str
+    description: Optional[str] = None
+    start: int
+    end: int
+    match: str
+
+class MotifScanHit(BaseModel):
+    protein_id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    pattern: str
+    start: int
+    end: int
+
+class ClusterMember(BaseModel):
+    protein_id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    representative_id: int
+    representative_uniprot_id: Optional[str] = None
+    identity: float
+
+class SequencePropertiesRequest(BaseModel):
+    sequences: List[str] = Field(..., min_length=1, max_length=10000)
+
+class SequenceProperties(BaseModel):
+    length: int
+    molecular_weight: Optional[float] = None
+    aromaticity: Optional[float] = None
+    instability_index: Optional[float] = None
+    isoelectric_point: Optional[float] = None
+    gravy: Optional[float] = None
+    charge_at_ph7: Optional[float] = None
+
+class GuideTree(str, enum.Enum):
+    UPGMA = "upgma"
+    NJ = "nj"
+
+class AlignmentInput(BaseModel):
+    id: str = Field(..., min_length=1, max_length=255)
+    sequence: str = Field(..., min_length=1, max_length=10000)
+
+class MultipleAlignmentRequest(BaseModel):
+    sequences: List[AlignmentInput] = Field(..., min_length=2, max_length=1000)
+    tree: GuideTree = GuideTree.UPGMA
+    gap_open: int = Field(11, ge=0, le=100)
+    gap_extend: int = Field(1, ge=0, le=100)
+
+class AlignedSequence(BaseModel):
+    id: str
+    aligned: str
+
+class MultipleAlignmentResponse(BaseModel):
+    tree: GuideTree
+    newick: str
+    length: int
+    consensus: str
+    sequences: List[AlignedSequence]
+
+class SimilarityMetric(str, enum.Enum):
+    COSINE = "cosine"
+    JACCARD = "jaccard"
+
+class SpectrumSimilarityRequest(BaseModel):
+    sequences: List[str] = Field(default_factory=list, max_length=100)
+    protein_ids: List[int] = Field(default_factory=list, max_length=100)
+    metric: SimilarityMetric = SimilarityMetric.COSINE
+    limit: int = Field(50, ge=1, le=1000)
+    min_score: float = Field(0.0, ge=0, le=1)
+
+class SpectrumSimilarityHit(BaseModel):
+    protein_id: int
+    uniprot_id: Optional[str] = None
+    name: str
+    organism: Optional[str] = None
+    length: Optional[int] = None
+    cosine: float
+    jaccard: float
+    shared_kmers: int
+
+class SpectrumSimilarityQuery(BaseModel):
+    protein_id: Optional[int] = None
+    distinct_kmers: int
+    hits: List[SpectrumSimilarityHit]
+
+class SpectrumSimilarityResponse(BaseModel):
+    metric: SimilarityMetric
+    database_proteins: int
+    queries: List[SpectrumSimilarityQuery]
@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Dict
 from app.models.audit_log import AuditLog, AuditAction
 from app.models.user import User
@@ -40,3 +42,44 @@ class AuditService:
             AuditLog.entity_type == entity_type,
             AuditLog.entity_id == entity_id
         ).order_by(AuditLog.timestamp.desc()).limit(limit).all()
+
+class AsyncAuditService:
+    @staticmethod
+    async def log_action(
+        db: AsyncSession,
+        user: User,
+        action: AuditAction,
+        entity_type: str,
+        entity_id: Optional[int] = None,
+        details: Optional[Dict] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> AuditLog:
+        audit_log = AuditLog(
+            user_id=user.id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            details=details,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        db.add(audit_log)
+        await db.commit()
+        await db.refresh(audit_log)
+        return audit_log
+
+    @staticmethod
+    async def get_entity_history(
+        db: AsyncSession,
+        entity_type: str,
+        entity_id: int,
+        limit: int = 50
+    ):
+        result = await db.scalars(
+            select(AuditLog).filter(
+                AuditLog.entity_type == entity_type,
+                AuditLog.entity_id == entity_id
+            ).order_by(AuditLog.timestamp.desc()).limit(limit)
+        )
+        return result.all()
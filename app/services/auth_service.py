@@ -1,4 +1,7 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from app.models.user import User
 from app.schemas.user import UserCreate
@@ -51,3 +54,38 @@ class AuthService:
             expires_delta=access_token_expires
         )
         return access_token
+
+class AsyncAuthService:
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+        user = await AsyncAuthService.get_user_by_username(db, username)
+        if not user:
+            return None
+        if not await run_in_threadpool(verify_password, password, user.hashed_password):
+            return None
+        if not user.is_active:
+            return None
+        return user
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user: UserCreate) -> User:
+        hashed_password = await run_in_threadpool(get_password_hash, user.password)
+        db_user = User(
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            hashed_password=hashed_password,
+            role=user.role
+        )
+        db.add(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+        return db_user
+
+    @staticmethod
+    async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+        return await db.scalar(select(User).filter(User.username == username))
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        return await db.scalar(select(User).filter(User.email == email))
@@ -0,0 +1,247 @@
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.cluster import ClusterAssignment
+from app.models.protein import Protein
+from app.schemas.protein import ProteinSearch
+from app.services.job_service import JobContext, JobService
+from app.services.protein_service import ProteinService
+from app.services.sequence_store_service import SequenceStoreService
+from app.utils.clustering import WordIndex, required_words, word_size_for, words
+from app.workers.clustering import init_worker, pair_identities
+
+settings = get_settings()
+
+class ClusterService:
+    PAIR_CHUNK_SIZE = 1000
+    MAX_CANDIDATES = 20
+    LARGEST_CLUSTERS = 20
+
+    @staticmethod
+    def word_size(threshold: float, word_size: Optional[int] = None) -> int:
+        default = word_size_for(threshold)
+        if word_size is None:
+            return default
+        if not 2 <= word_size <= 5:
+            raise ValueError("word_size must be between 2 and 5")
+        return word_size
+
+    @staticmethod
+    def cluster(
+        db: Session,
+        job_id: int,
+        threshold: float = 0.9,
+        word_size: Optional[int] = None,
+        search: Optional[ProteinSearch] = None,
+        batch_size: Optional[int] = None,
+        max_candidates: Optional[int] = None,
+        workers: Optional[int] = None,
+        context: Optional[JobContext] = None
+    ) -> Dict[str, Any]:
+        word_size = ClusterService.word_size(threshold, word_size)
+        batch_size = JobService.bounded(batch_size, settings.cluster_batch_size, settings.cluster_max_batch_size)
+        max_candidates = JobService.bounded(max_candidates, ClusterService.MAX_CANDIDATES, settings.cluster_max_candidates)
+        workers = JobService.workers(workers, settings.cluster_workers)
+        started = time.monotonic()
+
+        writer = SessionLocal()
+        try:
+            writer.execute(delete(ClusterAssignment).where(ClusterAssignment.job_id == job_id))
+            writer.commit()
+
+            SequenceStoreService.sync(db, context=context)
+            with SequenceStoreService.reading() as store:
+                summary = ClusterService._cluster_store(
+                    db, job_id, store, writer, threshold, word_size, search, batch_size, max_candidates, workers,
+                    context
+                )
+        finally:
+            writer.close()
+
+        seconds = time.monotonic() - started
+        return {
+            **summary,
+            "threshold": threshold,
+            "word_size": word_size,
+            "workers": workers,
+            "seconds": round(seconds, 2),
+            "proteins_per_second": round(summary["proteins"] / seconds, 1) if seconds else None
+        }
+
+    @staticmethod
+    def _cluster_store(
+        db, job_id, store, writer, threshold, word_size, search, batch_size, max_candidates, workers, context
+    ) -> Dict[str, Any]:
+        ids = np.fromiter(db.scalars(ProteinService.apply_search(select(Protein.id), search)), dtype=np.int64)
+        positions = store.positions(ids)
+        positions = positions[positions >= 0]
+        lengths = store.ends[positions] - store.starts[positions]
+        positions = positions[np.lexsort((store.ids[positions], -lengths))]
+        protein_ids = np.asarray(store.ids[positions])
+
+        total = len(positions)
+        representatives = np.full(total, -1, dtype=np.int64)
+        aligned = 0
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn"), initializer=init_worker,
+            initargs=(store.directory, store.manifest, word_size)
+        )
+        try:
+            for ranks, representatives, identities, pairs in ClusterService.assign(
+                pool, store, positions, threshold, word_size, batch_size, max_candidates
+            ):
+                aligned += pairs
+                writer.execute(insert(ClusterAssignment.__table__), [
+                    {
+                        "job_id": job_id,
+                        "protein_id": protein_id,
+                        "representative_id": representative_id,
+                        "identity": round(identity, 4)
+                    }
+                    for protein_id, representative_id, identity in zip(
+                        protein_ids[ranks].tolist(),
+                        protein_ids[representatives[ranks]].tolist(),
+                        identities[ranks].tolist()
+                    )
+                ])
+                writer.commit()
+
+                if context:
+                    done = int(ranks[-1]) + 1
+                    context.progress(
+                        done / total,
+                        f"{done} of {total} proteins clustered, {int((representatives[:done] == np.arange(done)).sum())} clusters"
+                    )
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+        sizes = np.bincount(representatives, minlength=total) if total else np.empty(0, dtype=np.int64)
+        largest = np.argsort(-sizes, kind="stable")[:ClusterService.LARGEST_CLUSTERS]
+        return {
+            "proteins": total,
+            "clusters": int((sizes > 0).sum()),
+            "singletons": int((sizes == 1).sum()),
+            "pairs_aligned": aligned,
+            "largest": [
+                {"representative_id": int(protein_ids[rank]), "size": int(sizes[rank])}
+                for rank in largest.tolist() if sizes[rank] > 1
+            ]
+        }
+
+    @staticmethod
+    def assign(
+        pool, store, positions: np.ndarray, threshold: float, word_size: int, batch_size: int, max_candidates: int
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, int]]:
+        total = len(positions)
+        representatives = np.full(total, -1, dtype=np.int64)
+        identities = np.zeros(total)
+        index = WordIndex()
+
+        for start in range(0, total, batch_size):
+            ranks = np.arange(start, min(start + batch_size, total))
+            sequences = store.sequences(positions[ranks].tolist())
+            batch_words = [np.unique(words(sequence, word_size)[0]) for sequence in sequences]
+            local = WordIndex()
+            local.add(ranks, batch_words)
+
+            candidates, waiting_on, waiting = [], [], []
+            for offset, (rank, sequence, codes) in enumerate(zip(ranks.tolist(), sequences, batch_words)):
+                owners, counts = index.shared(codes)
+                local_owners, local_counts = local.shared(codes)
+                earlier = local_owners < rank
+                owners = np.concatenate([owners, local_owners[earlier]])
+                counts = np.concatenate([counts, local_counts[earlier]])
+
+                passing = counts >= required_words(len(sequence), len(codes), threshold, word_size)
+                candidates.append((owners[passing], counts[passing]))
+                in_batch = owners[passing][owners[passing] >= start] - start
+                waiting_on.append(in_batch)
+                waiting.append(np.full(len(in_batch), offset))
+            waiting_on, waiting = np.concatenate(waiting_on), np.concatenate(waiting)
+
+            pending = np.ones(len(ranks), dtype=bool)
+            aligned = 0
+            while pending.any():
+                blocked = np.bincount(waiting[pending[waiting_on]], minlength=len(ranks)) > 0
+                ready = np.nonzero(pending & ~blocked)[0]
+
+                queries, subjects = [], []
+                for offset in ready.tolist():
+                    owners, counts = candidates[offset]
+                    live = representatives[owners] == owners
+                    owners, counts = owners[live], counts[live]
+                    if len(owners) > max_candidates:
+                        owners = owners[np.argsort(-counts, kind="stable")[:max_candidates]]
+                    queries.extend([ranks[offset]] * len(owners))
+                    subjects.extend(owners.tolist())
+
+                queries, subjects = np.array(queries, dtype=np.int64), np.array(subjects, dtype=np.int64)
+                scores = ClusterService._pair_identities(pool, positions, queries, subjects)
+                aligned += len(queries)
+
+                bounds = np.searchsorted(queries, np.append(ranks[ready], ranks[-1] + 1))
+                for number, offset in enumerate(ready.tolist()):
+                    rank = int(ranks[offset])
+                    best, best_identity = rank, 1.0
+                    found = -1.0
+                    for subject, identity in zip(
+                        subjects[bounds[number]:bounds[number + 1]].tolist(),
+                        scores[bounds[number]:bounds[number + 1]].tolist()
+                    ):
+                        if identity >= threshold and identity > found:
+                            best, best_identity, found = subject, identity, identity
+                    representatives[rank] = best
+                    identities[rank] = best_identity
+                pending[ready] = False
+
+            new_representatives = np.nonzero(representatives[ranks] == ranks)[0]
+            index.add(ranks[new_representatives], [batch_words[offset] for offset in new_representatives.tolist()])
+            yield ranks, representatives, identities, aligned
+
+    @staticmethod
+    def _pair_identities(pool, positions, queries, subjects) -> np.ndarray:
+        chunk = ClusterService.PAIR_CHUNK_SIZE
+        futures = [
+            pool.submit(pair_identities, positions[queries[start:start + chunk]], positions[subjects[start:start + chunk]])
+            for start in range(0, len(queries), chunk)
+        ]
+        return np.concatenate([future.result() for future in futures]) if futures else np.empty(0)
+
+class AsyncClusterService:
+    @staticmethod
+    async def list_members(
+        db: AsyncSession,
+        job_id: int,
+        representative_id: Optional[int] = None,
+        protein_id: Optional[int] = None,
+        representatives_only: bool = False,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        representative = aliased(Protein)
+        query = (
+            select(
+                ClusterAssignment.protein_id, Protein.uniprot_id, Protein.name,
+                ClusterAssignment.representative_id, representative.uniprot_id.label("representative_uniprot_id"),
+                ClusterAssignment.identity
+            )
+            .join(Protein, Protein.id == ClusterAssignment.protein_id)
+            .join(representative, representative.id == ClusterAssignment.representative_id)
+            .filter(ClusterAssignment.job_id == job_id)
+        )
+        if representative_id is not None:
+            query = query.filter(ClusterAssignment.representative_id == representative_id)
+        if protein_id is not None:
+            query = query.filter(ClusterAssignment.protein_id == protein_id)
+        if representatives_only:
+            query = query.filter(ClusterAssignment.protein_id == ClusterAssignment.representative_id)
+        rows = await db.execute(query.order_by(ClusterAssignment.id).offset(skip).limit(limit))
+        return [dict(row._mapping) for row in rows]
@@ -0,0 +1,263 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from app.models.protein import Protein
+from app.services.job_service import JobContext
+from app.utils import alignment
+from app.utils.sequence_tools import SequenceTools
+from app.utils.minhash import signature, band_hashes, fingerprint, from_bytes, estimate_jaccard, jaccard_floor
+
+class DuplicateService:
+    QUERY_BATCH_SIZE = 200
+    PAIR_BATCH_SIZE = 5000
+    MAX_BUCKET_SIZE = 1000
+
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 1000, context: Optional[JobContext] = None) -> int:
+        total = db.scalar(select(func.count(Protein.id)).filter(Protein.minhash.is_(None)))
+        done = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(Protein.id, Protein.sequence, Protein.updated_at)
+                .filter(Protein.id > last_id, Protein.minhash.is_(None))
+                .order_by(Protein.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            db.execute(update(Protein), [
+                {"id": row.id, "updated_at": row.updated_at, **fingerprint(row.sequence)} for row in rows
+            ])
+            db.commit()
+            done += len(rows)
+            last_id = rows[-1].id
+            if context:
+                context.progress(done / total if total else None, f"{done} of {total} signatures computed")
+        return done
+
+    @staticmethod
+    def is_candidate(
+        first_length: int,
+        first_signature: np.ndarray,
+        second_length: int,
+        second_signature: np.ndarray,
+        threshold: float
+    ) -> bool:
+        shorter, longer = sorted((first_length or 0, second_length or 0))
+        if not shorter or shorter / longer < threshold:
+            return False
+        return estimate_jaccard(first_signature, second_signature)[0] >= jaccard_floor(threshold)
+
+    @staticmethod
+    def match_sequences(
+        db: Session,
+        sequences: Sequence[str],
+        threshold: float = 0.95,
+        limit: int = 10,
+        exclude_ids: Optional[Set[int]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        sequences = [SequenceTools.normalize_sequence(sequence) for sequence in sequences]
+        matches: List[List[Dict[str, Any]]] = [[] for _ in sequences]
+        exclude_ids = exclude_ids or set()
+        DuplicateService._match_identical(db, sequences, exclude_ids, matches)
+
+        pending = [index for index, found in enumerate(matches) if len(found) < limit]
+        for start in range(0, len(pending), DuplicateService.QUERY_BATCH_SIZE):
+            batch = pending[start:start + DuplicateService.QUERY_BATCH_SIZE]
+            DuplicateService._match_batch(db, sequences, batch, threshold, exclude_ids, matches)
+
+        for found in matches:
+            found.sort(key=lambda match: (-match["identity"], match["protein_id"]))
+            del found[limit:]
+        return matches
+
+    @staticmethod
+    def _match_identical(db, sequences, exclude_ids, matches):
+        indexes_by_hash: Dict[str, List[int]] = {}
+        for index, sequence in enumerate(sequences):
+            if sequence:
+                indexes_by_hash.setdefault(SequenceTools.sequence_hash(sequence), []).append(index)
+
+        hashes = list(indexes_by_hash)
+        for start in range(0, len(hashes), DuplicateService.PAIR_BATCH_SIZE):
+            rows = db.execute(
+                select(Protein.id, Protein.uniprot_id, Protein.name, Protein.organism, Protein.sequence_hash)
+                .filter(Protein.sequence_hash.in_(hashes[start:start + DuplicateService.PAIR_BATCH_SIZE]))
+                .order_by(Protein.id)
+            )
+            for row in rows:
+                if row.id in exclude_ids:
+                    continue
+                for index in indexes_by_hash[row.sequence_hash]:
+                    matches[index].append({
+                        "protein_id": row.id,
+                        "uniprot_id": row.uniprot_id,
+                        "name": row.name,
+                        "organism": row.organism,
+                        "identity": 1.0
+                    })
+
+    @staticmethod
+    def _match_batch(db, sequences, batch, threshold, exclude_ids, matches):
+        signatures = {index: signature(sequences[index]) for index in batch}
+        queries_by_bucket: Dict[int, Set[int]] = {}
+        for index, sig in signatures.items():
+            if sig is None:
+                continue
+            for bucket in band_hashes(sig).tolist():
+                queries_by_bucket.setdefault(bucket, set()).add(index)
+        if not queries_by_bucket:
+            return
+
+        candidates = db.execute(
+            select(Protein.id, Protein.length, Protein.minhash, Protein.minhash_bands)
+            .filter(Protein.minhash_bands.overlap(list(queries_by_bucket)))
+        ).all()
+
+        pairs = []
+        for candidate in candidates:
+            if candidate.id in exclude_ids:
+                continue
+            queries = set()
+            for bucket in candidate.minhash_bands:
+                queries |= queries_by_bucket.get(bucket, set())
+            candidate_signature = from_bytes(candidate.minhash)
+            for index in queries:
+                if any(match["protein_id"] == candidate.id for match in matches[index]):
+                    continue
+                if DuplicateService.is_candidate(
+                    len(sequences[index]), signatures[index], candidate.length, candidate_signature, threshold
+                ):
+                    pairs.append((index, candidate.id))
+        if not pairs:
+            return
+
+        proteins = {
+            row.id: row for row in db.execute(
+                select(Protein.id, Protein.uniprot_id, Protein.name, Protein.organism, Protein.sequence)
+                .filter(Protein.id.in_(sorted({protein_id for _, protein_id in pairs})))
+            )
+        }
+        for index, protein_id in pairs:
+            protein = proteins.get(protein_id)
+            if protein is None:
+                continue
+            identity = alignment.similarity(sequences[index], protein.sequence.upper())
+            if identity >= threshold:
+                matches[index].append({
+                    "protein_id": protein.id,
+                    "uniprot_id": protein.uniprot_id,
+                    "name": protein.name,
+                    "organism": protein.organism,
+                    "identity": identity
+                })
+
+    @staticmethod
+    def find_duplicates(
+        db: Session,
+        sequence: str,
+        threshold: float = 0.95,
+        limit: int = 10,
+        exclude_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        exclude_ids = {exclude_id} if exclude_id is not None else None
+        return DuplicateService.match_sequences(db, [sequence], threshold, limit, exclude_ids)[0]
+
+    @staticmethod
+    def candidate_pairs(db: Session) -> Tuple[Set[Tuple[int, int]], int]:
+        bands = select(Protein.id, func.unnest(Protein.minhash_bands).label("bucket")).subquery()
+        buckets = db.execute(
+            select(func.array_agg(bands.c.id))
+            .group_by(bands.c.bucket)
+            .having(func.count() > 1)
+            .execution_options(yield_per=10000)
+        ).scalars()
+
+        pairs: Set[Tuple[int, int]] = set()
+        oversized = 0
+        for members in buckets:
+            if len(members) > DuplicateService.MAX_BUCKET_SIZE:
+                oversized += 1
+                continue
+            members = sorted(members)
+            for position, first in enumerate(members):
+                for second in members[position + 1:]:
+                    pairs.add((first, second))
+        return pairs, oversized
+
+    @staticmethod
+    def _chunks(pairs: List[Tuple[int, int]], size: int) -> Iterator[List[Tuple[int, int]]]:
+        for start in range(0, len(pairs), size):
+            yield pairs[start:start + size]
+
+    @staticmethod
+    def report(db: Session, threshold: float = 0.95, context: Optional[JobContext] = None) -> Dict[str, Any]:
+        backfilled = DuplicateService.backfill(db, context=context)
+        pairs, oversized = DuplicateService.candidate_pairs(db)
+        pairs = sorted(pairs)
+
+        parent: Dict[int, int] = {}
+
+        def find(node: int) -> int:
+            root = node
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while node != root:
+                parent[node], node = root, parent.get(node, node)
+            return root
+
+        edges = []
+        checked = 0
+        for chunk in DuplicateService._chunks(pairs, DuplicateService.PAIR_BATCH_SIZE):
+            ids = sorted({protein_id for pair in chunk for protein_id in pair})
+            info = {
+                row.id: (row.length, from_bytes(row.minhash))
+                for row in db.execute(
+                    select(Protein.id, Protein.length, Protein.minhash).filter(Protein.id.in_(ids))
+                )
+            }
+            survivors = []
+            for first, second in chunk:
+                if first not in info or second not in info or find(first) == find(second):
+                    continue
+                if DuplicateService.is_candidate(*info[first], *info[second], threshold):
+                    survivors.append((first, second))
+
+            if survivors:
+                sequences = {
+                    row.id: row.sequence for row in db.execute(
+                        select(Protein.id, Protein.sequence)
+                        .filter(Protein.id.in_(sorted({protein_id for pair in survivors for protein_id in pair})))
+                    )
+                }
+                for first, second in survivors:
+                    if find(first) == find(second):
+                        continue
+                    identity = alignment.similarity(sequences[first].upper(), sequences[second].upper())
+                    checked += 1
+                    if identity >= threshold:
+                        edges.append({"protein_id": first, "duplicate_id": second, "identity": identity})
+                        parent.setdefault(first, first)
+                        parent.setdefault(second, second)
+                        parent[find(second)] = find(first)
+
+            if context:
+                context.progress(None, f"{checked} candidate pairs verified, {len(edges)} duplicates found")
+
+        clusters: Dict[int, List[int]] = {}
+        for node in list(parent):
+            clusters.setdefault(find(node), []).append(node)
+        groups = sorted((sorted(members) for members in clusters.values()), key=lambda members: members[0])
+
+        return {
+            "threshold": threshold,
+            "signatures_computed": backfilled,
+            "candidate_pairs": len(pairs),
+            "oversized_buckets": oversized,
+            "verified_pairs": checked,
+            "clusters": groups,
+            "edges": edges,
+            "duplicate_proteins": sum(len(members) - 1 for members in groups)
+        }
@@ -0,0 +1,253 @@
+import time
+import pandas as pd
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from app.core.config import get_settings
+from app.models.import_job import ImportJob, ImportStatus
+from app.models.user import User
+from app.schemas.protein import ProteinCreate
+from app.services.protein_service import ProteinService
+from app.services.duplicate_service import DuplicateService
+from app.services.job_service import JobContext, JobCancelled
+from app.utils import fasta
+from app.utils.validators import ProteinValidator
+
+settings = get_settings()
+
+PROTEIN_COLUMNS = tuple(ProteinCreate.model_fields)
+FASTA_COLUMNS = ("uniprot_id", "name", "organism", "gene_name", "sequence")
+
+class ImportService:
+    MAX_STORED_MESSAGES = 1000
+
+    @staticmethod
+    def read_chunks(path: str, file_type: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        if file_type == "csv":
+            yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=True)
+        elif file_type == "xlsx":
+            yield from ImportService._read_excel_chunks(path, chunk_size)
+        elif file_type == "fasta":
+            yield from ImportService._read_fasta_chunks(path, chunk_size)
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+    @staticmethod
+    def _read_excel_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(value).strip() if value is not None else "" for value in header]
+
+            batch = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    yield pd.DataFrame(batch, columns=columns)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=columns)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _read_fasta_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        batch = []
+        for title, sequence in fasta.read_fasta(path):
+            batch.append({**fasta.parse_header(title), "sequence": sequence})
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=FASTA_COLUMNS)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=FASTA_COLUMNS)
+
+    @staticmethod
+    def estimate_rows(path: str, file_type: str) -> Optional[int]:
+        if file_type == "xlsx":
+            workbook = load_workbook(path, read_only=True)
+            try:
+                max_row = workbook.active.max_row
+            finally:
+                workbook.close()
+            return max_row - 1 if max_row else None
+
+        lines = 0
+        records = 0
+        with open(path, "rb") as handle:
+            if file_type == "fasta" and handle.peek(2)[:2] == fasta.GZIP_MAGIC:
+                return None
+            previous = b"\n"
+            while block := handle.read(1024 * 1024):
+                lines += block.count(b"\n")
+                records += block.count(b"\n>") + (previous == b"\n" and block.startswith(b">"))
+                previous = block[-1:]
+        return records if file_type == "fasta" else max(lines - 1, 0)
+
+    @staticmethod
+    def to_proteins(
+        df: pd.DataFrame,
+        errors: List[Dict[str, Any]],
+        row_offset: int = 0
+    ) -> Tuple[List[ProteinCreate], List[int]]:
+        columns = [column for column in PROTEIN_COLUMNS if column in df.columns]
+        frame = df[columns].astype(object).where(df[columns].notna(), None)
+        proteins = []
+        rows = []
+        for index, record in zip(frame.index, frame.to_dict("records")):
+            keywords = record.get("keywords")
+            if isinstance(keywords, str):
+                record["keywords"] = [k.strip() for k in keywords.split(",") if k.strip()]
+            try:
+                proteins.append(ProteinCreate(**record))
+            except ValidationError as e:
+                errors.append({
+                    "row": int(index) + row_offset,
+                    "error": "; ".join(
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                    )
+                })
+                continue
+            rows.append(int(index))
+        return proteins, rows
+
+    @staticmethod
+    def drop_duplicates(
+        db: Session,
+        valid: pd.DataFrame,
+        errors: List[Dict[str, Any]],
+        row_offset: int = 0
+    ) -> pd.DataFrame:
+        matches = DuplicateService.match_sequences(
+            db, valid["sequence"].tolist(), threshold=settings.duplicate_identity_threshold, limit=1
+        )
+        keep = []
+        for index, found in zip(valid.index, matches):
+            keep.append(not found)
+            if found:
+                errors.append({
+                    "row": int(index) + row_offset,
+                    "error": f"Near-duplicate of protein {found[0]['protein_id']} ({found[0]['identity']:.1%} identity)"
+                })
+        return valid[keep]
+
+    @staticmethod
+    def run_import(
+        db: Session,
+        job_id: int,
+        path: str,
+        chunk_size: int = 5000,
+        context: Optional[JobContext] = None
+    ) -> Optional[ImportJob]:
+        job = db.get(ImportJob, job_id)
+        if not job:
+            return None
+
+        user = db.get(User, job.created_by)
+        options = job.options or {}
+        errors: List[Dict[str, Any]] = []
+        warnings: List[Dict[str, Any]] = []
+
+        job.status = ImportStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        db.commit()
+
+        started = time.monotonic()
+        offset = 0
+        row_offset = 1 if job.file_type == "fasta" else 2
+        try:
+            estimated_rows = ImportService.estimate_rows(path, job.file_type) if context else None
+            for chunk in ImportService.read_chunks(path, job.file_type, chunk_size):
+                chunk.index = range(offset, offset + len(chunk))
+                valid, chunk_errors, chunk_warnings = ProteinValidator.validate_dataframe(
+                    chunk,
+                    validate_sequences=options.get("validate_sequences", True),
+                    validate_uniprot=options.get("validate_uniprot", False),
+                    row_offset=row_offset
+                )
+
+                if options.get("check_duplicates") and not valid.empty:
+                    valid = ImportService.drop_duplicates(db, valid, chunk_errors, row_offset=row_offset)
+
+                imported = 0
+                proteins, rows = ImportService.to_proteins(valid, chunk_errors, row_offset=row_offset)
+                if proteins:
+                    results = ProteinService.bulk_create(db, proteins, user, chunk_size=chunk_size)
+                    for result in results:
+                        if result["status"] == "created":
+                            imported += 1
+                        else:
+                            chunk_errors.append({"row": rows[result["index"]] + row_offset, "error": result["error"]})
+
+                offset += len(chunk)
+                ImportService._append_capped(errors, chunk_errors)
+                ImportService._append_capped(warnings, chunk_warnings)
+
+                job.rows_total = offset
+                job.rows_imported += imported
+                job.rows_failed = job.rows_total - job.rows_imported
+                job.rows_per_second = offset / max(time.monotonic() - started, 1e-6)
+                job.errors = list(errors)
+                job.warnings = list(warnings)
+                db.commit()
+
+                if context:
+                    context.progress(
+                        offset / estimated_rows if estimated_rows else None,
+                        f"{offset} rows processed"
+                    )
+
+            job.status = ImportStatus.COMPLETED
+        except JobCancelled:
+            job.status = ImportStatus.CANCELLED
+        except Exception as e:
+            db.rollback()
+            ImportService._append_capped(errors, [{"row": None, "error": str(e)}])
+            job.errors = list(errors)
+            job.status = ImportStatus.FAILED
+
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def _append_capped(target: List[Dict[str, Any]], messages: List[Dict[str, Any]]):
+        room = ImportService.MAX_STORED_MESSAGES - len(target)
+        if room > 0:
+            target.extend(messages[:room])
+
+class AsyncImportService:
+    @staticmethod
+    async def create_job(db: AsyncSession, filename: str, file_type: str, options: Dict, user: User) -> ImportJob:
+        job = ImportJob(
+            filename=filename,
+            file_type=file_type,
+            status=ImportStatus.PENDING,
+            options=options,
+            errors=[],
+            warnings=[],
+            created_by=user.id
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: int) -> Optional[ImportJob]:
+        return await db.get(ImportJob, job_id)
+
+    @staticmethod
+    async def list_jobs(db: AsyncSession, skip: int = 0, limit: int = 50) -> List[ImportJob]:
+        return list(await db.scalars(
+            select(ImportJob).order_by(ImportJob.created_at.desc(), ImportJob.id.desc()).offset(skip).limit(limit)
+        ))
@@ -0,0 +1,258 @@
+import os
+import time
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_, func
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from app.core.cache import redis_client, async_redis_client
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.job import Job, JobStatus
+from app.models.user import User
+
+settings = get_settings()
+
+QUEUE_KEY = b"jobs:queue"
+QUEUE_LIMIT = 64
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class JobCancelled(Exception):
+    pass
+
+class JobContext:
+    def __init__(self, job_id: int, params: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None):
+        self.job_id = job_id
+        self.params = params or {}
+        self.user_id = user_id
+        self.cancelled = False
+
+    def heartbeat(self, fraction: Optional[float] = None, message: Optional[str] = None) -> bool:
+        values = {"heartbeat_at": datetime.now(timezone.utc)}
+        if fraction is not None:
+            values["progress"] = max(0.0, min(1.0, fraction))
+        if message is not None:
+            values["message"] = message
+
+        db = SessionLocal()
+        try:
+            cancel_requested = db.scalar(
+                update(Job).where(Job.id == self.job_id).values(**values).returning(Job.cancel_requested)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        self.cancelled = self.cancelled or bool(cancel_requested)
+        return self.cancelled
+
+    def progress(self, fraction: Optional[float] = None, message: Optional[str] = None):
+        if self.heartbeat(fraction, message):
+            raise JobCancelled()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+class JobService:
+    @staticmethod
+    def bounded(value: Optional[int], default: int, limit: int) -> int:
+        return max(1, min(int(value or default), limit))
+
+    @staticmethod
+    def workers(value: Optional[int], default: int) -> int:
+        limit = settings.job_max_workers or os.cpu_count() or 1
+        return JobService.bounded(value, default or limit, limit)
+
+    @staticmethod
+    def enqueue(db: Session, kind: str, params: Dict[str, Any], user: Optional[User] = None) -> Job:
+        job = Job(kind=kind, params=params, status=JobStatus.QUEUED, created_by=user.id if user else None)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        JobService.notify()
+        return job
+
+    @staticmethod
+    def enqueue_merged(db: Session, kind: str, key: str, values: List[Any], user: Optional[User] = None) -> Job:
+        values = sorted(set(values))
+        job = db.scalar(JobService.mergeable_query(kind, key, settings.job_merge_limit - len(values)))
+        if job is None:
+            for chunk in JobService.merge_chunks(values):
+                job = JobService.enqueue(db, kind, {key: chunk}, user)
+            return job
+        job.params = {**job.params, key: sorted(set(job.params[key]).union(values))}
+        db.commit()
+        return job
+
+    @staticmethod
+    def mergeable_query(kind: str, key: str, room: int):
+        return (
+            select(Job)
+            .filter(Job.kind == kind, Job.status == JobStatus.QUEUED, func.json_array_length(Job.params[key]) <= room)
+            .order_by(Job.id.desc()).limit(1).with_for_update(skip_locked=True)
+        )
+
+    @staticmethod
+    def merge_chunks(values: List[Any]) -> List[List[Any]]:
+        limit = settings.job_merge_limit
+        return [values[start:start + limit] for start in range(0, len(values) or 1, limit)]
+
+    @staticmethod
+    def notify():
+        if redis_client:
+            try:
+                redis_client.pipeline(transaction=False).rpush(QUEUE_KEY, b"1").ltrim(
+                    QUEUE_KEY, -QUEUE_LIMIT, -1
+                ).execute()
+            except Exception:
+                pass
+
+    @staticmethod
+    def wait_for_work(timeout: float):
+        if redis_client:
+            try:
+                redis_client.blpop([QUEUE_KEY], timeout=max(1, int(timeout)))
+                return
+            except Exception:
+                pass
+        time.sleep(timeout)
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[Job]:
+        return db.get(Job, job_id)
+
+    @staticmethod
+    def claim(db: Session, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[Job]:
+        query = select(Job).filter(Job.status == JobStatus.QUEUED)
+        if kinds:
+            query = query.filter(Job.kind.in_(kinds))
+        job = db.scalars(query.order_by(Job.id).limit(1).with_for_update(skip_locked=True)).first()
+        if not job:
+            db.rollback()
+            return None
+
+        now = datetime.now(timezone.utc)
+        job.status = JobStatus.RUNNING
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def complete(db: Session, job: Job, result: Optional[Dict[str, Any]] = None) -> Job:
+        job.status = JobStatus.COMPLETED
+        job.progress = 1.0
+        job.result = result
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return job
+
+    @staticmethod
+    def fail(db: Session, job: Job, error: str) -> Job:
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return job
+
+    @staticmethod
+    def mark_cancelled(db: Session, job: Job) -> Job:
+        job.status = JobStatus.CANCELLED
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return job
+
+    @staticmethod
+    def requeue_stale(db: Session, stale_after: int, max_attempts: int) -> int:
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=stale_after)
+        stale = and_(Job.status == JobStatus.RUNNING, Job.heartbeat_at < cutoff)
+
+        db.execute(
+            update(Job)
+            .where(stale, Job.attempts >= max_attempts)
+            .values(status=JobStatus.FAILED, error="Worker stopped responding", finished_at=now)
+        )
+        requeued = db.execute(
+            update(Job)
+            .where(stale, Job.attempts < max_attempts)
+            .values(status=JobStatus.QUEUED, worker_id=None)
+        ).rowcount
+        db.commit()
+        return requeued
+
+class AsyncJobService:
+    @staticmethod
+    async def enqueue(db: AsyncSession, kind: str, params: Dict[str, Any], user: Optional[User] = None) -> Job:
+        job = Job(kind=kind, params=params, status=JobStatus.QUEUED, created_by=user.id if user else None)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        await AsyncJobService.notify()
+        return job
+
+    @staticmethod
+    async def enqueue_merged(
+        db: AsyncSession, kind: str, key: str, values: List[Any], user: Optional[User] = None
+    ) -> Job:
+        values = sorted(set(values))
+        job = await db.scalar(JobService.mergeable_query(kind, key, settings.job_merge_limit - len(values)))
+        if job is None:
+            for chunk in JobService.merge_chunks(values):
+                job = await AsyncJobService.enqueue(db, kind, {key: chunk}, user)
+            return job
+        job.params = {**job.params, key: sorted(set(job.params[key]).union(values))}
+        await db.commit()
+        return job
+
+    @staticmethod
+    async def notify():
+        if async_redis_client:
+            try:
+                await async_redis_client.pipeline(transaction=False).rpush(QUEUE_KEY, b"1").ltrim(
+                    QUEUE_KEY, -QUEUE_LIMIT, -1
+                ).execute()
+            except Exception:
+                pass
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: int) -> Optional[Job]:
+        return await db.get(Job, job_id)
+
+    @staticmethod
+    async def list_jobs(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        kind: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        user: Optional[User] = None
+    ) -> List[Job]:
+        query = select(Job)
+        if kind:
+            query = query.filter(Job.kind == kind)
+        if status:
+            query = query.filter(Job.status == status)
+        if user:
+            query = query.filter(Job.created_by == user.id)
+        return list(await db.scalars(query.order_by(Job.id.desc()).offset(skip).limit(limit)))
+
+    @staticmethod
+    async def request_cancel(db: AsyncSession, job_id: int) -> Optional[Job]:
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.CANCELLED, cancel_requested=True, finished_at=datetime.now(timezone.utc))
+        )
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(cancel_requested=True)
+        )
+        await db.commit()
+        return await db.get(Job, job_id, populate_existing=True)
@@ -0,0 +1,272 @@
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert, or_
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from app.core.config import get_settings
+from app.models.protein import Protein
+from app.models.kmer_spectrum import SpectrumIndexState, SpectrumBlock
+from app.services.job_service import JobContext
+from app.services.sequence_search_service import IndexNotBuilt
+from app.utils.kmer_spectrum import (
+    SPECTRUM_K, METRICS, Row, SpectrumIndex, SpectrumMatrix, spectrum, from_bytes, superseded
+)
+from app.utils.sequence_store import GARBAGE_RATIO
+
+settings = get_settings()
+
+class KmerSpectrumService:
+    STATE_ID = 1
+    _blocks: "OrderedDict[Tuple[int, int], Tuple[np.ndarray, SpectrumIndex]]" = OrderedDict()
+    _stale: Dict[Tuple[int, int], List[np.ndarray]] = {}
+    _lock = Lock()
+
+    @staticmethod
+    def get_state(db: Session) -> Optional[SpectrumIndexState]:
+        return db.get(SpectrumIndexState, KmerSpectrumService.STATE_ID)
+
+    @staticmethod
+    def protein_rows(proteins: Sequence[Any]) -> List[Row]:
+        return [
+            from_bytes(protein.kmer_spectrum) if protein.kmer_spectrum is not None else spectrum(protein.sequence)
+            for protein in proteins
+        ]
+
+    @staticmethod
+    def block_values(generation: int, block: int, proteins: Sequence[Any]) -> Dict[str, Any]:
+        matrix = SpectrumMatrix.from_rows(KmerSpectrumService.protein_rows(proteins))
+        return {
+            "generation": generation,
+            "block": block,
+            "protein_ids": np.array([protein.id for protein in proteins], dtype="<i4").tobytes(),
+            "indptr": matrix.indptr.astype("<i8").tobytes(),
+            "indices": matrix.indices.astype("<u2").tobytes(),
+            "counts": matrix.counts.astype("<u2").tobytes()
+        }
+
+    @staticmethod
+    def build_index(
+        db: Session,
+        full: bool = False,
+        block_size: Optional[int] = None,
+        context: Optional[JobContext] = None
+    ) -> SpectrumIndexState:
+        block_size = block_size or settings.kmer_spectrum_block_size
+        state = KmerSpectrumService.get_state(db)
+        if state is None:
+            state = SpectrumIndexState(
+                id=KmerSpectrumService.STATE_ID, k=SPECTRUM_K, generation=0, block_count=0,
+                protein_count=0, max_protein_id=0
+            )
+            db.add(state)
+            db.commit()
+        if state.built_at is None or (state.stale_count or 0) > state.protein_count * GARBAGE_RATIO:
+            full = True
+
+        synced_at = datetime.now(timezone.utc)
+        if full:
+            generation = state.generation + 1
+            db.execute(delete(SpectrumBlock).where(SpectrumBlock.generation >= generation))
+            db.commit()
+            block, max_id, proteins_indexed, stale = 0, 0, 0, 0
+            pending = Protein.id > 0
+        else:
+            generation = state.generation
+            block, max_id, proteins_indexed, stale = (
+                state.block_count, state.max_protein_id, state.protein_count, state.stale_count or 0
+            )
+            pending = or_(Protein.id > max_id, Protein.updated_at > (state.synced_at or state.built_at))
+
+        indexed_max = max_id
+        total = db.query(Protein.id).filter(pending).count()
+        done, last_id = 0, 0
+        while True:
+            proteins = db.execute(
+                select(Protein.id, Protein.kmer_spectrum, Protein.sequence)
+                .filter(Protein.id > last_id, pending).order_by(Protein.id).limit(block_size)
+            ).all()
+            if not proteins:
+                break
+
+            db.execute(insert(SpectrumBlock), [KmerSpectrumService.block_values(generation, block, proteins)])
+            block += 1
+            last_id = proteins[-1].id
+            max_id = max(max_id, last_id)
+            proteins_indexed += len(proteins)
+            stale += sum(1 for protein in proteins if protein.id <= indexed_max)
+            done += len(proteins)
+
+            if not full:
+                state.block_count = block
+                state.max_protein_id = max_id
+                state.protein_count = proteins_indexed
+                state.stale_count = stale
+            db.commit()
+
+            if context:
+                context.progress(done / total if total else None, f"{done} of {total} spectra indexed")
+
+        if full:
+            previous = state.generation
+            state.generation = generation
+            state.block_count = block
+            state.max_protein_id = max_id
+            state.protein_count = proteins_indexed
+            state.stale_count = 0
+            state.built_at = synced_at
+            db.execute(delete(SpectrumBlock).where(SpectrumBlock.generation == previous))
+        state.synced_at = synced_at
+        db.commit()
+
+        db.refresh(state)
+        return state
+
+    @staticmethod
+    def load_blocks(
+        db: Session, state: Optional[SpectrumIndexState]
+    ) -> List[Tuple[np.ndarray, SpectrumIndex, Optional[np.ndarray]]]:
+        if state is None or state.built_at is None:
+            return []
+
+        keys = [(state.generation, block) for block in range(state.block_count)]
+        cache = KmerSpectrumService._blocks
+        with KmerSpectrumService._lock:
+            for key in [key for key in cache if key[0] != state.generation]:
+                del cache[key]
+            missing = [block for generation, block in keys if (generation, block) not in cache]
+            if missing:
+                rows = db.scalars(
+                    select(SpectrumBlock).filter(
+                        SpectrumBlock.generation == state.generation, SpectrumBlock.block.in_(missing)
+                    )
+                )
+                for row in rows:
+                    matrix = SpectrumMatrix(
+                        np.frombuffer(row.indptr, dtype="<i8"),
+                        np.frombuffer(row.indices, dtype="<u2"),
+                        np.frombuffer(row.counts, dtype="<u2")
+                    )
+                    cache[(row.generation, row.block)] = (
+                        np.frombuffer(row.protein_ids, dtype="<i4").astype(np.int64), SpectrumIndex(matrix)
+                    )
+            loaded = []
+            for key in keys:
+                if key in cache:
+                    cache.move_to_end(key)
+                    loaded.append(cache[key])
+            while len(cache) > max(settings.kmer_spectrum_cache_blocks, len(keys)):
+                cache.popitem(last=False)
+
+            key = (state.generation, state.block_count)
+            if state.stale_count and key not in KmerSpectrumService._stale:
+                KmerSpectrumService._stale = {key: superseded([ids for ids, _ in loaded])}
+            stale = KmerSpectrumService._stale.get(key) if state.stale_count else None
+        return [(ids, index, stale[block] if stale else None) for block, (ids, index) in enumerate(loaded)]
+
+    @staticmethod
+    def unindexed_proteins(db: Session, state: SpectrumIndexState) -> Tuple[np.ndarray, SpectrumMatrix]:
+        proteins = db.execute(
+            select(Protein.id, Protein.kmer_spectrum, Protein.sequence).filter(or_(
+                Protein.id > state.max_protein_id,
+                Protein.updated_at > (state.synced_at or state.built_at)
+            ))
+        ).all()
+        return (
+            np.array([protein.id for protein in proteins], dtype=np.int64),
+            SpectrumMatrix.from_rows(KmerSpectrumService.protein_rows(proteins))
+        )
+
+    @staticmethod
+    def rank(
+        db: Session,
+        sequences: Sequence[str] = (),
+        protein_ids: Sequence[int] = (),
+        metric: str = "cosine",
+        limit: int = 50,
+        min_score: float = 0.0
+    ) -> Dict[str, Any]:
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+        if not sequences and not protein_ids:
+            raise ValueError("At least one sequence or protein_id is required")
+
+        queries = [{"protein_id": None, "row": spectrum(sequence)} for sequence in sequences]
+        if protein_ids:
+            stored = {
+                row.id: row for row in db.execute(
+                    select(Protein.id, Protein.kmer_spectrum, Protein.sequence).filter(Protein.id.in_(protein_ids))
+                )
+            }
+            missing = [protein_id for protein_id in protein_ids if protein_id not in stored]
+            if missing:
+                raise ValueError(f"Proteins not found: {', '.join(map(str, missing))}")
+            for protein_id in protein_ids:
+                queries.append({
+                    "protein_id": protein_id, "row": KmerSpectrumService.protein_rows([stored[protein_id]])[0]
+                })
+        if any(not len(query["row"][0]) for query in queries):
+            raise ValueError(f"Queries must contain at least {SPECTRUM_K} consecutive standard amino acids")
+
+        matrix = SpectrumMatrix.from_rows([query["row"] for query in queries])
+        state = KmerSpectrumService.get_state(db)
+        if state is None or state.built_at is None:
+            raise IndexNotBuilt("The k-mer spectrum index has not been built yet; run a kmer_spectrum job")
+        blocks = KmerSpectrumService.load_blocks(db, state)
+        delta_ids, delta = KmerSpectrumService.unindexed_proteins(db, state)
+
+        candidates = limit * 2
+        found: List[List[Tuple[np.ndarray, ...]]] = [[] for _ in queries]
+        sources = blocks + [(delta_ids, SpectrumIndex(delta), None)]
+        indexed_proteins = 0
+        for ids, index, stale in sources:
+            exclude = np.isin(ids, delta_ids) if index.size and ids is not delta_ids else None
+            if stale is not None:
+                exclude = stale if exclude is None else exclude | stale
+            indexed_proteins += len(ids) - (int(exclude.sum()) if exclude is not None else 0)
+            for position, (rows, cosine, jaccard, shared) in enumerate(
+                index.best_matches(matrix, metric, candidates, min_score, exclude)
+            ):
+                found[position].append((ids[rows], cosine, jaccard, shared))
+
+        results = []
+        for query, matches in zip(queries, found):
+            ids, cosine, jaccard, shared = (np.concatenate(column) for column in zip(*matches))
+            ranking = cosine if metric == "cosine" else jaccard
+            order = np.lexsort((ids, -ranking))[:candidates]
+            results.append((query, ids[order], cosine[order], jaccard[order], shared[order]))
+
+        hit_ids = {int(protein_id) for _, ids, _, _, _ in results for protein_id in ids}
+        proteins = {
+            row.id: row for row in db.execute(
+                select(Protein.id, Protein.uniprot_id, Protein.name, Protein.organism, Protein.length)
+                .filter(Protein.id.in_(hit_ids))
+            )
+        } if hit_ids else {}
+
+        return {
+            "metric": metric,
+            "database_proteins": indexed_proteins,
+            "queries": [
+                {
+                    "protein_id": query["protein_id"],
+                    "distinct_kmers": len(query["row"][0]),
+                    "hits": [
+                        {
+                            "protein_id": protein_id,
+                            "uniprot_id": proteins[protein_id].uniprot_id,
+                            "name": proteins[protein_id].name,
+                            "organism": proteins[protein_id].organism,
+                            "length": proteins[protein_id].length,
+                            "cosine": round(float(cos), 4),
+                            "jaccard": round(float(jac), 4),
+                            "shared_kmers": int(common)
+                        }
+                        for protein_id, cos, jac, common in zip(ids.tolist(), cosine, jaccard, shared)
+                        if protein_id in proteins and protein_id != query["protein_id"]
+                    ][:limit]
+                }
+                for query, ids, cosine, jaccard, shared in results
+            ]
+        }
@@ -0,0 +1,152 @@
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import get_context
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.motif_scan import MotifScanHit
+from app.models.protein import Protein
+from app.schemas.protein import ProteinSearch
+from app.services.job_service import JobContext, JobService
+from app.services.protein_service import ProteinService
+from app.services.sequence_store_service import SequenceStoreService
+from app.utils.motifs import Motif, PROSITE_PATTERNS, load_prosite_dat
+from app.workers.motif_scan import MotifSpec, init_worker, scan_positions
+
+settings = get_settings()
+
+class MotifScanService:
+    @staticmethod
+    def motif_specs(
+        patterns: Optional[Mapping[str, str]] = None,
+        include_library: bool = False,
+        library_path: Optional[str] = None
+    ) -> List[MotifSpec]:
+        specs: List[MotifSpec] = []
+        if include_library:
+            library = load_prosite_dat(library_path) if library_path else PROSITE_PATTERNS
+            specs.extend((accession, pattern, description) for accession, (description, pattern) in library.items())
+        specs.extend((name, pattern, None) for name, pattern in (patterns or {}).items())
+        if not specs:
+            raise ValueError("At least one pattern is required")
+        for name, pattern, description in specs:
+            Motif(name, pattern, description)
+        return specs
+
+    @staticmethod
+    def scan(
+        db: Session,
+        job_id: int,
+        specs: Sequence[MotifSpec],
+        search: Optional[ProteinSearch] = None,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        context: Optional[JobContext] = None
+    ) -> Dict[str, Any]:
+        chunk_size = JobService.bounded(chunk_size, settings.motif_scan_chunk_size, settings.motif_scan_max_chunk_size)
+        workers = JobService.workers(workers, settings.motif_scan_workers)
+        started = time.monotonic()
+
+        writer = SessionLocal()
+        try:
+            writer.execute(delete(MotifScanHit).where(MotifScanHit.job_id == job_id))
+            writer.commit()
+
+            SequenceStoreService.sync(db, context=context)
+            with SequenceStoreService.reading() as store:
+                summary = MotifScanService._scan_store(
+                    db, job_id, specs, store, writer, search, chunk_size, workers, context
+                )
+        finally:
+            writer.close()
+
+        seconds = time.monotonic() - started
+        return {
+            **summary,
+            "workers": workers,
+            "seconds": round(seconds, 2),
+            "proteins_per_second": round(summary["scanned"] / seconds, 1) if seconds else None
+        }
+
+    @staticmethod
+    def _scan_store(db, job_id, specs, store, writer, search, chunk_size, workers, context) -> Dict[str, Any]:
+        total = db.scalar(ProteinService.apply_search(select(func.count(Protein.id)), search))
+        ids = db.execute(
+            ProteinService.apply_search(select(Protein.id), search)
+            .order_by(Protein.id)
+            .execution_options(yield_per=chunk_size)
+        ).scalars()
+
+        names = [spec[0] for spec in specs]
+        counts = np.zeros(len(specs), dtype=np.int64)
+        summary = {"scanned": 0, "hits": 0, "proteins_with_hits": 0}
+        pending = set()
+
+        def collect(done):
+            for future in done:
+                pending.discard(future)
+                protein_ids, motifs, starts, ends = future.result()
+                if len(protein_ids):
+                    writer.execute(insert(MotifScanHit.__table__), [
+                        {"job_id": job_id, "protein_id": protein_id, "pattern": names[motif], "start": start, "end": end}
+                        for protein_id, motif, start, end in zip(
+                            protein_ids.tolist(), motifs.tolist(), starts.tolist(), ends.tolist()
+                        )
+                    ])
+                    writer.commit()
+                    np.add(counts, np.bincount(motifs, minlength=len(counts)), out=counts)
+                    summary["hits"] += len(protein_ids)
+                    summary["proteins_with_hits"] += len(np.unique(protein_ids))
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn"), initializer=init_worker,
+            initargs=(list(specs), store.directory, store.manifest)
+        )
+        try:
+            for chunk in ids.partitions():
+                positions = store.positions(chunk)
+                positions = positions[positions >= 0]
+                pending.add(pool.submit(scan_positions, positions))
+                summary["scanned"] += len(positions)
+                if len(pending) >= workers * 2:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                    if context:
+                        context.progress(
+                            summary["scanned"] / total if total else None,
+                            f"{summary['scanned']} of {total} proteins scanned, {summary['hits']} hits"
+                        )
+            while pending:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+        return {**summary, "patterns": {name: int(count) for name, count in zip(names, counts) if count}}
+
+class AsyncMotifScanService:
+    @staticmethod
+    async def list_hits(
+        db: AsyncSession,
+        job_id: int,
+        pattern: Optional[str] = None,
+        protein_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        query = (
+            select(
+                MotifScanHit.protein_id, Protein.uniprot_id, Protein.name,
+                MotifScanHit.pattern, MotifScanHit.start, MotifScanHit.end
+            )
+            .join(Protein, Protein.id == MotifScanHit.protein_id)
+            .filter(MotifScanHit.job_id == job_id)
+        )
+        if pattern:
+            query = query.filter(MotifScanHit.pattern == pattern)
+        if protein_id is not None:
+            query = query.filter(MotifScanHit.protein_id == protein_id)
+        rows = await db.execute(query.order_by(MotifScanHit.id).offset(skip).limit(limit))
+        return [dict(row._mapping) for row in rows]
@@ -0,0 +1,224 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, exists, func
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.core.config import get_settings
+from app.models.protein import Protein
+from app.models.protein_neighbor import ProteinNeighbor
+from app.services.job_service import JobContext
+from app.services.vector_index_service import VectorIndexService
+from app.utils.descriptors import descriptors
+from app.utils.sequence_store import read_manifest
+
+settings = get_settings()
+
+class ProteinNeighborService:
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def related_query(protein_id: int):
+        return (
+            select(
+                ProteinNeighbor.neighbor_id, Protein.uniprot_id, Protein.name, Protein.organism, Protein.length,
+                ProteinNeighbor.distance
+            )
+            .join(Protein, Protein.id == ProteinNeighbor.neighbor_id)
+            .filter(ProteinNeighbor.protein_id == protein_id)
+            .order_by(ProteinNeighbor.rank)
+        )
+
+    @staticmethod
+    def related_rows(rows) -> List[Dict[str, Any]]:
+        return [
+            {
+                "protein_id": row.neighbor_id,
+                "uniprot_id": row.uniprot_id,
+                "name": row.name,
+                "organism": row.organism,
+                "length": row.length,
+                "distance": round(row.distance, 4)
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def related(db: Session, protein_id: int) -> List[Dict[str, Any]]:
+        return ProteinNeighborService.related_rows(db.execute(ProteinNeighborService.related_query(protein_id)))
+
+    @staticmethod
+    def refresh(
+        db: Session,
+        protein_ids: Optional[Sequence[int]] = None,
+        full: bool = False,
+        context: Optional[JobContext] = None
+    ) -> Dict[str, Any]:
+        manifest = read_manifest(VectorIndexService.directory())
+        if full or protein_ids is None or manifest is None or VectorIndexService.needs_rebuild(manifest):
+            VectorIndexService.sync(db)
+        k = settings.protein_neighbors_k
+
+        if full:
+            changed = db.scalars(select(Protein.id).order_by(Protein.id)).all()
+            stale = []
+        elif protein_ids is None:
+            changed = db.scalars(
+                select(Protein.id)
+                .filter(~exists().where(ProteinNeighbor.protein_id == Protein.id))
+                .order_by(Protein.id)
+            ).all()
+            stale = []
+        else:
+            requested = sorted(set(protein_ids))
+            changed = db.scalars(select(Protein.id).filter(Protein.id.in_(requested)).order_by(Protein.id)).all()
+            stale = db.scalars(
+                select(ProteinNeighbor.protein_id.distinct())
+                .filter(ProteinNeighbor.neighbor_id.in_(requested), ProteinNeighbor.protein_id.notin_(changed))
+                .order_by(ProteinNeighbor.protein_id)
+            ).all()
+            VectorIndexService.insert([], sorted(set(requested) - set(changed)), blocking=True)
+            for ids in ProteinNeighborService._batches(changed):
+                VectorIndexService.insert(
+                    db.execute(select(Protein.id, Protein.sequence).filter(Protein.id.in_(ids))).all(), blocking=True
+                )
+
+        radii = ProteinNeighborService._radii(db, k) if not full else None
+        pending = set(changed) | set(stale)
+        total = len(pending)
+        stats = {"proteins": 0, "affected": 0}
+        work = [(ids, radii) for ids in ProteinNeighborService._batches(changed)]
+        work += [(ids, None) for ids in ProteinNeighborService._batches(stale)]
+        for ids, batch_radii in work:
+            stats["affected"] += ProteinNeighborService._refresh_batch(db, ids, k, batch_radii, pending)
+            stats["proteins"] += len(ids)
+            if context:
+                context.progress(
+                    stats["proteins"] / total if total else None, f"{stats['proteins']} of {total} proteins refreshed"
+                )
+
+        stats["k"] = k
+        stats["neighbor_rows"] = db.scalar(select(func.count()).select_from(ProteinNeighbor))
+        return stats
+
+    @staticmethod
+    def _batches(ids: Sequence[int]) -> Iterator[List[int]]:
+        for start in range(0, len(ids), ProteinNeighborService.BATCH_SIZE):
+            yield list(ids[start:start + ProteinNeighborService.BATCH_SIZE])
+
+    @staticmethod
+    def _refresh_batch(
+        db: Session,
+        protein_ids: List[int],
+        k: int,
+        radii: Optional[Tuple[np.ndarray, np.ndarray]],
+        pending: set
+    ) -> int:
+        ids = np.array(protein_ids, dtype=np.int64)
+        with VectorIndexService.reading() as index:
+            rows = index.rows_of(ids)
+            vectors = np.empty((len(ids), index.manifest["dimensions"]), dtype=np.float32)
+            vectors[rows >= 0] = index.vectors[rows[rows >= 0]]
+            if (rows < 0).any():
+                missing = dict(db.execute(
+                    select(Protein.id, Protein.sequence).filter(Protein.id.in_(ids[rows < 0].tolist()))
+                ).all())
+                vectors[rows < 0] = descriptors([missing.get(protein_id, "") for protein_id in ids[rows < 0].tolist()])
+
+            found, distances = index.search_many(vectors, k, settings.vector_index_probes, exclude=ids)
+            matches = index.within(
+                vectors, ProteinNeighborService.row_radii(np.asarray(index.ids), *radii), settings.vector_index_probes,
+                exclude=ids
+            ) if radii is not None else []
+        candidates = ProteinNeighborService.reverse_candidates(protein_ids, matches, pending)
+
+        db.execute(
+            select(Protein.id)
+            .filter(Protein.id.in_(sorted(set(protein_ids) | set(candidates))))
+            .order_by(Protein.id).with_for_update()
+        ).all()
+        lists = ProteinNeighborService.top_lists(protein_ids, found, distances, k)
+        lists.update(ProteinNeighborService.merge(ProteinNeighborService._current(db, candidates), candidates, k))
+
+        db.execute(delete(ProteinNeighbor).filter(ProteinNeighbor.protein_id.in_(list(lists))))
+        values = [
+            {"protein_id": protein_id, "rank": rank, "neighbor_id": neighbor_id, "distance": distance}
+            for protein_id, neighbors in lists.items()
+            for rank, (neighbor_id, distance) in enumerate(neighbors, start=1)
+        ]
+        if values:
+            db.execute(insert(ProteinNeighbor), values)
+        db.commit()
+        return len(lists) - len(protein_ids)
+
+    @staticmethod
+    def top_lists(
+        protein_ids: Sequence[int], found: np.ndarray, distances: np.ndarray, k: int
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        return {
+            protein_id: [
+                (neighbor_id, distance) for neighbor_id, distance in zip(neighbors[:k], values[:k]) if neighbor_id >= 0
+            ]
+            for protein_id, neighbors, values in zip(protein_ids, found.tolist(), distances.tolist())
+        }
+
+    @staticmethod
+    def row_radii(row_ids: np.ndarray, protein_ids: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        values = np.full(len(row_ids), -1.0)
+        if len(protein_ids):
+            positions = np.minimum(np.searchsorted(protein_ids, row_ids), len(protein_ids) - 1)
+            found = protein_ids[positions] == row_ids
+            values[found] = radii[positions[found]]
+        return values
+
+    @staticmethod
+    def reverse_candidates(
+        protein_ids: Sequence[int], matches: Sequence[Tuple[np.ndarray, np.ndarray]], pending: set
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        candidates = {}
+        for protein_id, (neighbors, distances) in zip(protein_ids, matches):
+            for neighbor_id, distance in zip(neighbors.tolist(), distances.tolist()):
+                if neighbor_id not in pending:
+                    candidates.setdefault(neighbor_id, []).append((protein_id, distance))
+        return candidates
+
+    @staticmethod
+    def merge(
+        current: Dict[int, List[Tuple[int, float]]], candidates: Dict[int, List[Tuple[int, float]]], k: int
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        merged = {}
+        for protein_id, neighbors in current.items():
+            added = dict(candidates.get(protein_id, []))
+            kept = [(neighbor_id, distance) for neighbor_id, distance in neighbors if neighbor_id not in added]
+            updated = sorted(kept + list(added.items()), key=lambda pair: (pair[1], pair[0]))[:k]
+            if updated != neighbors:
+                merged[protein_id] = updated
+        return merged
+
+    @staticmethod
+    def _radii(db: Session, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        rows = db.execute(
+            select(ProteinNeighbor.protein_id, func.count(), func.max(ProteinNeighbor.distance))
+            .group_by(ProteinNeighbor.protein_id).order_by(ProteinNeighbor.protein_id)
+        ).all()
+        return (
+            np.array([row[0] for row in rows], dtype=np.int64),
+            np.array([row[2] if row[1] >= k else np.inf for row in rows], dtype=np.float64)
+        )
+
+    @staticmethod
+    def _current(db: Session, candidates: Dict[int, List[Tuple[int, float]]]) -> Dict[int, List[Tuple[int, float]]]:
+        current = {}
+        if not candidates:
+            return current
+        for row in db.execute(
+            select(ProteinNeighbor.protein_id, ProteinNeighbor.neighbor_id, ProteinNeighbor.distance)
+            .filter(ProteinNeighbor.protein_id.in_(list(candidates)))
+            .order_by(ProteinNeighbor.protein_id, ProteinNeighbor.rank)
+        ):
+            current.setdefault(row.protein_id, []).append((row.neighbor_id, row.distance))
+        return current
+
+class AsyncProteinNeighborService:
+    @staticmethod
+    async def related(db: AsyncSession, protein_id: int) -> List[Dict[str, Any]]:
+        return ProteinNeighborService.related_rows(await db.execute(ProteinNeighborService.related_query(protein_id)))
@@ -1,32 +1,54 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, tuple_, select, insert, update, func
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from datetime import datetime
 from app.models.protein import Protein, ProteinVersion
 from app.models.user import User
-from app.models.audit_log import AuditAction
-from app.schemas.protein import ProteinCreate, ProteinUpdate, ProteinSearch
-from app.services.audit_service import AuditService
+from app.models.audit_log import AuditLog, AuditAction
+from app.schemas.protein import (
+    Protein as ProteinSchema, ProteinCreate, ProteinUpdate, ProteinSearch, ProteinSort,
+    protein_projection
+)
+from app.core.cache import cache_result, invalidate_tags, ainvalidate_tags
+from app.services.audit_service import AuditService, AsyncAuditService
+from app.services.search_service import SearchService
+from app.services.vector_index_service import VectorIndexService
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.minhash import fingerprint
+from app.utils.kmer_spectrum import spectrum_values
+from app.utils import sequence_properties
+from app.utils.sequence_tools import SequenceTools
+from app.services.job_service import JobContext, JobService, AsyncJobService
+
+VERSIONED_FIELDS = (
+    "uniprot_id", "name", "sequence", "organism", "gene_name", "protein_family",
+    "function", "molecular_weight", "length", "pdb_id", "subcellular_location",
+    "post_translational_modifications", "keywords", "ec_number"
+)
+
+PROPERTY_FIELDS = ("molecular_weight", "isoelectric_point", "gravy", "instability_index", "aromaticity")
 
 class ProteinService:
+    SORT_COLUMNS = {
+        ProteinSort.ID: Protein.id,
+        ProteinSort.NAME: Protein.name,
+        ProteinSort.CREATED_AT: Protein.created_at,
+        ProteinSort.MOLECULAR_WEIGHT: Protein.molecular_weight,
+        ProteinSort.ISOELECTRIC_POINT: Protein.isoelectric_point,
+        ProteinSort.GRAVY: Protein.gravy,
+        ProteinSort.INSTABILITY_INDEX: Protein.instability_index,
+        ProteinSort.AROMATICITY: Protein.aromaticity,
+    }
+
     @staticmethod
     def create_protein(db: Session, protein: ProteinCreate, user: User) -> Protein:
-        protein_data = protein.model_dump()
-        protein_data['length'] = len(protein.sequence) if protein.sequence else None
-        protein_data['created_by'] = user.id
-        protein_data['updated_by'] = user.id
-
-        db_protein = Protein(**protein_data)
+        db_protein = ProteinService.build_protein(protein, user)
         db.add(db_protein)
         db.flush()
 
-        version = ProteinVersion(
-            protein_id=db_protein.id,
-            version_number=1,
-            **protein.model_dump(),
-            changed_by=user.id,
-            change_description="Initial creation"
-        )
-        db.add(version)
+        db.add(ProteinService.initial_version(db_protein, protein, user))
 
         AuditService.log_action(
             db=db,
@@ -39,8 +61,158 @@ class ProteinService:
 
         db.commit()
         db.refresh(db_protein)
+        invalidate_tags(*ProteinService.cache_tags(db_protein.id))
+        VectorIndexService.insert([(db_protein.id, db_protein.sequence)])
+        ProteinService.queue_neighbors(db, [db_protein.id], user)
         return db_protein
 
+    @staticmethod
+    def bulk_create(
+        db: Session,
+        proteins: Sequence[ProteinCreate],
+        user: User,
+        chunk_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        results = []
+        seen = set()
+
+        for start in range(0, len(proteins), chunk_size):
+            chunk = proteins[start:start + chunk_size]
+            uniprot_ids = [p.uniprot_id for p in chunk if p.uniprot_id]
+            existing = set()
+            if uniprot_ids:
+                existing = set(db.scalars(
+                    select(Protein.uniprot_id).filter(Protein.uniprot_id.in_(uniprot_ids))
+                ))
+
+            accepted, chunk_results = ProteinService._partition_chunk(chunk, start, existing, seen)
+            if accepted:
+                ids = db.scalars(
+                    insert(Protein).returning(Protein.id, sort_by_parameter_order=True),
+                    ProteinService.protein_rows([p for _, p in accepted], user)
+                ).all()
+                version_rows, audit_rows = ProteinService._bulk_history_rows(accepted, ids, user)
+                db.execute(insert(ProteinVersion), version_rows)
+                db.execute(insert(AuditLog), audit_rows)
+                db.commit()
+
+                ProteinService._fill_created(chunk_results, accepted, ids)
+                invalidate_tags(*ProteinService.bulk_cache_tags(ids))
+                VectorIndexService.insert([(protein_id, p.sequence) for protein_id, (_, p) in zip(ids, accepted)])
+                ProteinService.queue_neighbors(db, ids, user)
+
+            results.extend(chunk_results)
+
+        return results
+
+    @staticmethod
+    def _partition_chunk(chunk, offset: int, existing: set, seen: set):
+        accepted = []
+        results = []
+        for i, protein in enumerate(chunk):
+            index = offset + i
+            if protein.uniprot_id and (protein.uniprot_id in existing or protein.uniprot_id in seen):
+                results.append({
+                    "index": index,
+                    "uniprot_id": protein.uniprot_id,
+                    "status": "conflict",
+                    "error": "Protein with this UniProt ID already exists"
+                })
+                continue
+            if protein.uniprot_id:
+                seen.add(protein.uniprot_id)
+            accepted.append((index, protein))
+            results.append({"index": index, "uniprot_id": protein.uniprot_id, "status": "created"})
+        return accepted, results
+
+    @staticmethod
+    def _bulk_history_rows(accepted, ids: Sequence[int], user: User):
+        version_rows = []
+        audit_rows = []
+        for (_, protein), protein_id in zip(accepted, ids):
+            version_rows.append({
+                "protein_id": protein_id,
+                "version_number": 1,
+                **protein.model_dump(),
+                "changed_by": user.id,
+                "change_description": "Initial creation"
+            })
+            audit_rows.append({
+                "user_id": user.id,
+                "action": AuditAction.CREATE,
+                "entity_type": "protein",
+                "entity_id": protein_id,
+                "details": {"name": protein.name, "uniprot_id": protein.uniprot_id, "bulk": True}
+            })
+        return version_rows, audit_rows
+
+    @staticmethod
+    def _fill_created(results: List[Dict[str, Any]], accepted, ids: Sequence[int]):
+        by_index = {result["index"]: result for result in results}
+        for (index, _), protein_id in zip(accepted, ids):
+            by_index[index]["id"] = protein_id
+
+    @staticmethod
+    def queue_neighbors(db: Session, protein_ids: Sequence[int], user: Optional[User] = None):
+        JobService.enqueue_merged(db, "protein_neighbors", "protein_ids", list(protein_ids), user)
+
+    @staticmethod
+    def bulk_cache_tags(protein_ids: Sequence[int]) -> List[str]:
+        return [f"protein:{protein_id}" for protein_id in protein_ids] + ["protein-list"]
+
+    @staticmethod
+    def cache_tags(protein_id: int) -> List[str]:
+        return [f"protein:{protein_id}", "protein-list"]
+
+    @staticmethod
+    def build_protein(protein: ProteinCreate, user: User) -> Protein:
+        return Protein(**ProteinService.protein_values(protein, user))
+
+    @staticmethod
+    def protein_rows(proteins: Sequence[ProteinCreate], user: User) -> List[Dict[str, Any]]:
+        computed = ProteinService.property_values([protein.sequence for protein in proteins])
+        return [
+            ProteinService.protein_values(protein, user, values)
+            for protein, values in zip(proteins, computed)
+        ]
+
+    @staticmethod
+    def protein_values(
+        protein: ProteinCreate,
+        user: User,
+        computed: Optional[Dict[str, Optional[float]]] = None
+    ) -> Dict[str, Any]:
+        protein_data = protein.model_dump()
+        protein_data['length'] = len(protein.sequence) if protein.sequence else None
+        protein_data['sequence_hash'] = SequenceTools.sequence_hash(protein.sequence)
+        protein_data['created_by'] = user.id
+        protein_data['updated_by'] = user.id
+        protein_data.update(fingerprint(protein.sequence))
+        protein_data.update(spectrum_values(protein.sequence))
+        if computed is None:
+            computed = ProteinService.property_values([protein.sequence])[0]
+        for field, value in computed.items():
+            if protein_data.get(field) is None:
+                protein_data[field] = value
+        return protein_data
+
+    @staticmethod
+    def property_values(sequences: Sequence[str]) -> List[Dict[str, Optional[float]]]:
+        return [
+            {field: row[field] for field in PROPERTY_FIELDS}
+            for row in sequence_properties.properties(sequences)
+        ]
+
+    @staticmethod
+    def initial_version(db_protein: Protein, protein: ProteinCreate, user: User) -> ProteinVersion:
+        return ProteinVersion(
+            protein_id=db_protein.id,
+            version_number=1,
+            **protein.model_dump(),
+            changed_by=user.id,
+            change_description="Initial creation"
+        )
+
     @staticmethod
     def get_protein(db: Session, protein_id: int) -> Optional[Protein]:
         return db.query(Protein).filter(Protein.id == protein_id).first()
@@ -49,43 +221,217 @@ class ProteinService:
     def get_protein_by_uniprot_id(db: Session, uniprot_id: str) -> Optional[Protein]:
         return db.query(Protein).filter(Protein.uniprot_id == uniprot_id).first()
 
+    @staticmethod
+    def get_proteins_by_sequence_hash(db: Session, sequence_hash: str, limit: int = 100) -> List[Protein]:
+        return db.scalars(
+            select(Protein).filter(Protein.sequence_hash == sequence_hash).order_by(Protein.id).limit(limit)
+        ).all()
+
+    @staticmethod
+    def backfill_sequence_hashes(
+        db: Session,
+        batch_size: int = 10000,
+        context: Optional[JobContext] = None
+    ) -> int:
+        max_id = db.scalar(select(func.max(Protein.id))) or 0
+        normalized = func.upper(func.regexp_replace(Protein.sequence, r"\s", "", "g"))
+        digest = func.encode(func.sha256(func.convert_to(normalized, "UTF8")), "hex")
+
+        updated = 0
+        for start in range(0, max_id, batch_size):
+            ids = db.scalars(
+                update(Protein)
+                .where(Protein.id > start, Protein.id <= start + batch_size, Protein.sequence_hash.is_(None))
+                .values(sequence_hash=digest, updated_at=Protein.updated_at)
+                .returning(Protein.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+            if ids:
+                invalidate_tags(*ProteinService.bulk_cache_tags(ids))
+            updated += len(ids)
+            if context:
+                done = min(start + batch_size, max_id)
+                context.progress(done / max_id, f"{updated} hashes computed, {done} of {max_id} ids scanned")
+        return updated
+
+    @staticmethod
+    def backfill_properties(
+        db: Session,
+        batch_size: int = 5000,
+        context: Optional[JobContext] = None
+    ) -> int:
+        missing = Protein.isoelectric_point.is_(None)
+        total = db.scalar(select(func.count(Protein.id)).filter(missing))
+        done = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(Protein.id, Protein.sequence, Protein.molecular_weight, Protein.updated_at)
+                .filter(Protein.id > last_id, missing)
+                .order_by(Protein.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            computed = ProteinService.property_values([row.sequence for row in rows])
+            db.execute(update(Protein), [
+                {
+                    "id": row.id,
+                    "updated_at": row.updated_at,
+                    **values,
+                    "molecular_weight": values["molecular_weight"] if row.molecular_weight is None
+                    else row.molecular_weight
+                }
+                for row, values in zip(rows, computed)
+            ])
+            db.commit()
+            invalidate_tags(*ProteinService.bulk_cache_tags([row.id for row in rows]))
+            done += len(rows)
+            last_id = rows[-1].id
+            if context:
+                context.progress(done / total if total else None, f"{done} of {total} proteins updated")
+        return done
+
     @staticmethod
     def get_proteins(
         db: Session,
         skip: int = 0,
         limit: int = 100,
-        search: Optional[ProteinSearch] = None
+        search: Optional[ProteinSearch] = None,
+        sort: ProteinSort = ProteinSort.ID,
+        after: Optional[List[Any]] = None,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Protein]:
-        query = db.query(Protein)
+        query = ProteinService.list_query(
+            skip=skip, search=search, sort=sort, after=after, fields=fields
+        )
+        return db.scalars(query.limit(limit)).all()
+
+    @staticmethod
+    def stream_proteins(
+        db: Session,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        search: Optional[ProteinSearch] = None,
+        sort: ProteinSort = ProteinSort.ID,
+        after: Optional[List[Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Protein]:
+        query = ProteinService.list_query(
+            skip=skip, search=search, sort=sort, after=after, fields=fields
+        )
+        if limit is not None:
+            query = query.limit(limit)
+
+        for protein in db.scalars(query.execution_options(yield_per=batch_size)):
+            yield protein
+            db.expunge(protein)
+
+    @staticmethod
+    def list_query(
+        skip: int = 0,
+        search: Optional[ProteinSearch] = None,
+        sort: ProteinSort = ProteinSort.ID,
+        after: Optional[List[Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ):
+        query = ProteinService.apply_search(select(Protein), search)
+
+        if fields:
+            columns = set(fields)
+            if sort in ProteinService.SORT_COLUMNS:
+                columns.add(sort.value)
+            query = query.options(load_only(*[getattr(Protein, name) for name in columns]))
+
+        if sort == ProteinSort.RELEVANCE:
+            if search and search.query:
+                query = query.order_by(SearchService.relevance(search.query).desc(), Protein.id)
+            else:
+                query = query.order_by(Protein.id)
+            return query.offset(skip)
+
+        sort_column = ProteinService.SORT_COLUMNS[sort]
+        if sort == ProteinSort.ID:
+            query = query.order_by(Protein.id)
+        else:
+            query = query.order_by(sort_column, Protein.id)
+        if sort.value in PROPERTY_FIELDS:
+            query = query.filter(sort_column.isnot(None))
 
-        if search:
-            if search.query:
+        if after is not None:
+            if sort == ProteinSort.ID:
+                query = query.filter(Protein.id > after[0])
+            else:
                 query = query.filter(
-                    or_(
-                        Protein.name.ilike(f"%{search.query}%"),
-                        Protein.uniprot_id.ilike(f"%{search.query}%"),
-                        Protein.gene_name.ilike(f"%{search.query}%")
-                    )
+                    tuple_(sort_column, Protein.id) > tuple_(after[0], after[1])
                 )
-            if search.organism:
-                query = query.filter(Protein.organism.ilike(f"%{search.organism}%"))
-            if search.protein_family:
-                query = query.filter(Protein.protein_family.ilike(f"%{search.protein_family}%"))
-            if search.gene_name:
-                query = query.filter(Protein.gene_name.ilike(f"%{search.gene_name}%"))
-            if search.min_length:
-                query = query.filter(Protein.length >= search.min_length)
-            if search.max_length:
-                query = query.filter(Protein.length <= search.max_length)
-            if search.has_pdb is not None:
-                if search.has_pdb:
-                    query = query.filter(Protein.pdb_id.isnot(None))
-                else:
-                    query = query.filter(Protein.pdb_id.is_(None))
-            if search.is_validated is not None:
-                query = query.filter(Protein.is_validated == search.is_validated)
-
-        return query.offset(skip).limit(limit).all()
+        else:
+            query = query.offset(skip)
+
+        return query
+
+    @staticmethod
+    def apply_search(query, search: Optional[ProteinSearch]):
+        if not search:
+            return query
+
+        if search.query:
+            query = SearchService.apply_text_search(query, search.query)
+        if search.organism:
+            query = query.filter(Protein.organism.ilike(f"%{search.organism}%"))
+        if search.protein_family:
+            query = query.filter(Protein.protein_family.ilike(f"%{search.protein_family}%"))
+        if search.gene_name:
+            query = query.filter(Protein.gene_name.ilike(f"%{search.gene_name}%"))
+        if search.min_length:
+            query = query.filter(Protein.length >= search.min_length)
+        if search.max_length:
+            query = query.filter(Protein.length <= search.max_length)
+        for field in PROPERTY_FIELDS:
+            column = getattr(Protein, field)
+            minimum = getattr(search, f"min_{field}")
+            maximum = getattr(search, f"max_{field}")
+            if minimum is not None:
+                query = query.filter(column >= minimum)
+            if maximum is not None:
+                query = query.filter(column <= maximum)
+        if search.has_pdb is not None:
+            if search.has_pdb:
+                query = query.filter(Protein.pdb_id.isnot(None))
+            else:
+                query = query.filter(Protein.pdb_id.is_(None))
+        if search.is_validated is not None:
+            query = query.filter(Protein.is_validated == search.is_validated)
+
+        return query
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: ProteinSort = ProteinSort.ID) -> List[Any]:
+        if sort == ProteinSort.RELEVANCE:
+            raise ValueError("Relevance sort does not support cursors")
+
+        values = decode_cursor(cursor)
+        if len(values) != (1 if sort == ProteinSort.ID else 2):
+            raise ValueError("Cursor does not match sort order")
+        if not isinstance(values[-1], int):
+            raise ValueError("Invalid cursor")
+        if sort == ProteinSort.CREATED_AT:
+            values[0] = datetime.fromisoformat(str(values[0]))
+        if sort.value in PROPERTY_FIELDS and not isinstance(values[0], (int, float)):
+            raise ValueError("Invalid cursor")
+        return values
+
+    @staticmethod
+    def next_cursor(proteins: List[Protein], limit: int, sort: ProteinSort = ProteinSort.ID) -> Optional[str]:
+        if not proteins or len(proteins) < limit or sort == ProteinSort.RELEVANCE:
+            return None
+
+        last = proteins[-1]
+        if sort == ProteinSort.ID:
+            return encode_cursor([last.id])
+        return encode_cursor([getattr(last, sort.value), last.id])
 
     @staticmethod
     def update_protein(
@@ -99,40 +445,238 @@ class ProteinService:
         if not db_protein:
             return None
 
-        update_data = protein_update.model_dump(exclude_unset=True)
+        db.add(ProteinService.snapshot_version(db_protein, user, change_description))
+        update_data = ProteinService.apply_update(db_protein, protein_update, user)
 
+        AuditService.log_action(
+            db=db,
+            user=user,
+            action=AuditAction.UPDATE,
+            entity_type="protein",
+            entity_id=db_protein.id,
+            details={"updated_fields": list(update_data.keys())}
+        )
+
+        db.commit()
+        db.refresh(db_protein)
+        invalidate_tags(*ProteinService.cache_tags(db_protein.id))
         if "sequence" in update_data:
-            update_data["length"] = len(update_data["sequence"])
+            VectorIndexService.insert([(db_protein.id, db_protein.sequence)])
+            ProteinService.queue_neighbors(db, [db_protein.id], user)
+        return db_protein
 
-        version = ProteinVersion(
+    @staticmethod
+    def snapshot_version(
+        db_protein: Protein,
+        user: User,
+        change_description: Optional[str] = None
+    ) -> ProteinVersion:
+        return ProteinVersion(
             protein_id=db_protein.id,
             version_number=db_protein.version + 1,
-            uniprot_id=db_protein.uniprot_id,
-            name=db_protein.name,
-            sequence=db_protein.sequence,
-            organism=db_protein.organism,
-            gene_name=db_protein.gene_name,
-            protein_family=db_protein.protein_family,
-            function=db_protein.function,
-            molecular_weight=db_protein.molecular_weight,
-            length=db_protein.length,
-            pdb_id=db_protein.pdb_id,
-            subcellular_location=db_protein.subcellular_location,
-            post_translational_modifications=db_protein.post_translational_modifications,
-            keywords=db_protein.keywords,
-            ec_number=db_protein.ec_number,
+            **{field: getattr(db_protein, field) for field in VERSIONED_FIELDS},
             changed_by=user.id,
             change_description=change_description or "Updated protein data"
         )
-        db.add(version)
+
+    @staticmethod
+    def apply_update(db_protein: Protein, protein_update: ProteinUpdate, user: User) -> Dict[str, Any]:
+        update_data = protein_update.model_dump(exclude_unset=True)
+
+        if "sequence" in update_data:
+            update_data["length"] = len(update_data["sequence"])
+            update_data["sequence_hash"] = SequenceTools.sequence_hash(update_data["sequence"])
+            computed = ProteinService.property_values([update_data["sequence"]])[0]
+            for field, value in computed.items():
+                if update_data.get(field) is None:
+                    update_data[field] = value
 
         for field, value in update_data.items():
             setattr(db_protein, field, value)
+        if "sequence" in update_data:
+            for field, value in fingerprint(update_data["sequence"]).items():
+                setattr(db_protein, field, value)
+            for field, value in spectrum_values(update_data["sequence"]).items():
+                setattr(db_protein, field, value)
 
         db_protein.updated_by = user.id
         db_protein.version += 1
+        return update_data
+
+    @staticmethod
+    def delete_protein(db: Session, protein_id: int, user: User) -> bool:
+        db_protein = ProteinService.get_protein(db, protein_id)
+        if not db_protein:
+            return False
 
         AuditService.log_action(
+            db=db,
+            user=user,
+            action=AuditAction.DELETE,
+            entity_type="protein",
+            entity_id=protein_id,
+            details={"name": db_protein.name, "uniprot_id": db_protein.uniprot_id}
+        )
+
+        db.delete(db_protein)
+        db.commit()
+        invalidate_tags(*ProteinService.cache_tags(protein_id))
+        ProteinService.queue_neighbors(db, [protein_id], user)
+        return True
+
+    @staticmethod
+    def get_protein_versions(db: Session, protein_id: int) -> List[ProteinVersion]:
+        return db.query(ProteinVersion).filter(
+            ProteinVersion.protein_id == protein_id
+        ).order_by(ProteinVersion.version_number.desc()).all()
+
+class AsyncProteinService:
+    @staticmethod
+    async def create_protein(db: AsyncSession, protein: ProteinCreate, user: User) -> Protein:
+        db_protein = ProteinService.build_protein(protein, user)
+        db.add(db_protein)
+        await db.flush()
+
+        db.add(ProteinService.initial_version(db_protein, protein, user))
+
+        await AsyncAuditService.log_action(
+            db=db,
+            user=user,
+            action=AuditAction.CREATE,
+            entity_type="protein",
+            entity_id=db_protein.id,
+            details={"name": protein.name, "uniprot_id": protein.uniprot_id}
+        )
+
+        await db.commit()
+        await db.refresh(db_protein)
+        await AsyncProteinService.invalidate_protein(db_protein.id)
+        await run_in_threadpool(VectorIndexService.insert, [(db_protein.id, db_protein.sequence)])
+        await AsyncProteinService.queue_neighbors(db, [db_protein.id], user)
+        return db_protein
+
+    @staticmethod
+    async def bulk_create(
+        db: AsyncSession,
+        proteins: Sequence[ProteinCreate],
+        user: User,
+        chunk_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        results = []
+        seen = set()
+
+        for start in range(0, len(proteins), chunk_size):
+            chunk = proteins[start:start + chunk_size]
+            uniprot_ids = [p.uniprot_id for p in chunk if p.uniprot_id]
+            existing = set()
+            if uniprot_ids:
+                existing = set(await db.scalars(
+                    select(Protein.uniprot_id).filter(Protein.uniprot_id.in_(uniprot_ids))
+                ))
+
+            accepted, chunk_results = ProteinService._partition_chunk(chunk, start, existing, seen)
+            if accepted:
+                ids = (await db.scalars(
+                    insert(Protein).returning(Protein.id, sort_by_parameter_order=True),
+                    ProteinService.protein_rows([p for _, p in accepted], user)
+                )).all()
+                version_rows, audit_rows = ProteinService._bulk_history_rows(accepted, ids, user)
+                await db.execute(insert(ProteinVersion), version_rows)
+                await db.execute(insert(AuditLog), audit_rows)
+                await db.commit()
+
+                ProteinService._fill_created(chunk_results, accepted, ids)
+                await ainvalidate_tags(*ProteinService.bulk_cache_tags(ids))
+                await run_in_threadpool(
+                    VectorIndexService.insert, [(protein_id, p.sequence) for protein_id, (_, p) in zip(ids, accepted)]
+                )
+                await AsyncProteinService.queue_neighbors(db, ids, user)
+
+            results.extend(chunk_results)
+
+        return results
+
+    @staticmethod
+    async def get_protein(db: AsyncSession, protein_id: int) -> Optional[Protein]:
+        return await db.scalar(select(Protein).filter(Protein.id == protein_id))
+
+    @staticmethod
+    @cache_result(expire=300, key_prefix="protein", tags=("protein:{protein_id}",))
+    async def get_protein_data(db: AsyncSession, protein_id: int) -> Optional[Dict[str, Any]]:
+        protein = await AsyncProteinService.get_protein(db, protein_id)
+        if not protein:
+            return None
+        return ProteinSchema.model_validate(protein).model_dump()
+
+    @staticmethod
+    async def get_protein_by_uniprot_id(db: AsyncSession, uniprot_id: str) -> Optional[Protein]:
+        return await db.scalar(select(Protein).filter(Protein.uniprot_id == uniprot_id))
+
+    @staticmethod
+    async def get_proteins_by_sequence_hash(db: AsyncSession, sequence_hash: str, limit: int = 100) -> List[Protein]:
+        return (await db.scalars(
+            select(Protein).filter(Protein.sequence_hash == sequence_hash).order_by(Protein.id).limit(limit)
+        )).all()
+
+    @staticmethod
+    async def get_proteins(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[ProteinSearch] = None,
+        sort: ProteinSort = ProteinSort.ID,
+        after: Optional[List[Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Protein]:
+        query = ProteinService.list_query(
+            skip=skip, search=search, sort=sort, after=after, fields=fields
+        )
+        return (await db.scalars(query.limit(limit))).all()
+
+    @staticmethod
+    @cache_result(expire=300, key_prefix="protein-list", tags=("protein-list",))
+    async def list_protein_data(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[ProteinSearch] = None,
+        sort: ProteinSort = ProteinSort.ID,
+        after: Optional[List[Any]] = None,
+        fields: Sequence[str] = tuple(ProteinSchema.model_fields)
+    ) -> Dict[str, Any]:
+        proteins = await AsyncProteinService.get_proteins(
+            db, skip=skip, limit=limit, search=search, sort=sort, after=after, fields=fields
+        )
+        projection = protein_projection(tuple(fields))
+        return {
+            "items": [projection.model_validate(protein).model_dump() for protein in proteins],
+            "next_cursor": ProteinService.next_cursor(proteins, limit, sort)
+        }
+
+    @staticmethod
+    async def invalidate_protein(protein_id: int):
+        await ainvalidate_tags(*ProteinService.cache_tags(protein_id))
+
+    @staticmethod
+    async def queue_neighbors(db: AsyncSession, protein_ids: Sequence[int], user: Optional[User] = None):
+        await AsyncJobService.enqueue_merged(db, "protein_neighbors", "protein_ids", list(protein_ids), user)
+
+    @staticmethod
+    async def update_protein(
+        db: AsyncSession,
+        protein_id: int,
+        protein_update: ProteinUpdate,
+        user: User,
+        change_description: Optional[str] = None
+    ) -> Optional[Protein]:
+        db_protein = await AsyncProteinService.get_protein(db, protein_id)
+        if not db_protein:
+            return None
+
+        db.add(ProteinService.snapshot_version(db_protein, user, change_description))
+        update_data = ProteinService.apply_update(db_protein, protein_update, user)
+
+        await AsyncAuditService.log_action(
             db=db,
             user=user,
             action=AuditAction.UPDATE,
@@ -141,17 +685,25 @@ class ProteinService:
             details={"updated_fields": list(update_data.keys())}
         )
 
-        db.commit()
-        db.refresh(db_protein)
+        await db.commit()
+        await db.refresh(db_protein)
+        await AsyncProteinService.invalidate_protein(db_protein.id)
+        if "sequence" in update_data:
+            await run_in_threadpool(VectorIndexService.insert, [(db_protein.id, db_protein.sequence)])
+            await AsyncProteinService.queue_neighbors(db, [db_protein.id], user)
         return db_protein
 
     @staticmethod
-    def delete_protein(db: Session, protein_id: int, user: User) -> bool:
-        db_protein = ProteinService.get_protein(db, protein_id)
+    async def delete_protein(db: AsyncSession, protein_id: int, user: User) -> bool:
+        db_protein = await db.scalar(
+            select(Protein)
+            .options(selectinload(Protein.versions))
+            .filter(Protein.id == protein_id)
+        )
         if not db_protein:
             return False
 
-        AuditService.log_action(
+        await AsyncAuditService.log_action(
             db=db,
             user=user,
             action=AuditAction.DELETE,
@@ -160,12 +712,17 @@ class ProteinService:
             details={"name": db_protein.name, "uniprot_id": db_protein.uniprot_id}
         )
 
-        db.delete(db_protein)
-        db.commit()
+        await db.delete(db_protein)
+        await db.commit()
+        await AsyncProteinService.invalidate_protein(protein_id)
+        await AsyncProteinService.queue_neighbors(db, [protein_id], user)
         return True
 
     @staticmethod
-    def get_protein_versions(db: Session, protein_id: int) -> List[ProteinVersion]:
-        return db.query(ProteinVersion).filter(
-            ProteinVersion.protein_id == protein_id
-        ).order_by(ProteinVersion.version_number.desc()).all()
+    async def get_protein_versions(db: AsyncSession, protein_id: int) -> List[ProteinVersion]:
+        result = await db.scalars(
+            select(ProteinVersion)
+            .filter(ProteinVersion.protein_id == protein_id)
+            .order_by(ProteinVersion.version_number.desc())
+        )
+        return result.all()
@@ -0,0 +1,29 @@
+from sqlalchemy import or_, func
+from app.models.protein import Protein
+
+class SearchService:
+    TEXT_SEARCH_CONFIG = "english"
+
+    @staticmethod
+    def ts_query(text: str):
+        return func.websearch_to_tsquery(SearchService.TEXT_SEARCH_CONFIG, text)
+
+    @staticmethod
+    def apply_text_search(query, text: str):
+        return query.filter(
+            or_(
+                Protein.search_vector.op("@@")(SearchService.ts_query(text)),
+                Protein.name.op("%")(text),
+                Protein.name.ilike(f"%{text}%"),
+                Protein.uniprot_id.ilike(f"%{text}%"),
+                Protein.gene_name.ilike(f"%{text}%")
+            )
+        )
+
+    @staticmethod
+    def relevance(text: str):
+        return (
+            func.ts_rank_cd(Protein.search_vector, SearchService.ts_query(text))
+            + func.similarity(Protein.name, text)
+            + func.similarity(func.coalesce(Protein.gene_name, ""), text)
+        )
@@ -0,0 +1,289 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, insert, or_, func
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from app.core.config import get_settings
+from app.models.protein import Protein
+from app.models.sequence_index import SequenceIndexState, SequenceIndexBlock, KmerPosting
+from app.services.job_service import JobContext
+from app.utils.sequence_search import (
+    KMER_SIZE, kmer_codes, neighborhood, seed_diagonals, best_ungapped_hsp, bit_score, evalue
+)
+
+settings = get_settings()
+
+class IndexNotBuilt(ValueError):
+    pass
+
+class SequenceSearchService:
+    STATE_ID = 1
+
+    @staticmethod
+    def get_state(db: Session) -> Optional[SequenceIndexState]:
+        return db.get(SequenceIndexState, SequenceSearchService.STATE_ID)
+
+    @staticmethod
+    def posting_rows(generation: int, block: int, proteins: Sequence[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        kmers = [np.unique(kmer_codes(sequence)) for _, sequence in proteins]
+        if not kmers:
+            return []
+
+        ids = np.repeat(
+            np.array([protein_id for protein_id, _ in proteins], dtype=np.int32),
+            [len(codes) for codes in kmers]
+        )
+        kmers = np.concatenate(kmers)
+        order = np.lexsort((ids, kmers))
+        kmers, ids = kmers[order], ids[order]
+
+        unique, starts = np.unique(kmers, return_index=True)
+        bounds = np.append(starts, len(kmers))
+        return [
+            {
+                "generation": generation,
+                "kmer": int(kmer),
+                "block": block,
+                "protein_ids": ids[start:end].astype("<i4").tobytes()
+            }
+            for kmer, start, end in zip(unique, bounds[:-1], bounds[1:])
+        ]
+
+    @staticmethod
+    def build_index(
+        db: Session,
+        full: bool = False,
+        block_size: Optional[int] = None,
+        context: Optional[JobContext] = None
+    ) -> SequenceIndexState:
+        block_size = block_size or settings.sequence_index_block_size
+        state = SequenceSearchService.get_state(db)
+        if state is None:
+            state = SequenceIndexState(
+                id=SequenceSearchService.STATE_ID, k=KMER_SIZE, generation=0, block_count=0,
+                protein_count=0, residue_count=0, max_protein_id=0
+            )
+            db.add(state)
+            db.commit()
+        if state.built_at is None or db.scalar(
+            select(func.count()).select_from(SequenceIndexBlock)
+            .filter(SequenceIndexBlock.generation == state.generation)
+        ) != state.block_count:
+            full = True
+
+        synced_at = datetime.now(timezone.utc)
+        if full:
+            generation = state.generation + 1
+            db.execute(delete(KmerPosting).where(KmerPosting.generation >= generation))
+            db.execute(delete(SequenceIndexBlock).where(SequenceIndexBlock.generation >= generation))
+            db.commit()
+            block, last_id, proteins_indexed, residues = 0, 0, 0, 0
+            edited = []
+        else:
+            generation = state.generation
+            block, last_id = state.block_count, state.max_protein_id
+            proteins_indexed, residues = state.protein_count, state.residue_count
+            edited = db.scalars(
+                select(Protein.id).filter(
+                    Protein.id <= last_id, Protein.updated_at > (state.synced_at or state.built_at)
+                ).order_by(Protein.id)
+            ).all()
+
+        total = len(edited) + db.query(Protein.id).filter(Protein.id > last_id).count()
+        done = 0
+        for stale, edited_count in SequenceSearchService._edited_blocks(db, generation, edited):
+            proteins = db.execute(
+                select(Protein.id, Protein.sequence)
+                .filter(Protein.id.between(stale.first_protein_id, stale.last_protein_id)).order_by(Protein.id)
+            ).all()
+            db.execute(delete(KmerPosting).where(
+                KmerPosting.generation == generation, KmerPosting.block == stale.block
+            ))
+            rows = SequenceSearchService.posting_rows(generation, stale.block, proteins)
+            if rows:
+                db.execute(insert(KmerPosting), rows)
+
+            block_residues = sum(len(p.sequence) for p in proteins)
+            proteins_indexed += len(proteins) - stale.protein_count
+            residues += block_residues - stale.residue_count
+            stale.protein_count, stale.residue_count = len(proteins), block_residues
+            state.protein_count, state.residue_count = proteins_indexed, residues
+            db.commit()
+
+            done += edited_count
+            if context:
+                context.progress(done / total if total else None, f"{done} of {total} proteins indexed")
+
+        while True:
+            proteins = db.execute(
+                select(Protein.id, Protein.sequence)
+                .filter(Protein.id > last_id).order_by(Protein.id).limit(block_size)
+            ).all()
+            if not proteins:
+                break
+
+            rows = SequenceSearchService.posting_rows(generation, block, proteins)
+            if rows:
+                db.execute(insert(KmerPosting), rows)
+            block_residues = sum(len(p.sequence) for p in proteins)
+            db.add(SequenceIndexBlock(
+                generation=generation, block=block, first_protein_id=last_id + 1,
+                last_protein_id=proteins[-1].id, protein_count=len(proteins), residue_count=block_residues
+            ))
+
+            block += 1
+            last_id = proteins[-1].id
+            proteins_indexed += len(proteins)
+            residues += block_residues
+            done += len(proteins)
+
+            if not full:
+                state.block_count = block
+                state.max_protein_id = last_id
+                state.protein_count = proteins_indexed
+                state.residue_count = residues
+            db.commit()
+
+            if context:
+                context.progress(done / total if total else None, f"{done} of {total} proteins indexed")
+
+        if full:
+            previous = state.generation
+            state.generation = generation
+            state.block_count = block
+            state.max_protein_id = last_id
+            state.protein_count = proteins_indexed
+            state.residue_count = residues
+            state.built_at = synced_at
+            db.execute(delete(KmerPosting).where(KmerPosting.generation == previous))
+            db.execute(delete(SequenceIndexBlock).where(SequenceIndexBlock.generation == previous))
+        state.synced_at = synced_at
+        db.commit()
+
+        db.refresh(state)
+        return state
+
+    @staticmethod
+    def _edited_blocks(
+        db: Session, generation: int, protein_ids: Sequence[int]
+    ) -> Iterator[Tuple[SequenceIndexBlock, int]]:
+        if not protein_ids:
+            return
+        blocks = db.scalars(
+            select(SequenceIndexBlock).filter(SequenceIndexBlock.generation == generation)
+            .order_by(SequenceIndexBlock.first_protein_id)
+        ).all()
+        owners = np.searchsorted(
+            np.array([block.first_protein_id for block in blocks], dtype=np.int64),
+            np.array(protein_ids, dtype=np.int64), side="right"
+        ) - 1
+        for position, count in zip(*np.unique(owners[owners >= 0], return_counts=True)):
+            yield blocks[position], int(count)
+
+    @staticmethod
+    def candidate_counts(
+        db: Session,
+        state: Optional[SequenceIndexState],
+        codes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        if state is None or not state.block_count or not len(codes):
+            return empty
+
+        postings = list(db.scalars(
+            select(KmerPosting.protein_ids).filter(
+                KmerPosting.generation == state.generation,
+                KmerPosting.kmer.in_(codes.tolist())
+            )
+        ))
+        if not postings:
+            return empty
+
+        counts = np.bincount(np.concatenate([np.frombuffer(posting, dtype="<i4") for posting in postings]))
+        ids = np.nonzero(counts)[0]
+        return ids, counts[ids]
+
+    @staticmethod
+    def unindexed_proteins(db: Session, state: SequenceIndexState) -> List[Tuple[int, str]]:
+        query = select(Protein.id, Protein.sequence).filter(or_(
+            Protein.id > state.max_protein_id,
+            Protein.updated_at > (state.synced_at or state.built_at)
+        ))
+        return [(row.id, row.sequence) for row in db.execute(query)]
+
+    @staticmethod
+    def search(
+        db: Session,
+        sequence: str,
+        evalue_threshold: float = 10.0,
+        max_hits: int = 50,
+        candidates: Optional[int] = None
+    ) -> Dict[str, Any]:
+        query = "".join(sequence.split()).upper()
+        codes = np.unique(kmer_codes(query))
+        if not len(codes):
+            raise ValueError(f"Query must contain at least {KMER_SIZE} consecutive standard amino acids")
+
+        state = SequenceSearchService.get_state(db)
+        if state is None or state.built_at is None:
+            raise IndexNotBuilt("The sequence index has not been built yet; run a sequence_index job")
+        ids, counts = SequenceSearchService.candidate_counts(db, state, codes)
+
+        indexed_up_to = state.max_protein_id
+        database_proteins = state.protein_count
+        database_residues = state.residue_count
+        delta_ids, delta_counts = [], []
+        for protein_id, subject in SequenceSearchService.unindexed_proteins(db, state):
+            delta_ids.append(protein_id)
+            delta_counts.append(len(np.intersect1d(codes, kmer_codes(subject))))
+            if protein_id > indexed_up_to:
+                database_proteins += 1
+                database_residues += len(subject)
+
+        if delta_ids:
+            indexed = ~np.isin(ids, delta_ids)
+            ids = np.concatenate([ids[indexed], np.array(delta_ids, dtype=np.int64)])
+            counts = np.concatenate([counts[indexed], np.array(delta_counts, dtype=np.int64)])
+
+        limit = max(candidates or settings.sequence_search_candidates, max_hits * 2)
+        ranked = ids[counts > 0]
+        counts = counts[counts > 0]
+        if len(ranked) > limit:
+            ranked = ranked[np.argpartition(-counts, limit - 1)[:limit]]
+
+        offsets, positions = neighborhood(query)
+        hits = []
+        if len(ranked):
+            rows = db.execute(
+                select(Protein.id, Protein.uniprot_id, Protein.name, Protein.organism, Protein.sequence)
+                .filter(Protein.id.in_(ranked.tolist()))
+            ).all()
+            for row in rows:
+                diagonals = seed_diagonals(row.sequence, offsets, positions)
+                if not len(diagonals):
+                    continue
+                hsp = best_ungapped_hsp(query, row.sequence, diagonals)
+                if hsp is None:
+                    continue
+                expect = evalue(hsp["score"], len(query), max(database_residues, 1))
+                if expect > evalue_threshold:
+                    continue
+                hits.append({
+                    "protein_id": row.id,
+                    "uniprot_id": row.uniprot_id,
+                    "name": row.name,
+                    "organism": row.organism,
+                    "subject_length": len(row.sequence),
+                    "bit_score": bit_score(hsp["score"]),
+                    "evalue": expect,
+                    **hsp
+                })
+
+        hits.sort(key=lambda hit: (hit["evalue"], -hit["score"], hit["protein_id"]))
+        return {
+            "query_length": len(query),
+            "database_proteins": database_proteins,
+            "database_residues": database_residues,
+            "candidates_scanned": len(ranked),
+            "hits": hits[:max_hits]
+        }
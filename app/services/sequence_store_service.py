@@ -0,0 +1,135 @@
+import fcntl
+import os
+import numpy as np
+from contextlib import contextmanager
+from sqlalchemy.orm import Session
+from sqlalchemy import select, or_, func
+from typing import Any, Dict, Iterator, Optional
+from datetime import datetime, timezone
+from app.core.config import get_settings
+from app.models.protein import Protein
+from app.services.job_service import JobContext
+from app.utils.sequence_store import (
+    LOCK, GARBAGE_RATIO, SequenceStore, SequenceStoreWriter, read_manifest, pack
+)
+
+settings = get_settings()
+
+class SequenceStoreService:
+    BATCH_SIZE = 5000
+
+    @staticmethod
+    def directory() -> str:
+        os.makedirs(settings.sequence_store_dir, exist_ok=True)
+        return settings.sequence_store_dir
+
+    @staticmethod
+    @contextmanager
+    def lock(directory: str, exclusive: bool = True, blocking: bool = True, name: str = LOCK):
+        with open(os.path.join(directory, name), "a") as handle:
+            fcntl.flock(handle, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | (0 if blocking else fcntl.LOCK_NB))
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @staticmethod
+    @contextmanager
+    def reading() -> Iterator[Optional[SequenceStore]]:
+        directory = SequenceStoreService.directory()
+        with SequenceStoreService.lock(directory, exclusive=False):
+            yield SequenceStore.open(directory)
+
+    @staticmethod
+    def sync(db: Session, full: bool = False, context: Optional[JobContext] = None) -> Dict[str, Any]:
+        directory = SequenceStoreService.directory()
+        with SequenceStoreService.lock(directory):
+            store = None if full else SequenceStore.open(directory)
+            if store is not None and store.manifest["residues_bytes"] \
+                    and store.live_bytes() < store.manifest["residues_bytes"] * GARBAGE_RATIO:
+                store = None
+            if store is None:
+                manifest = SequenceStoreService._rebuild(db, directory, context)
+            else:
+                manifest = SequenceStoreService._update(db, directory, store, context)
+        return manifest
+
+    @staticmethod
+    def _rebuild(db: Session, directory: str, context: Optional[JobContext]) -> Dict[str, Any]:
+        previous = read_manifest(directory)
+        writer = SequenceStoreWriter(directory, previous["generation"] + 1 if previous else 1)
+        synced_at = datetime.now(timezone.utc)
+        total = db.scalar(select(func.count(Protein.id)))
+        parts = []
+        try:
+            rows = db.execute(
+                select(Protein.id, Protein.sequence).order_by(Protein.id)
+                .execution_options(yield_per=SequenceStoreService.BATCH_SIZE)
+            )
+            done = 0
+            for chunk in rows.partitions():
+                parts.append(writer.append([(row.id, row.sequence) for row in chunk]))
+                done += len(chunk)
+                if context:
+                    context.progress(done / total if total else None, f"{done} of {total} sequences stored")
+        except BaseException:
+            writer.abort()
+            raise
+
+        ids, starts, ends = SequenceStoreService._concat(parts)
+        return writer.commit(ids, starts, ends, synced_at=synced_at.isoformat(), max_protein_id=int(ids.max(initial=0)))
+
+    @staticmethod
+    def _update(db: Session, directory: str, store: SequenceStore, context: Optional[JobContext]) -> Dict[str, Any]:
+        manifest = store.manifest
+        synced_at = datetime.now(timezone.utc)
+        current = np.fromiter(db.scalars(select(Protein.id)), dtype=np.int64)
+        keep = np.isin(store.ids, current)
+
+        changed = db.execute(
+            select(Protein.id, Protein.sequence)
+            .filter(or_(
+                Protein.id > manifest["max_protein_id"],
+                Protein.updated_at > datetime.fromisoformat(manifest["synced_at"])
+            ))
+            .order_by(Protein.id)
+            .execution_options(yield_per=SequenceStoreService.BATCH_SIZE)
+        )
+
+        writer = SequenceStoreWriter(directory, manifest["generation"], manifest["residues_bytes"])
+        parts = []
+        done = 0
+        try:
+            for chunk in changed.partitions():
+                positions = store.positions([row.id for row in chunk])
+                appended = []
+                for row, position in zip(chunk, positions.tolist()):
+                    data = pack(row.sequence)
+                    if position >= 0:
+                        if store.codes(position).tobytes() == data:
+                            continue
+                        keep[position] = False
+                    appended.append((row.id, data))
+                if appended:
+                    parts.append(writer.append_packed(appended))
+                done += len(chunk)
+                if context:
+                    context.progress(None, f"{done} changed sequences checked")
+        except BaseException:
+            writer.abort()
+            raise
+
+        parts.insert(0, (store.ids[keep], store.starts[keep], store.ends[keep]))
+        ids, starts, ends = SequenceStoreService._concat(parts)
+        return writer.commit(
+            ids, starts, ends,
+            synced_at=synced_at.isoformat(),
+            max_protein_id=max(manifest["max_protein_id"], int(ids.max(initial=0)))
+        )
+
+    @staticmethod
+    def _concat(parts):
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        return tuple(np.concatenate([np.asarray(part[column]) for part in parts]) for column in range(3))
@@ -0,0 +1,223 @@
+import os
+import numpy as np
+from contextlib import contextmanager
+from sqlalchemy.orm import Session
+from sqlalchemy import select, or_, func
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from app.core.config import get_settings
+from app.models.protein import Protein
+from app.services.job_service import JobContext
+from app.services.sequence_store_service import SequenceStoreService
+from app.utils.descriptors import DIMENSIONS, descriptors
+from app.utils.sequence_store import GARBAGE_RATIO, read_manifest, remove
+from app.utils.vector_index import BUILD_LOCK, FORMAT_VERSION, VectorIndex, VectorIndexWriter, mark_dead, merge_tail, nearest
+
+settings = get_settings()
+
+class VectorIndexService:
+    BATCH_SIZE = 5000
+    TAIL_RATIO = 0.25
+    TAIL_MIN_ROWS = 50000
+
+    @staticmethod
+    def directory() -> str:
+        os.makedirs(settings.vector_index_dir, exist_ok=True)
+        return settings.vector_index_dir
+
+    @staticmethod
+    @contextmanager
+    def reading() -> Iterator[Optional[VectorIndex]]:
+        directory = VectorIndexService.directory()
+        with SequenceStoreService.lock(directory, exclusive=False):
+            yield VectorIndex.open(directory)
+
+    @staticmethod
+    def open() -> Optional[VectorIndex]:
+        with VectorIndexService.reading() as index:
+            return index
+
+    @staticmethod
+    def needs_rebuild(manifest: Dict[str, Any], added: int = 0) -> bool:
+        if manifest["format"] != FORMAT_VERSION or manifest["dimensions"] != DIMENSIONS:
+            return True
+        tail = manifest["rows"] - manifest["main_rows"] + added
+        return tail > max(VectorIndexService.TAIL_MIN_ROWS, manifest["main_rows"] * VectorIndexService.TAIL_RATIO) \
+            or manifest["dead"] > manifest["rows"] * GARBAGE_RATIO
+
+    @staticmethod
+    def changed_query(manifest: Dict[str, Any]):
+        return select(Protein.id, Protein.sequence).filter(or_(
+            Protein.id > manifest["max_protein_id"],
+            Protein.updated_at > datetime.fromisoformat(manifest["synced_at"])
+        ))
+
+    @staticmethod
+    def sync(db: Session, full: bool = False, context: Optional[JobContext] = None) -> Dict[str, Any]:
+        directory = VectorIndexService.directory()
+        with SequenceStoreService.lock(directory, name=BUILD_LOCK):
+            manifest = read_manifest(directory)
+            if manifest is not None and not full:
+                changed = db.scalar(
+                    select(func.count()).select_from(VectorIndexService.changed_query(manifest).subquery())
+                )
+                full = VectorIndexService.needs_rebuild(manifest, changed)
+            if manifest is None or full:
+                VectorIndexService._rebuild(db, directory, context)
+            return VectorIndexService._catch_up(db, directory, context)
+
+    @staticmethod
+    def insert(
+        proteins: Sequence[Tuple[int, str]],
+        deleted: Sequence[int] = (),
+        blocking: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        directory = VectorIndexService.directory()
+        if not proteins and not deleted or read_manifest(directory) is None:
+            return None
+        ids = np.array([protein_id for protein_id, _ in proteins], dtype=np.int64)
+        vectors = descriptors([sequence for _, sequence in proteins]) if proteins \
+            else np.empty((0, DIMENSIONS), dtype=np.float32)
+        try:
+            with SequenceStoreService.lock(directory, blocking=blocking):
+                index = VectorIndex.open(directory)
+                rows = index.rows_of(deleted)
+                return VectorIndexService._append(directory, index, ids, vectors, rows[rows >= 0])
+        except BlockingIOError:
+            return None
+
+    @staticmethod
+    def _chunks(db: Session, query, context: Optional[JobContext] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        rows = db.execute(query.order_by(Protein.id).execution_options(yield_per=VectorIndexService.BATCH_SIZE))
+        done = 0
+        for chunk in rows.partitions():
+            yield np.array([row.id for row in chunk], dtype=np.int64), descriptors([row.sequence for row in chunk])
+            done += len(chunk)
+            if context:
+                context.progress(None, f"{done} changed proteins embedded")
+
+    @staticmethod
+    def _catch_up(db: Session, directory: str, context: Optional[JobContext]) -> Dict[str, Any]:
+        manifest = read_manifest(directory)
+        synced_at = datetime.now(timezone.utc).isoformat()
+        max_protein_id = manifest["max_protein_id"]
+        for ids, vectors in VectorIndexService._chunks(db, VectorIndexService.changed_query(manifest), context):
+            max_protein_id = max(max_protein_id, int(ids.max()))
+            with SequenceStoreService.lock(directory):
+                VectorIndexService._append(directory, VectorIndex.open(directory), ids, vectors)
+
+        current = np.fromiter(db.scalars(select(Protein.id)), dtype=np.int64)
+        with SequenceStoreService.lock(directory):
+            index = VectorIndex.open(directory)
+            live = np.nonzero(np.asarray(index.dead) == 0)[0]
+            deleted = live[~np.isin(np.asarray(index.ids[live]), current)]
+            return VectorIndexService._append(
+                directory, index, np.empty(0, dtype=np.int64), np.empty((0, index.manifest["dimensions"]), dtype=np.float32),
+                deleted, synced_at=synced_at, max_protein_id=max_protein_id
+            )
+
+    @staticmethod
+    def _append(
+        directory: str,
+        index: VectorIndex,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        deleted: Optional[np.ndarray] = None,
+        **extra: Any
+    ) -> Dict[str, Any]:
+        manifest = index.manifest
+        existing = index.rows_of(ids)
+        unchanged = existing >= 0
+        unchanged[unchanged] = (np.asarray(index.vectors[existing[unchanged]]) == vectors[unchanged]).all(axis=1)
+        ids, vectors, existing = ids[~unchanged], vectors[~unchanged], existing[~unchanged]
+        superseded = existing[existing >= 0]
+        if deleted is not None:
+            superseded = np.concatenate([superseded, deleted]).astype(np.int64)
+        if not len(ids) and not len(superseded) and not extra:
+            return manifest
+
+        writer = VectorIndexWriter(directory, manifest["generation"], manifest["dimensions"], manifest["rows"])
+        try:
+            rows = writer.append(ids, vectors)
+            tail = merge_tail(index.tail, nearest(vectors, index.centroids), rows) if len(ids) else np.asarray(index.tail)
+            updated = writer.commit(
+                tail, main_rows=manifest["main_rows"], dead=manifest["dead"] + len(superseded),
+                **{"synced_at": manifest["synced_at"], "max_protein_id": manifest["max_protein_id"], **extra}
+            )
+        except BaseException:
+            writer.abort()
+            raise
+        mark_dead(directory, updated, superseded)
+        return updated
+
+    @staticmethod
+    def _rebuild(db: Session, directory: str, context: Optional[JobContext]) -> Dict[str, Any]:
+        previous = read_manifest(directory)
+        generation = previous["generation"] + 1 if previous else 1
+        staging = f"staging-{generation}.f32"
+        synced_at = datetime.now(timezone.utc)
+        total = db.scalar(select(func.count(Protein.id)))
+
+        ids = []
+        with open(os.path.join(directory, staging), "wb") as out:
+            rows = db.execute(
+                select(Protein.id, Protein.sequence).order_by(Protein.id)
+                .execution_options(yield_per=VectorIndexService.BATCH_SIZE)
+            )
+            for chunk in rows.partitions():
+                out.write(descriptors([row.sequence for row in chunk]).astype("<f4").tobytes())
+                ids.extend(row.id for row in chunk)
+                if context:
+                    context.progress(len(ids) / total if total else None, f"{len(ids)} of {total} proteins embedded")
+
+        ids = np.array(ids, dtype=np.int64)
+        vectors = np.memmap(
+            os.path.join(directory, staging), dtype="<f4", mode="r", shape=(len(ids), DIMENSIONS)
+        ) if len(ids) else np.empty((0, DIMENSIONS), dtype=np.float32)
+        writer = VectorIndexWriter(directory, generation, DIMENSIONS)
+        try:
+            if context:
+                context.progress(None, "Training and assigning inverted lists")
+            writer.prepare(ids, vectors)
+            with SequenceStoreService.lock(directory):
+                return writer.commit(
+                    np.empty((2, 0), dtype=np.int64), main_rows=len(ids), dead=0,
+                    synced_at=synced_at.isoformat(), max_protein_id=int(ids.max(initial=0))
+                )
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            del vectors
+            remove(directory, staging)
+
+    @staticmethod
+    def neighbors(db: Session, protein_id: int, k: int = 10, probes: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        protein = db.execute(select(Protein.id, Protein.sequence).filter(Protein.id == protein_id)).first()
+        if protein is None:
+            return None
+
+        with VectorIndexService.reading() as index:
+            if index is None:
+                raise ValueError("The vector index has not been built yet; run a vector_index job")
+            row = int(index.rows_of([protein_id])[0])
+            vector = np.asarray(index.vectors[row]) if row >= 0 else descriptors([protein.sequence])[0]
+            ids, distances = index.search(vector, k * 2, probes or settings.vector_index_probes, exclude=protein_id)
+
+        proteins = {
+            row.id: row for row in db.execute(
+                select(Protein.id, Protein.uniprot_id, Protein.name, Protein.organism, Protein.length)
+                .filter(Protein.id.in_(ids.tolist()))
+            )
+        } if len(ids) else {}
+        return [
+            {
+                "protein_id": neighbor_id,
+                "uniprot_id": proteins[neighbor_id].uniprot_id,
+                "name": proteins[neighbor_id].name,
+                "organism": proteins[neighbor_id].organism,
+                "length": proteins[neighbor_id].length,
+                "distance": round(float(distance), 4)
+            }
+            for neighbor_id, distance in zip(ids.tolist(), distances.tolist()) if neighbor_id in proteins
+        ][:k]
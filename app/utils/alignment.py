@@ -0,0 +1,304 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from app.utils.sequence_search import load_matrix, encode
+
+NEG_INF = -(1 << 28)
+
+MAX_TRACEBACK_CELLS = 50_000_000
+SHORT_SCORE_LIMIT = 30_000
+PREFIX_MAX_SUBJECTS = 1024
+
+FROM_ZERO, FROM_DIAG, FROM_E, FROM_F = 0, 1, 2, 3
+E_EXTEND = 4
+F_EXTEND = 8
+
+def _profile(query: str, matrix: str) -> np.ndarray:
+    alphabet, scores = load_matrix(matrix)
+    q = encode(query, alphabet)
+    return scores[q].T.astype(np.int32)
+
+def _vertical_gaps(h_tilde: np.ndarray, gap_open: int, gap_extend: int, ramp: np.ndarray) -> np.ndarray:
+    f = np.full_like(h_tilde, NEG_INF)
+    shifted = h_tilde[..., :-1] + ramp[:-1]
+    f[..., 1:] = np.maximum.accumulate(shifted, axis=-1) - gap_open - ramp[1:]
+    return f
+
+def align(
+    query: str,
+    subject: str,
+    mode: str = "local",
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1
+) -> Dict:
+    if mode not in ("local", "global"):
+        raise ValueError("mode must be 'local' or 'global'")
+    m, n = len(query), len(subject)
+    if not m or not n:
+        raise ValueError("Sequences cannot be empty")
+    if (m + 1) * (n + 1) > MAX_TRACEBACK_CELLS:
+        raise ValueError("Sequences too long for a full traceback")
+
+    local = mode == "local"
+    alphabet, _ = load_matrix(matrix)
+    profile = _profile(query, matrix)
+    s = encode(subject, alphabet)
+    ramp = gap_extend * np.arange(m + 1, dtype=np.int32)
+
+    trace = np.zeros((n + 1, m + 1), dtype=np.uint8)
+    if local:
+        h = np.zeros(m + 1, dtype=np.int32)
+    else:
+        h = -(gap_open + ramp)
+        h[0] = 0
+        trace[0, 1:] = FROM_F | F_EXTEND
+        trace[0, 1] = FROM_F
+    e = np.full(m + 1, NEG_INF, dtype=np.int32)
+
+    best_score, best_i, best_j = 0, 0, 0
+    for j in range(1, n + 1):
+        e_extend = e - gap_extend
+        e_open = h - gap_open - gap_extend
+        e = np.maximum(e_extend, e_open)
+
+        diag = np.full(m + 1, NEG_INF, dtype=np.int32)
+        diag[1:] = h[:-1] + profile[s[j - 1]]
+
+        h_tilde = np.maximum(diag, e)
+        if local:
+            h_tilde = np.maximum(h_tilde, 0)
+            h_tilde[0] = 0
+        else:
+            h_tilde[0] = -(gap_open + gap_extend * j)
+
+        f = _vertical_gaps(h_tilde, gap_open, gap_extend, ramp)
+        h = np.maximum(h_tilde, f)
+
+        source = np.where(h == f, FROM_F, np.where(h == e, FROM_E, FROM_DIAG)).astype(np.uint8)
+        source[h == diag] = FROM_DIAG
+        if local:
+            source[h == 0] = FROM_ZERO
+        f_extend = np.zeros(m + 1, dtype=bool)
+        f_extend[1:] = f[:-1] - gap_extend >= h[:-1] - gap_open - gap_extend
+        trace[j] = source | np.where(e_extend >= e_open, E_EXTEND, 0) | np.where(f_extend, F_EXTEND, 0)
+        trace[j, 0] = FROM_ZERO if local else FROM_E | (E_EXTEND if j > 1 else 0)
+
+        if local:
+            i = int(h.argmax())
+            if h[i] > best_score:
+                best_score, best_i, best_j = int(h[i]), i, j
+
+    if not local:
+        best_score, best_i, best_j = int(h[m]), m, n
+
+    return _traceback(query, subject, trace, best_score, best_i, best_j, local)
+
+def _traceback(query: str, subject: str, trace: np.ndarray, score: int, i: int, j: int, local: bool) -> Dict:
+    query_aligned: List[str] = []
+    subject_aligned: List[str] = []
+    end_i, end_j = i, j
+    state = FROM_DIAG
+    while i > 0 or j > 0:
+        cell = int(trace[j, i])
+        if state == FROM_DIAG:
+            source = cell & 3
+            if local and source == FROM_ZERO:
+                break
+            if source != FROM_DIAG:
+                state = source
+                continue
+            query_aligned.append(query[i - 1])
+            subject_aligned.append(subject[j - 1])
+            i, j = i - 1, j - 1
+        elif state == FROM_E:
+            query_aligned.append("-")
+            subject_aligned.append(subject[j - 1])
+            if not cell & E_EXTEND:
+                state = FROM_DIAG
+            j -= 1
+        else:
+            query_aligned.append(query[i - 1])
+            subject_aligned.append("-")
+            if not cell & F_EXTEND:
+                state = FROM_DIAG
+            i -= 1
+
+    query_aligned.reverse()
+    subject_aligned.reverse()
+    columns = len(query_aligned)
+    identities = sum(a == b and a != "-" for a, b in zip(query_aligned, subject_aligned))
+    gaps = sum(a == "-" or b == "-" for a, b in zip(query_aligned, subject_aligned))
+    return {
+        "score": score,
+        "identity": identities / columns if columns else 0.0,
+        "gaps": gaps,
+        "length": columns,
+        "query_start": i + 1,
+        "query_end": end_i,
+        "subject_start": j + 1,
+        "subject_end": end_j,
+        "query_coverage": (end_i - i) / len(query),
+        "subject_coverage": (end_j - j) / len(subject),
+        "query_aligned": "".join(query_aligned),
+        "subject_aligned": "".join(subject_aligned)
+    }
+
+def score_many(
+    query: str,
+    subjects: Sequence[str],
+    mode: str = "local",
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1,
+    batch_size: int = 4096
+) -> np.ndarray:
+    if mode not in ("local", "global"):
+        raise ValueError("mode must be 'local' or 'global'")
+    scores = np.zeros(len(subjects), dtype=np.int64)
+    if not len(subjects) or not query:
+        return scores
+
+    alphabet, _ = load_matrix(matrix)
+    profile = _profile(query, matrix)
+    lengths = np.array([len(subject) for subject in subjects])
+    order = np.argsort(lengths, kind="stable")
+
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        scores[batch] = _score_batch(
+            profile, [subjects[k] for k in batch], lengths[batch], alphabet, mode == "local", gap_open, gap_extend
+        )
+    return scores
+
+def _score_batch(profile, subjects, lengths, alphabet, local, gap_open, gap_extend) -> np.ndarray:
+    m = profile.shape[1]
+    count = len(subjects)
+    width = int(lengths.max()) if len(lengths) else 0
+    pad = alphabet.index("*") if "*" in alphabet else len(alphabet) - 1
+    encoded = np.full((width, count), pad, dtype=np.uint8)
+    for column, subject in enumerate(subjects):
+        encoded[:len(subject), column] = encode(subject, alphabet)
+
+    opening = gap_open + gap_extend
+    short = m * max(int(profile.max()), gap_extend) + opening < SHORT_SCORE_LIMIT
+    dtype = np.int16 if local and short else np.int32
+    query_profile = profile.T.astype(dtype)
+    floor = -opening if local else NEG_INF
+    ramp = (gap_extend * (np.arange(m + 1) - m)).astype(dtype)[:, None]
+    prefix_max = count < PREFIX_MAX_SUBJECTS
+
+    h = np.zeros((m + 1, count), dtype=dtype)
+    if not local:
+        h[1:] = -(gap_open + gap_extend * np.arange(1, m + 1, dtype=dtype))[:, None]
+    e = np.full_like(h, floor)
+    h_tilde = np.empty_like(h)
+    opened = np.empty_like(h)
+    f = np.empty(count, dtype=dtype)
+    best = np.zeros(count, dtype=np.int64) if local else h[m].astype(np.int64)
+
+    for j in range(1, width + 1):
+        np.subtract(e, gap_extend, out=e)
+        np.subtract(h, opening, out=opened)
+        np.maximum(e, opened, out=e)
+
+        np.add(h[:-1], query_profile[:, encoded[j - 1]], out=h_tilde[1:])
+        np.maximum(h_tilde, e, out=h_tilde)
+        if local:
+            np.maximum(h_tilde, 0, out=h_tilde)
+            h_tilde[0] = 0
+        else:
+            h_tilde[0] = -(gap_open + gap_extend * j)
+
+        np.subtract(h_tilde, opening, out=opened)
+        h[0] = h_tilde[0]
+        if prefix_max:
+            np.add(opened, ramp, out=opened)
+            np.maximum.accumulate(opened, axis=0, out=opened)
+            np.subtract(opened[:-1], ramp[:-1], out=h[1:])
+            np.maximum(h[1:], h_tilde[1:], out=h[1:])
+        else:
+            f.fill(floor)
+            for i in range(1, m + 1):
+                np.subtract(f, gap_extend, out=f)
+                np.maximum(f, opened[i - 1], out=f)
+                np.maximum(h_tilde[i], f, out=h[i])
+
+        if local:
+            first = int(np.searchsorted(lengths, j))
+            np.maximum(best[first:], h[:, first:].max(axis=0), out=best[first:])
+        else:
+            finished = lengths == j
+            best[finished] = h[m, finished]
+    return best
+
+def similarity(seq1: str, seq2: str, matrix: str = "BLOSUM62", gap_open: int = 11, gap_extend: int = 1) -> float:
+    if not seq1 or not seq2:
+        raise ValueError("Sequences cannot be empty")
+    m, n = len(seq1), len(seq2)
+    alphabet, _ = load_matrix(matrix)
+    profile = _profile(seq1, matrix)
+    s = encode(seq2, alphabet)
+    query_codes = np.fromiter(map(ord, seq1), dtype=np.int32, count=m)
+    subject_codes = np.fromiter(map(ord, seq2), dtype=np.int32, count=n)
+    positions = np.arange(m + 1, dtype=np.int32)
+    ramp = gap_extend * positions
+
+    h = -(gap_open + ramp)
+    h[0] = 0
+    e = np.full(m + 1, NEG_INF, dtype=np.int32)
+    h_same, h_columns = np.zeros(m + 1, dtype=np.int32), positions.copy()
+    e_same, e_columns = np.zeros(m + 1, dtype=np.int32), np.zeros(m + 1, dtype=np.int32)
+    diag_same, diag_columns = np.zeros(m + 1, dtype=np.int32), np.zeros(m + 1, dtype=np.int32)
+
+    for j in range(1, n + 1):
+        e_extend = e - gap_extend
+        e_open = h - gap_open - gap_extend
+        e = np.maximum(e_extend, e_open)
+        e_extended = e_extend >= e_open
+        e_same = np.where(e_extended, e_same, h_same)
+        e_columns = np.where(e_extended, e_columns, h_columns) + 1
+
+        diag = np.full(m + 1, NEG_INF, dtype=np.int32)
+        diag[1:] = h[:-1] + profile[s[j - 1]]
+        diag_same[1:] = h_same[:-1] + (query_codes == subject_codes[j - 1])
+        diag_columns[1:] = h_columns[:-1] + 1
+
+        h_tilde = np.maximum(diag, e)
+        h_tilde[0] = -(gap_open + gap_extend * j)
+        tilde_same = np.where(h_tilde == diag, diag_same, e_same)
+        tilde_columns = np.where(h_tilde == diag, diag_columns, e_columns)
+        tilde_same[0], tilde_columns[0] = 0, j
+
+        f = _vertical_gaps(h_tilde, gap_open, gap_extend, ramp)
+        h = np.maximum(h_tilde, f)
+        opened = np.full(m + 1, -1, dtype=np.int32)
+        opened[1:] = np.where(f[:-1] - gap_extend < h[:-1] - gap_open - gap_extend, positions[:-1], -1)
+        start = np.maximum(np.maximum.accumulate(opened), 0)
+
+        from_diag = h == diag
+        from_f = h == f
+        h_same = np.where(from_diag, diag_same, np.where(from_f, tilde_same[start], e_same))
+        f_columns = tilde_columns[start] + positions - start
+        h_columns = np.where(from_diag, diag_columns, np.where(from_f, f_columns, e_columns))
+        h_same[0], h_columns[0] = 0, j
+
+    return int(h_same[m]) / int(h_columns[m])
+
+def align_many(
+    query: str,
+    subjects: Sequence[str],
+    mode: str = "local",
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1,
+    top: Optional[int] = None
+) -> List[Dict]:
+    scores = score_many(query, subjects, mode=mode, matrix=matrix, gap_open=gap_open, gap_extend=gap_extend)
+    order = np.argsort(-scores, kind="stable")
+    if top is not None:
+        order = order[:top]
+    results = []
+    for index in order:
+        result = align(query, subjects[index], mode=mode, matrix=matrix, gap_open=gap_open, gap_extend=gap_extend)
+        results.append({"index": int(index), **result})
+    return results
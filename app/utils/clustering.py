@@ -0,0 +1,167 @@
+import numpy as np
+from typing import List, Sequence, Tuple
+from app.utils.sequence_search import AMINO_ACIDS, load_matrix, encode, encoding_table
+
+BAND_WIDTH = 20
+KEY_SCALE = 1 << 16
+NEG_KEY = -(1 << 50)
+MIN_THRESHOLD = 0.4
+
+def word_size_for(threshold: float) -> int:
+    if not MIN_THRESHOLD <= threshold <= 1:
+        raise ValueError(f"threshold must be between {MIN_THRESHOLD} and 1")
+    if threshold >= 0.7:
+        return 5
+    if threshold >= 0.6:
+        return 4
+    if threshold >= 0.5:
+        return 3
+    return 2
+
+def encode_sequence(sequence: str, matrix: str = "BLOSUM62") -> np.ndarray:
+    alphabet, _ = load_matrix(matrix)
+    return encode(sequence, alphabet).astype(np.intp)
+
+def words(sequence: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = encoding_table(AMINO_ACIDS + "X")[
+        np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    ].astype(np.int64)
+    if len(encoded) < k:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    base = len(AMINO_ACIDS)
+    codes = np.zeros(len(encoded) - k + 1, dtype=np.int64)
+    valid = np.ones(len(codes), dtype=bool)
+    for offset in range(k):
+        window = encoded[offset:offset + len(codes)]
+        codes = codes * base + np.minimum(window, base - 1)
+        valid &= window < base
+    positions = np.nonzero(valid)[0]
+    return codes[positions], positions
+
+def required_words(length: int, distinct: int, threshold: float, k: int) -> int:
+    return max(int(np.ceil(distinct - (1 - threshold) * length * k)), 1)
+
+class WordIndex:
+    def __init__(self):
+        self.segments: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return sum(len(codes) for codes, _ in self.segments)
+
+    def add(self, owners: Sequence[int], codes: Sequence[np.ndarray]):
+        if not len(owners):
+            return
+        lengths = [len(words) for words in codes]
+        segment = (
+            np.concatenate(codes).astype(np.int64) if sum(lengths) else np.empty(0, dtype=np.int64),
+            np.repeat(np.asarray(owners, dtype=np.int64), lengths)
+        )
+        self.segments.append(segment)
+        while len(self.segments) > 1 and len(self.segments[-2][0]) <= 2 * len(self.segments[-1][0]):
+            (first_codes, first_owners), (last_codes, last_owners) = self.segments.pop(-2), self.segments.pop()
+            self.segments.append((np.concatenate([first_codes, last_codes]), np.concatenate([first_owners, last_owners])))
+        codes, owners = self.segments[-1]
+        order = np.argsort(codes, kind="stable")
+        self.segments[-1] = (codes[order], owners[order])
+
+    def shared(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        found = []
+        for segment_codes, segment_owners in self.segments:
+            starts = np.searchsorted(segment_codes, codes, side="left")
+            lengths = np.searchsorted(segment_codes, codes, side="right") - starts
+            total = int(lengths.sum())
+            if total:
+                offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+                found.append(segment_owners[offsets])
+        if not found:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.unique(np.concatenate(found), return_counts=True)
+
+def best_diagonal(query: Tuple[np.ndarray, np.ndarray], subject: Tuple[np.ndarray, np.ndarray]) -> int:
+    query_codes, query_positions = query
+    subject_codes, subject_positions = subject
+    order = np.argsort(subject_codes, kind="stable")
+    subject_codes, subject_positions = subject_codes[order], subject_positions[order]
+
+    starts = np.searchsorted(subject_codes, query_codes, side="left")
+    lengths = np.searchsorted(subject_codes, query_codes, side="right") - starts
+    total = int(lengths.sum())
+    if not total:
+        return 0
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    diagonals = subject_positions[offsets] - np.repeat(query_positions, lengths)
+    low = int(diagonals.min())
+    return int(np.bincount(diagonals - low).argmax()) + low
+
+def banded_identity(
+    queries: Sequence[np.ndarray],
+    subjects: Sequence[np.ndarray],
+    diagonals: Sequence[int],
+    band: int = BAND_WIDTH,
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1
+) -> np.ndarray:
+    count = len(queries)
+    identities = np.zeros(count)
+    if not count:
+        return identities
+
+    alphabet, substitution = load_matrix(matrix)
+    pad = alphabet.index("*") if "*" in alphabet else len(alphabet) - 1
+    table = substitution.astype(np.int64) * KEY_SCALE
+    query_lengths = np.array([len(query) for query in queries])
+    subject_lengths = np.array([len(subject) for subject in subjects])
+    order = np.argsort(-query_lengths, kind="stable")
+    query_lengths, subject_lengths = query_lengths[order], subject_lengths[order]
+
+    width = 2 * band + 1
+    query_codes = np.full((count, int(query_lengths.max())), pad, dtype=np.intp)
+    subject_codes = np.full((count, int(subject_lengths.max()) + 1), pad, dtype=np.intp)
+    for row, index in enumerate(order):
+        query_codes[row, :query_lengths[row]] = queries[index]
+        subject_codes[row, :subject_lengths[row]] = subjects[index]
+    offsets = np.asarray(diagonals, dtype=np.int64)[order] - band
+    columns = offsets[:, None] + np.arange(width)
+    ramp = gap_extend * KEY_SCALE * np.arange(width, dtype=np.int64)
+    opening = (gap_open + gap_extend) * KEY_SCALE
+
+    valid = (columns >= 0) & (columns <= subject_lengths[:, None])
+    h = np.where(valid, 0, NEG_KEY)
+    e = np.full_like(h, NEG_KEY)
+    best = np.full(count, NEG_KEY, dtype=np.int64)
+    active = count
+    for i in range(1, int(query_lengths[0]) + 1):
+        while active and query_lengths[active - 1] < i:
+            active -= 1
+        h, e, columns, valid = h[:active], e[:active], columns[:active], valid[:active]
+
+        columns = columns + 1
+        valid = (columns >= 0) & (columns <= subject_lengths[:active, None])
+        residues = np.take_along_axis(subject_codes[:active], np.clip(columns - 1, 0, subject_codes.shape[1] - 1), axis=1)
+        codes = query_codes[:active, i - 1][:, None]
+        diag = h + table[codes, residues] + (codes == residues)
+        diag[columns < 1] = NEG_KEY
+
+        shifted_h = np.full_like(h, NEG_KEY)
+        shifted_e = np.full_like(e, NEG_KEY)
+        shifted_h[:, :-1] = h[:, 1:]
+        shifted_e[:, :-1] = e[:, 1:]
+        e = np.maximum(shifted_e - gap_extend * KEY_SCALE, shifted_h - opening)
+
+        h_tilde = np.maximum(diag, e)
+        h_tilde[~valid] = NEG_KEY
+        f = np.full_like(h_tilde, NEG_KEY)
+        f[:, 1:] = np.maximum.accumulate(h_tilde[:, :-1] + ramp[:-1], axis=1) - gap_open * KEY_SCALE - ramp[1:]
+        h = np.maximum(h_tilde, f)
+        h[~valid] = NEG_KEY
+
+        finished = query_lengths[:active] == i
+        if finished.any():
+            best[:active][finished] = h[finished].max(axis=1)
+
+    reached = best > NEG_KEY // 2
+    identities[order[reached]] = (best[reached] % KEY_SCALE) / query_lengths[reached]
+    return identities
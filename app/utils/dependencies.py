@@ -1,17 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.security import decode_access_token
 from app.models.user import User, UserRole
-from app.services.auth_service import AuthService
+from app.services.auth_service import AsyncAuthService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -27,19 +27,19 @@ def get_current_user(
     if username is None:
         raise credentials_exception
 
-    user = AuthService.get_user_by_username(db, username=username)
+    user = await AsyncAuthService.get_user_by_username(db, username=username)
     if user is None:
         raise credentials_exception
 
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 def require_role(required_role: UserRole):
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    async def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
         role_hierarchy = {
             UserRole.VIEWER: 1,
             UserRole.RESEARCHER: 2,
@@ -0,0 +1,47 @@
+import numpy as np
+from typing import Sequence
+from app.utils import sequence_properties
+from app.utils.sequence_properties import STANDARD, clean, encode
+
+PROPERTY_SCALES = {
+    "molecular_weight": (4.5, 0.3),
+    "isoelectric_point": (7.0, 2.0),
+    "gravy": (-0.4, 0.5),
+    "instability_index": (40.0, 15.0),
+    "aromaticity": (0.08, 0.04),
+    "charge_per_residue": (0.0, 0.05)
+}
+PROPERTY_WEIGHT = 0.1
+DIMENSIONS = STANDARD + STANDARD * STANDARD + len(PROPERTY_SCALES)
+
+def descriptors(sequences: Sequence[str]) -> np.ndarray:
+    sequences = [clean(sequence or "") for sequence in sequences]
+    count = len(sequences)
+    lengths = np.array([len(sequence) for sequence in sequences], dtype=np.int64)
+    codes = encode(sequences).astype(np.int64)
+    owners = np.repeat(np.arange(count, dtype=np.int64), lengths)
+    standard = codes < STANDARD
+
+    composition = np.bincount(
+        owners[standard] * STANDARD + codes[standard], minlength=count * STANDARD
+    ).reshape(count, STANDARD).astype(np.float64)
+
+    pairs = standard[:-1] & standard[1:] & (owners[:-1] == owners[1:])
+    dipeptides = np.bincount(
+        owners[:-1][pairs] * STANDARD * STANDARD + codes[:-1][pairs] * STANDARD + codes[1:][pairs],
+        minlength=count * STANDARD * STANDARD
+    ).reshape(count, STANDARD * STANDARD).astype(np.float64)
+
+    values = sequence_properties.compute(sequences)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values["molecular_weight"] = np.log10(values["molecular_weight"])
+        values["charge_per_residue"] = values["charge_at_ph7"] / lengths
+    properties = np.stack([
+        (values[name] - center) / scale for name, (center, scale) in PROPERTY_SCALES.items()
+    ], axis=1) if count else np.empty((0, len(PROPERTY_SCALES)))
+    properties = np.clip(np.nan_to_num(properties, nan=0.0, posinf=0.0, neginf=0.0), -5, 5)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        composition = np.sqrt(composition / np.maximum(composition.sum(axis=1, keepdims=True), 1))
+        dipeptides = np.sqrt(dipeptides / np.maximum(dipeptides.sum(axis=1, keepdims=True), 1))
+    return np.hstack([composition, dipeptides, properties * PROPERTY_WEIGHT]).astype(np.float32)
@@ -0,0 +1,167 @@
+import gzip
+import io
+import os
+import re
+from contextlib import contextmanager, ExitStack
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+LINE_WIDTH = 60
+BLOCK_SIZE = 1024 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+WHITESPACE = b" \t\r\n\x0b\x0c"
+
+UNIPROT_HEADER = re.compile(
+    r"^(?:sp|tr)\|(?P<accession>[^|]+)\|\S+\s*(?P<name>.*?)"
+    r"(?:\s+OS=(?P<organism>.*?))?(?:\s+OX=\S+)?(?:\s+GN=(?P<gene>\S+))?(?:\s+PE=\d)?(?:\s+SV=\d+)?$"
+)
+
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, io.TextIOBase]
+
+class _EncodedText(io.RawIOBase):
+    def __init__(self, text):
+        self.text = text
+        self.pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while len(self.pending) < len(buffer):
+            chunk = self.text.read(BLOCK_SIZE)
+            if not chunk:
+                break
+            self.pending += chunk.encode("utf-8")
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+@contextmanager
+def open_binary(source: Source) -> Iterator[BinaryIO]:
+    with ExitStack() as stack:
+        if isinstance(source, (str, os.PathLike)):
+            stream = stack.enter_context(open(source, "rb"))
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            stream = io.BytesIO(source)
+        elif isinstance(source, io.TextIOBase):
+            stream = io.BufferedReader(_EncodedText(source), BLOCK_SIZE)
+        else:
+            stream = source
+
+        if hasattr(stream, "peek"):
+            magic = stream.peek(2)[:2]
+        elif stream.seekable():
+            position = stream.tell()
+            magic = stream.read(2)
+            stream.seek(position)
+        else:
+            stream = io.BufferedReader(stream, BLOCK_SIZE)
+            magic = stream.peek(2)[:2]
+
+        if magic == GZIP_MAGIC:
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="rb"))
+        yield stream
+
+def _chunks(stream: BinaryIO, block_size: int) -> Iterator[bytes]:
+    block = stream.read(block_size)
+    while block and not block.startswith(b">"):
+        start = block.find(b"\n>")
+        if start >= 0:
+            block = block[start + 1:]
+            break
+        more = stream.read(block_size)
+        block = block[-1:] + more if more else b""
+
+    parts = []
+    while block:
+        cut = block.rfind(b"\n>")
+        if cut < 0:
+            parts.append(block)
+        else:
+            parts.append(block[:cut + 1])
+            yield b"".join(parts)
+            parts = [block[cut + 1:]]
+        block = stream.read(block_size)
+    if parts:
+        yield b"".join(parts)
+
+def read_fasta(source: Source, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[str, str]]:
+    with open_binary(source) as stream:
+        for chunk in _chunks(stream, block_size):
+            for record in chunk[1:].split(b"\n>"):
+                title, _, body = record.partition(b"\n")
+                yield (
+                    title.rstrip(WHITESPACE).decode("utf-8", "replace"),
+                    body.translate(None, WHITESPACE).decode("ascii", "replace")
+                )
+
+def wrap(sequence: str, width: int = LINE_WIDTH) -> str:
+    if len(sequence) <= width:
+        return sequence
+    return "\n".join([sequence[start:start + width] for start in range(0, len(sequence), width)])
+
+def format_record(title: str, sequence: str, width: int = LINE_WIDTH) -> str:
+    return f">{title}\n{wrap(sequence, width)}\n" if sequence else f">{title}\n"
+
+def iter_fasta(
+    records: Iterable[Tuple[str, str]],
+    width: int = LINE_WIDTH,
+    batch_size: int = 500
+) -> Iterator[str]:
+    batch = []
+    for title, sequence in records:
+        batch.append(format_record(title, sequence, width))
+        if len(batch) >= batch_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+def write_fasta(
+    records: Iterable[Tuple[str, str]],
+    target: Union[str, os.PathLike, BinaryIO],
+    width: int = LINE_WIDTH,
+    compress: Optional[bool] = None
+) -> int:
+    if isinstance(target, (str, os.PathLike)):
+        if compress is None:
+            compress = os.fspath(target).endswith(".gz")
+        with open(target, "wb") as out:
+            return write_fasta(records, out, width, compress)
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    out = gzip.GzipFile(fileobj=target, mode="wb", compresslevel=6) if compress else target
+    try:
+        for chunk in iter_fasta(counted(), width):
+            out.write(chunk.encode("utf-8"))
+    finally:
+        if compress:
+            out.close()
+    return count
+
+def parse_header(title: str) -> Dict[str, Any]:
+    match = UNIPROT_HEADER.match(title)
+    if match:
+        return {
+            "uniprot_id": match.group("accession"),
+            "name": match.group("name") or match.group("accession"),
+            "organism": match.group("organism"),
+            "gene_name": match.group("gene")
+        }
+
+    fields = title.split("|")
+    if len(fields) in (2, 3) and fields[1].strip():
+        return {
+            "uniprot_id": fields[0].strip() if fields[0].strip() not in ("", "UNKNOWN") else None,
+            "name": fields[1].strip(),
+            "organism": fields[2].strip() or None if len(fields) == 3 else None,
+            "gene_name": None
+        }
+    return {"uniprot_id": None, "name": title.strip() or "Unknown", "organism": None, "gene_name": None}
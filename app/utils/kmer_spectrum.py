@@ -0,0 +1,148 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.utils.sequence_search import AMINO_ACIDS, kmer_codes
+
+SPECTRUM_K = 3
+DIMENSIONS = len(AMINO_ACIDS) ** SPECTRUM_K
+METRICS = ("cosine", "jaccard")
+MAX_SCORE_CELLS = 1 << 18
+SHARED_BITS = 16
+SHARED_SCALE = 1 << SHARED_BITS
+
+Row = Tuple[np.ndarray, np.ndarray]
+Matches = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+def spectrum(sequence: Optional[str]) -> Row:
+    codes = kmer_codes(sequence.upper(), SPECTRUM_K) if sequence else np.empty(0, dtype=np.int64)
+    indices, counts = np.unique(codes, return_counts=True)
+    return indices.astype(np.uint16), np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16)
+
+def to_bytes(row: Row) -> bytes:
+    indices, counts = row
+    return indices.astype("<u2").tobytes() + counts.astype("<u2").tobytes()
+
+def from_bytes(data: Optional[bytes]) -> Row:
+    values = np.frombuffer(data or b"", dtype="<u2")
+    half = len(values) // 2
+    return values[:half], values[half:]
+
+def spectrum_values(sequence: Optional[str]) -> Dict[str, Optional[bytes]]:
+    row = spectrum(sequence)
+    return {"kmer_spectrum": to_bytes(row) if len(row[0]) else None}
+
+def superseded(block_ids: Sequence[np.ndarray]) -> List[np.ndarray]:
+    if not block_ids:
+        return []
+    ids = np.concatenate([np.asarray(block, dtype=np.int64) for block in block_ids])
+    _, last = np.unique(ids[::-1], return_index=True)
+    stale = np.ones(len(ids), dtype=bool)
+    stale[len(ids) - 1 - last] = False
+    return np.split(stale, np.cumsum([len(block) for block in block_ids])[:-1])
+
+class SpectrumMatrix:
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, counts: np.ndarray):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.uint16)
+        self.counts = np.asarray(counts, dtype=np.uint16)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Row]) -> "SpectrumMatrix":
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+        if not indptr[-1]:
+            empty = np.empty(0, dtype=np.uint16)
+            return cls(indptr, empty, empty)
+        return cls(
+            indptr,
+            np.concatenate([indices for indices, _ in rows]),
+            np.concatenate([counts for _, counts in rows])
+        )
+
+    @classmethod
+    def from_sequences(cls, sequences: Sequence[str]) -> "SpectrumMatrix":
+        return cls.from_rows([spectrum(sequence) for sequence in sequences])
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, position: int) -> Row:
+        start, end = self.indptr[position], self.indptr[position + 1]
+        return self.indices[start:end], self.counts[start:end]
+
+    def take(self, positions: Sequence[int]) -> "SpectrumMatrix":
+        return SpectrumMatrix.from_rows([self.row(position) for position in positions])
+
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.indptr))
+
+    def norms(self) -> np.ndarray:
+        weights = self.counts.astype(np.float64) ** 2
+        return np.sqrt(np.bincount(self.row_ids(), weights=weights, minlength=len(self)))
+
+    def distinct(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+class SpectrumIndex:
+    def __init__(self, matrix: SpectrumMatrix):
+        order = np.argsort(matrix.indices, kind="stable")
+        self.size = len(matrix)
+        self.rows = matrix.row_ids()[order]
+        self.counts = matrix.counts[order]
+        self.colptr = np.zeros(DIMENSIONS + 1, dtype=np.int64)
+        np.cumsum(np.bincount(matrix.indices, minlength=DIMENSIONS), out=self.colptr[1:])
+        self.norms = matrix.norms()
+        self.distinct = matrix.distinct()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def products(self, queries: SpectrumMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        m, n = len(queries), self.size
+        columns = queries.indices.astype(np.int64)
+        lengths = self.colptr[columns + 1] - self.colptr[columns]
+        starts, ends = self.colptr[columns].tolist(), self.colptr[columns + 1].tolist()
+        if not lengths.sum() or not n:
+            return np.zeros((m, n), dtype=np.int64), np.zeros((m, n), dtype=np.int64)
+
+        cells = np.concatenate([self.rows[start:end] for start, end in zip(starts, ends)])
+        if m > 1:
+            cells += np.repeat(queries.row_ids() * n, lengths)
+        counts = np.concatenate([self.counts[start:end] for start, end in zip(starts, ends)])
+        weights = counts * np.repeat(queries.counts * float(SHARED_SCALE), lengths) + 1
+        packed = np.bincount(cells, weights=weights, minlength=m * n).astype(np.int64).reshape(m, n)
+        return packed >> SHARED_BITS, packed & (SHARED_SCALE - 1)
+
+    def scores(self, queries: SpectrumMatrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        dot, shared = self.products(queries)
+        scale = queries.norms()[:, None] * self.norms[None, :]
+        union = queries.distinct()[:, None] + self.distinct[None, :] - shared
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cosine = np.where(scale > 0, dot / scale, 0.0)
+            jaccard = np.where(union > 0, shared / union, 0.0)
+        return cosine, jaccard, shared
+
+    def best_matches(
+        self,
+        queries: SpectrumMatrix,
+        metric: str = "cosine",
+        limit: int = 50,
+        min_score: float = 0.0,
+        exclude: Optional[np.ndarray] = None
+    ) -> List[Matches]:
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+
+        matches = []
+        chunk = max(MAX_SCORE_CELLS // max(self.size, 1), 1)
+        for start in range(0, len(queries), chunk):
+            cosine, jaccard, shared = self.scores(queries.take(range(start, min(start + chunk, len(queries)))))
+            ranking = cosine if metric == "cosine" else jaccard
+            if exclude is not None:
+                shared[:, exclude] = 0
+            for row in range(len(ranking)):
+                positions = np.nonzero((ranking[row] >= min_score) & (shared[row] > 0))[0]
+                if len(positions) > limit:
+                    positions = positions[np.argpartition(-ranking[row, positions], limit - 1)[:limit]]
+                positions = positions[np.lexsort((positions, -ranking[row, positions]))]
+                matches.append((positions, cosine[row, positions], jaccard[row, positions], shared[row, positions]))
+        return matches
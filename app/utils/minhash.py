@@ -0,0 +1,56 @@
+import numpy as np
+from typing import Any, Dict, Optional
+from app.utils.sequence_search import kmer_codes
+
+SHINGLE_SIZE = 4
+NUM_HASHES = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_HASHES // BANDS
+MERSENNE_PRIME = (1 << 31) - 1
+SEED = 20240601
+IDENTITY_SLACK = 0.1
+
+_rng = np.random.default_rng(SEED)
+HASH_A = _rng.integers(1, MERSENNE_PRIME, NUM_HASHES, dtype=np.int64)
+HASH_B = _rng.integers(0, MERSENNE_PRIME, NUM_HASHES, dtype=np.int64)
+BAND_SALT = _rng.integers(1, 1 << 62, BANDS, dtype=np.int64).astype(np.uint64)
+BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+def signature(sequence: str) -> Optional[np.ndarray]:
+    shingles = np.unique(kmer_codes(sequence.upper(), SHINGLE_SIZE)).astype(np.int64)
+    if not len(shingles):
+        return None
+
+    mins = np.full(NUM_HASHES, MERSENNE_PRIME, dtype=np.int64)
+    for start in range(0, len(shingles), 4096):
+        block = shingles[start:start + 4096]
+        hashed = (HASH_A[:, None] * block[None, :] + HASH_B[:, None]) % MERSENNE_PRIME
+        np.minimum(mins, hashed.min(axis=1), out=mins)
+    return mins.astype(np.uint32)
+
+def band_hashes(sig: np.ndarray) -> np.ndarray:
+    rows = sig.reshape(BANDS, ROWS_PER_BAND).astype(np.uint64)
+    hashed = BAND_SALT.copy()
+    with np.errstate(over="ignore"):
+        for column in range(ROWS_PER_BAND):
+            hashed = (hashed ^ rows[:, column]) * BAND_MULTIPLIER
+    return hashed.view(np.int64)
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+def estimate_jaccard(sig: np.ndarray, others: np.ndarray) -> np.ndarray:
+    return (np.atleast_2d(others) == sig).mean(axis=1)
+
+def jaccard_floor(identity: float) -> float:
+    changed = SHINGLE_SIZE * (1 - identity)
+    return max(0.0, (1 - changed) / (1 + changed) - IDENTITY_SLACK)
+
+def fingerprint(sequence: Optional[str]) -> Dict[str, Any]:
+    sig = signature(sequence) if sequence else None
+    if sig is None:
+        return {"minhash": None, "minhash_bands": None}
+    return {"minhash": to_bytes(sig), "minhash_bands": band_hashes(sig).tolist()}
@@ -0,0 +1,488 @@
+import re
+import numpy as np
+from collections import deque
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+RESIDUE_CODES = {residue: code for code, residue in enumerate(AMINO_ACIDS)}
+UNKNOWN = len(AMINO_ACIDS)
+END = UNKNOWN + 1
+NEVER = END + 1
+SYMBOLS = NEVER + 1
+
+CODE_TABLE = np.full(256, UNKNOWN, dtype=np.uint8)
+for _residue, _code in RESIDUE_CODES.items():
+    CODE_TABLE[ord(_residue)] = _code
+CODE_TABLE[0] = END
+
+END_MASK = np.zeros(SYMBOLS, dtype=bool)
+END_MASK[END] = True
+
+PROSITE_PATTERNS = {
+    "PS00001": ("N-glycosylation site", "N-{P}-[ST]-{P}"),
+    "PS00004": ("cAMP- and cGMP-dependent protein kinase phosphorylation site", "[RK](2)-x-[ST]"),
+    "PS00005": ("Protein kinase C phosphorylation site", "[ST]-x-[RK]"),
+    "PS00006": ("Casein kinase II phosphorylation site", "[ST]-x(2)-[DE]"),
+    "PS00007": ("Tyrosine kinase phosphorylation site", "[RK]-x(2,3)-[DE]-x(2,3)-Y"),
+    "PS00008": ("N-myristoylation site", "G-{EDRKHPFYW}-x(2)-[STAGCN]-{P}"),
+    "PS00009": ("Amidation site", "x-G-[RK]-[RK]"),
+    "PS00014": ("Endoplasmic reticulum targeting sequence", "[KRHQSA]-[DENQ]-E-L>"),
+    "PS00016": ("Cell attachment sequence", "R-G-D"),
+    "PS00017": ("ATP/GTP-binding site motif A (P-loop)", "[AG]-x(4)-G-K-[ST]"),
+    "PS00018": (
+        "EF-hand calcium-binding domain",
+        "D-{W}-[DNS]-{ILVFYW}-[DENSTG]-[DNQGHRK]-{GP}-[LIVMC]-[DENQSTAGC]-x(2)-[DE]-[LIVMFYW]"
+    ),
+    "PS00028": ("Zinc finger C2H2 type domain", "C-x(2,4)-C-x(3)-[LIVMFYWC]-x(8)-H-x(3,5)-H"),
+    "PS00029": ("Leucine zipper pattern", "L-x(6)-L-x(6)-L-x(6)-L"),
+    "PS00342": ("Microbodies C-terminal targeting signal", "[STAGCN]-[RKH]-[LIVMAFY]>"),
+}
+
+_ELEMENT = re.compile(r"^(?P<body>[A-Z]|x|\[[A-Z<>]+\]|\{[A-Z]+\})(?:\((?P<low>\d+)(?:,(?P<high>\d+))?\))?$")
+
+class PatternError(ValueError):
+    pass
+
+class Element:
+    def __init__(self, residues: Optional[str], excluded: bool, low: int, high: int,
+                 n_terminal: bool = False, c_terminal: bool = False):
+        self.residues = residues
+        self.excluded = excluded
+        self.low = low
+        self.high = high
+        self.n_terminal = n_terminal
+        self.c_terminal = c_terminal
+
+    @property
+    def literal(self) -> Optional[str]:
+        if self.residues and len(self.residues) == 1 and not self.excluded and self.low == self.high:
+            return self.residues * self.low
+        return None
+
+    def regex(self) -> str:
+        if self.residues is None:
+            body = "."
+        elif self.excluded:
+            body = f"[^{self.residues}]"
+        elif len(self.residues) == 1:
+            body = self.residues
+        else:
+            body = f"[{self.residues}]"
+        if self.n_terminal:
+            body = f"(?:^|{body})"
+        if self.c_terminal:
+            body = f"(?:{body}|$)"
+
+        if self.low == self.high == 1:
+            return body
+        if self.low == self.high:
+            return f"{body}{{{self.low}}}"
+        return f"{body}{{{self.low},{self.high}}}"
+
+def parse_prosite(pattern: str) -> Tuple[List[Element], bool, bool]:
+    text = "".join(pattern.split()).rstrip(".")
+    if not text:
+        raise PatternError("Pattern cannot be empty")
+
+    n_anchor = text.startswith("<")
+    c_anchor = text.endswith(">")
+    text = text[1 if n_anchor else 0:len(text) - 1 if c_anchor else len(text)]
+
+    elements = []
+    for token in text.split("-"):
+        match = _ELEMENT.match(token)
+        if not match:
+            raise PatternError(f"Invalid PROSITE element: {token!r}")
+
+        body = match.group("body")
+        low = int(match.group("low") or 1)
+        high = int(match.group("high") or low)
+        if high < low or high == 0:
+            raise PatternError(f"Invalid repeat count in element: {token!r}")
+
+        if body == "x":
+            elements.append(Element(None, False, low, high))
+        elif body.startswith("["):
+            residues = body[1:-1]
+            elements.append(Element(
+                residues.replace("<", "").replace(">", ""), False, low, high,
+                n_terminal="<" in residues, c_terminal=">" in residues
+            ))
+        elif body.startswith("{"):
+            elements.append(Element(body[1:-1], True, low, high))
+        else:
+            elements.append(Element(body, False, low, high))
+    return elements, n_anchor, c_anchor
+
+def compile_prosite(pattern: str) -> str:
+    elements, n_anchor, c_anchor = parse_prosite(pattern)
+    regex = "".join(element.regex() for element in elements)
+    return ("^" if n_anchor else "") + regex + ("$" if c_anchor else "")
+
+class AhoCorasick:
+    LANE_WIDTH = 256
+    MIN_LANES = 64
+
+    def __init__(self, words: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        self.words: List[str] = []
+        self.order: List[int] = [0]
+        self.table: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+        for index, word in enumerate(words):
+            self.words.append(word)
+            state = 0
+            for letter in word:
+                if letter not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][letter] = len(self.goto) - 1
+                state = self.goto[state][letter]
+            self.output[state].append(index)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.order.append(state)
+            for letter, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and letter not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(letter, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_matches(self, text: str):
+        goto, fail, output, words = self.goto, self.fail, self.output, self.words
+        state = 0
+        for position, letter in enumerate(text):
+            while state and letter not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(letter, 0)
+            for index in output[state]:
+                yield position - len(words[index]) + 1, index
+
+    def transitions(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self.table is None:
+            delta = np.zeros((len(self.goto), SYMBOLS), dtype=np.int32)
+            for state in self.order:
+                if state:
+                    delta[state] = delta[self.fail[state]]
+                for letter, child in self.goto[state].items():
+                    delta[state, RESIDUE_CODES[letter]] = child
+            bounds = np.zeros(len(self.output) + 1, dtype=np.int64)
+            np.cumsum([len(found) for found in self.output], out=bounds[1:])
+            outputs = np.array([index for found in self.output for index in found], dtype=np.int64)
+            self.table = delta, bounds, outputs
+        return self.table
+
+    def scan_codes(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.words or not len(codes):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        delta, bounds, outputs = self.transitions()
+        emits = bounds[1:] > bounds[:-1]
+        longest = max(len(word) for word in self.words)
+        lanes = max(min(len(codes), self.MIN_LANES), len(codes) // self.LANE_WIDTH)
+        width = -(-len(codes) // lanes)
+        lane_start = np.arange(0, len(codes), width)
+        lane_end = np.minimum(lane_start + width, len(codes))
+        position = np.maximum(lane_start - longest + 1, 0)
+        padded = np.concatenate([codes, np.full(width + longest, END, dtype=codes.dtype)])
+
+        state = np.zeros(len(lane_start), dtype=np.int32)
+        found_positions, found_states = [], []
+        for _ in range(int((lane_end - position).max())):
+            state = delta[state, padded[position]]
+            hit = emits[state] & (position >= lane_start) & (position < lane_end)
+            if hit.any():
+                found_positions.append(position[hit])
+                found_states.append(state[hit])
+            position = position + 1
+        if not found_positions:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        ends = np.concatenate(found_positions)
+        states = np.concatenate(found_states)
+        counts = bounds[states + 1] - bounds[states]
+        shift = np.repeat(bounds[states] - (np.cumsum(counts) - counts), counts)
+        words = outputs[shift + np.arange(int(counts.sum()))]
+        lengths = np.array([len(word) for word in self.words], dtype=np.int64)
+        return np.repeat(ends, counts) - lengths[words] + 1, words
+
+class Motif:
+    MAX_VARIANTS = 256
+
+    def __init__(self, name: str, pattern: str, description: Optional[str] = None):
+        self.name = name
+        self.pattern = pattern
+        self.description = description
+        self.elements, self.n_anchor, self.c_anchor = parse_prosite(pattern)
+        self.regex = re.compile(compile_prosite(pattern))
+        self.standard = all(set(element.residues or "") <= RESIDUE_CODES.keys() for element in self.elements)
+        self.literal = None
+        if self.standard and all(element.literal for element in self.elements) and not self.n_anchor \
+                and not self.c_anchor:
+            self.literal = "".join(element.literal for element in self.elements)
+
+    def variants(self) -> Optional[List[Tuple[List[int], List[np.ndarray], int, int]]]:
+        if not self.standard or any(element.n_terminal for element in self.elements):
+            return None
+        if any(element.c_terminal and (element is not self.elements[-1] or element.high > 1)
+               for element in self.elements):
+            return None
+        count = 1
+        for element in self.elements:
+            count *= element.high - element.low + 1
+        if count > self.MAX_VARIANTS:
+            return None
+
+        masks = [element_mask(element) for element in self.elements]
+        variants = []
+        repeats = [range(element.high, element.low - 1, -1) for element in self.elements]
+        for counts in product(*repeats):
+            offsets, constraints, position = [], [], 0
+            for element, mask, repeat in zip(self.elements, masks, counts):
+                for _ in range(repeat):
+                    if element.residues is not None:
+                        offsets.append(position)
+                        constraints.append(mask)
+                    position += 1
+            reach = position - 1 if self.elements[-1].c_terminal else position
+            if self.c_anchor:
+                offsets.append(position)
+                constraints.append(END_MASK)
+            variants.append((offsets, constraints, position, reach))
+        return variants
+
+    def finditer(self, sequence: str):
+        if self.n_anchor:
+            match = self.regex.match(sequence)
+            if match:
+                yield match
+            return
+        position = 0
+        while position <= len(sequence):
+            match = self.regex.search(sequence, position)
+            if not match:
+                return
+            yield match
+            position = match.start() + 1
+
+def element_mask(element: Element) -> np.ndarray:
+    mask = np.zeros(SYMBOLS, dtype=bool)
+    if element.residues is None:
+        mask[:END] = True
+        return mask
+    for residue in element.residues:
+        mask[RESIDUE_CODES.get(residue, UNKNOWN)] = True
+    if element.excluded:
+        mask[:END] = ~mask[:END]
+    if element.c_terminal:
+        mask[END] = True
+    return mask
+
+def encode_sequences(sequences: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    text = "".join(sequence + "\0" for sequence in sequences).encode("ascii", "replace")
+    codes = CODE_TABLE[np.frombuffer(text, dtype=np.uint8)]
+    starts = np.zeros(len(sequences) + 1, dtype=np.int64)
+    np.cumsum([len(sequence) + 1 for sequence in sequences], out=starts[1:])
+    return codes, starts
+
+class VariantIndex:
+    def __init__(self, rows: List[Tuple[int, int, List[int], List[np.ndarray], int, int]]):
+        self.motif = np.array([row[0] for row in rows], dtype=np.int64)
+        self.rank = np.array([row[1] for row in rows], dtype=np.int64)
+        self.length = np.array([row[4] for row in rows], dtype=np.int64)
+        self.reach = np.array([row[5] for row in rows], dtype=np.int64)
+
+        constraints = max([len(row[2]) for row in rows] + [2])
+        offsets = np.zeros((len(rows), constraints), dtype=np.int64)
+        masks = np.ones((len(rows), constraints, SYMBOLS), dtype=bool)
+        for number, row in enumerate(rows):
+            if row[2]:
+                offsets[number, :len(row[2])] = row[2]
+                masks[number, :len(row[3])] = row[3]
+        order = np.argsort(masks.sum(axis=2), axis=1, kind="stable")
+        self.offsets = np.take_along_axis(offsets, order, axis=1)
+        masks = np.take_along_axis(masks, order[:, :, None], axis=1)
+        self.masks = masks.reshape(-1)
+        self.constraints = constraints
+        self.span = int(max(self.offsets.max(initial=0) + 1, self.length.max(initial=1)))
+
+        self.anchors, anchor = np.unique(self.offsets[:, :2], axis=0, return_inverse=True)
+        pairs = masks[:, 0, :, None] & masks[:, 1, None, :]
+        variants, first, second = np.nonzero(pairs)
+        keys = (anchor.reshape(-1)[variants] * SYMBOLS + first) * SYMBOLS + second
+        self.anchor_variants = variants[np.argsort(keys, kind="stable")]
+        self.anchor_bounds = np.zeros(len(self.anchors) * SYMBOLS * SYMBOLS + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=len(self.anchor_bounds) - 1), out=self.anchor_bounds[1:])
+
+    def match(self, padded: np.ndarray, window: range) -> Tuple[np.ndarray, np.ndarray]:
+        starts = np.arange(window.start, window.stop)
+        number = np.arange(len(self.anchors))[:, None]
+        keys = (number * SYMBOLS + padded[self.anchors[:, 0, None] + starts].astype(np.int64)) * SYMBOLS
+        keys += padded[self.anchors[:, 1, None] + starts]
+        keys = keys.reshape(-1)
+        first = self.anchor_bounds[keys]
+        counts = self.anchor_bounds[keys + 1] - first
+        total = int(counts.sum())
+        shift = np.repeat(first - (np.cumsum(counts) - counts), counts)
+        rows = self.anchor_variants[shift + np.arange(total)]
+        positions = np.repeat(np.tile(starts, len(self.anchors)), counts)
+        for k in range(2, self.constraints):
+            if not len(rows):
+                break
+            symbols = padded[self.offsets[rows, k] + positions]
+            keep = self.masks[(rows * self.constraints + k) * SYMBOLS + symbols]
+            rows, positions = rows[keep], positions[keep]
+        return rows, positions
+
+class MotifScanner:
+    WINDOW = 8192
+
+    def __init__(self, motifs: Iterable[Motif]):
+        self.motifs = list(motifs)
+        self.literals: List[int] = []
+        self.fallback: List[int] = []
+        rows: List[Tuple[int, int, List[int], List[np.ndarray], int, int]] = []
+        for index, motif in enumerate(self.motifs):
+            if motif.literal:
+                self.literals.append(index)
+                continue
+            variants = motif.variants()
+            if variants is None:
+                self.fallback.append(index)
+                continue
+            for rank, (offsets, constraints, length, reach) in enumerate(variants):
+                rows.append((index, rank, offsets, constraints, length, reach))
+
+        self.automaton = AhoCorasick(self.motifs[index].literal for index in self.literals)
+        self.index = VariantIndex(rows) if rows else None
+        self.span = self.index.span if self.index else 1
+        self.n_anchored = np.array([motif.n_anchor for motif in self.motifs], dtype=bool)
+
+    @classmethod
+    def from_patterns(cls, patterns: Mapping[str, str]) -> "MotifScanner":
+        return cls(Motif(name, pattern) for name, pattern in patterns.items())
+
+    @classmethod
+    def prosite(
+        cls,
+        library: Optional[Mapping[str, Tuple[str, str]]] = None,
+        extra: Optional[Mapping[str, str]] = None
+    ) -> "MotifScanner":
+        motifs = [
+            Motif(accession, pattern, description)
+            for accession, (description, pattern) in (library or PROSITE_PATTERNS).items()
+        ]
+        motifs.extend(Motif(name, pattern) for name, pattern in (extra or {}).items())
+        return cls(motifs)
+
+    def scan_many(self, sequences: Sequence[str]) -> List[List[Tuple[int, int, int]]]:
+        sequences = ["".join(sequence.split()).upper() for sequence in sequences]
+        if not sequences:
+            return []
+
+        codes, starts = encode_sequences(sequences)
+        padded = np.concatenate([codes, np.full(self.span + 1, NEVER, dtype=codes.dtype)])
+        motifs, ranks, positions, ends, reaches = [], [], [], [], []
+        for window_start in range(0, len(codes) if self.index else 0, self.WINDOW):
+            rows, found = self.index.match(padded, range(window_start, min(window_start + self.WINDOW, len(codes))))
+            motifs.append(self.index.motif[rows])
+            ranks.append(self.index.rank[rows])
+            positions.append(found)
+            ends.append(found + self.index.length[rows])
+            reaches.append(found + self.index.reach[rows])
+
+        motif = np.concatenate(motifs or [np.empty(0, dtype=np.int64)])
+        rank = np.concatenate(ranks or [np.empty(0, dtype=np.int64)])
+        position = np.concatenate(positions or [np.empty(0, dtype=np.int64)])
+        end = np.concatenate(ends or [np.empty(0, dtype=np.int64)])
+        reach = np.concatenate(reaches or [np.empty(0, dtype=np.int64)])
+
+        sequence_index = np.searchsorted(starts, position, side="right") - 1
+        sequence_end = starts[sequence_index + 1] - 1
+        inside = (reach <= sequence_end) & (~self.n_anchored[motif] | (position == starts[sequence_index]))
+        motif, rank, position, end = motif[inside], rank[inside], position[inside], end[inside]
+        sequence_index, sequence_end = sequence_index[inside], sequence_end[inside]
+
+        order = np.lexsort((rank, position, motif))
+        motif, position, end = motif[order], position[order], end[order]
+        sequence_index, sequence_end = sequence_index[order], sequence_end[order]
+        first = np.ones(len(motif), dtype=bool)
+        first[1:] = (motif[1:] != motif[:-1]) | (position[1:] != position[:-1])
+        hits = [
+            motif[first],
+            sequence_index[first],
+            position[first] - starts[sequence_index[first]],
+            np.minimum(end[first], sequence_end[first]) - starts[sequence_index[first]]
+        ]
+
+        offsets, words = self.automaton.scan_codes(codes)
+        if len(words):
+            literal = np.array(self.literals, dtype=np.int64)[words]
+            sequence_index = np.searchsorted(starts, offsets, side="right") - 1
+            start = offsets - starts[sequence_index]
+            lengths = np.array([len(word) for word in self.automaton.words], dtype=np.int64)[words]
+            hits = [np.concatenate([found, column]) for found, column in zip(
+                hits, [literal, sequence_index, start, start + lengths]
+            )]
+
+        extra = []
+        for number, sequence in enumerate(sequences):
+            for index in self.fallback:
+                for match in self.motifs[index].finditer(sequence):
+                    extra.append((index, number, match.start(), match.end()))
+        if extra:
+            columns = np.array(extra, dtype=np.int64).T
+            hits = [np.concatenate([found, column]) for found, column in zip(hits, columns)]
+
+        motif, sequence_index, start, end = hits
+        order = np.lexsort((end, motif, start, sequence_index))
+        bounds = np.searchsorted(sequence_index[order], np.arange(len(sequences) + 1))
+        rows = list(zip(motif[order].tolist(), start[order].tolist(), end[order].tolist()))
+        return [rows[bounds[number]:bounds[number + 1]] for number in range(len(sequences))]
+
+    def scan(self, sequence: str) -> List[Dict]:
+        sequence = "".join(sequence.split()).upper()
+        hits = []
+        for index, start, end in self.scan_many([sequence])[0]:
+            motif = self.motifs[index]
+            hits.append({
+                "pattern": motif.name,
+                "description": motif.description,
+                "start": start + 1,
+                "end": end,
+                "match": sequence[start:end]
+            })
+        return hits
+
+def load_prosite_dat(path: str) -> Dict[str, Tuple[str, str]]:
+    patterns = {}
+    accession, description, pattern, is_pattern = None, None, [], False
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            code, value = line[:2], line[5:].rstrip("\n")
+            if code == "ID":
+                is_pattern = value.rstrip(".").endswith("PATTERN")
+            elif code == "AC":
+                accession = value.rstrip(";").strip()
+            elif code == "DE":
+                description = value.strip()
+            elif code == "PA":
+                pattern.append(value.strip())
+            elif code == "//":
+                if is_pattern and accession and pattern:
+                    patterns[accession] = (description or accession, "".join(pattern))
+                accession, description, pattern, is_pattern = None, None, [], False
+    return patterns
+
+@lru_cache(maxsize=8)
+def load_library(path: Optional[str] = None) -> MotifScanner:
+    return MotifScanner.prosite(load_prosite_dat(path) if path else None)
@@ -0,0 +1,280 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.utils.alignment import NEG_INF, MAX_TRACEBACK_CELLS
+from app.utils.sequence_search import AMINO_ACIDS, load_matrix, encode, kmer_codes
+
+DISTANCE_KMER_SIZE = 3
+SCORE_SCALE = 100
+PARALLEL_MIN_SEQUENCES = 32
+TREE_METHODS = ("upgma", "nj")
+
+Merge = Tuple[int, int, int, float, float]
+
+def kmer_distances(sequences: Sequence[str], k: int = DISTANCE_KMER_SIZE) -> np.ndarray:
+    presence = np.zeros((len(sequences), len(AMINO_ACIDS) ** k), dtype=np.float32)
+    for row, sequence in enumerate(sequences):
+        presence[row, kmer_codes(sequence, k)] = 1.0
+    shared = presence @ presence.T
+    distinct = np.diag(shared).copy()
+    smaller = np.minimum(distinct[:, None], distinct[None, :])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distances = np.where(smaller > 0, 1.0 - shared / smaller, 1.0)
+    np.fill_diagonal(distances, 0.0)
+    return distances.astype(np.float64)
+
+def upgma(distances: np.ndarray) -> List[Merge]:
+    n = len(distances)
+    d = distances.astype(np.float64)
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n)
+    nodes = list(range(n))
+    heights = {node: 0.0 for node in range(n)}
+    merges = []
+    for step in range(n - 1):
+        i, j = sorted(divmod(int(np.argmin(d)), n))
+        height = d[i, j] / 2
+        merged = (d[i] * size[i] + d[j] * size[j]) / (size[i] + size[j])
+        d[i, :] = merged
+        d[:, i] = merged
+        d[i, i] = np.inf
+        d[j, :] = np.inf
+        d[:, j] = np.inf
+        size[i] += size[j]
+
+        node = n + step
+        heights[node] = height
+        merges.append((nodes[i], nodes[j], node, max(height - heights[nodes[i]], 0.0), max(height - heights[nodes[j]], 0.0)))
+        nodes[i] = node
+    return merges
+
+def neighbor_joining(distances: np.ndarray) -> List[Merge]:
+    n = len(distances)
+    d = distances.astype(np.float64).copy()
+    active = np.ones(n, dtype=bool)
+    nodes = list(range(n))
+    merges = []
+    for step in range(n - 1):
+        count = int(active.sum())
+        if count == 2:
+            i, j = np.nonzero(active)[0]
+            half = max(d[i, j] / 2, 0.0)
+            merges.append((nodes[i], nodes[j], n + step, half, half))
+            break
+
+        totals = np.where(active, d[:, active].sum(axis=1), 0.0)
+        q = (count - 2) * d - totals[:, None] - totals[None, :]
+        q[~active, :] = np.inf
+        q[:, ~active] = np.inf
+        np.fill_diagonal(q, np.inf)
+        i, j = sorted(divmod(int(np.argmin(q)), n))
+
+        left = d[i, j] / 2 + (totals[i] - totals[j]) / (2 * (count - 2))
+        right = d[i, j] - left
+        joined = (d[i] + d[j] - d[i, j]) / 2
+        d[i, :] = joined
+        d[:, i] = joined
+        d[i, i] = 0.0
+        active[j] = False
+
+        node = n + step
+        merges.append((nodes[i], nodes[j], node, max(left, 0.0), max(right, 0.0)))
+        nodes[i] = node
+    return merges
+
+def guide_tree(distances: np.ndarray, method: str = "upgma") -> List[Merge]:
+    if method not in TREE_METHODS:
+        raise ValueError(f"tree must be one of {', '.join(TREE_METHODS)}")
+    return upgma(distances) if method == "upgma" else neighbor_joining(distances)
+
+def newick(merges: Sequence[Merge], labels: Sequence[str]) -> str:
+    def label(text: str) -> str:
+        return "'" + text.replace("'", "''") + "'" if any(c in text for c in " ():;,[]'") else text
+
+    names = {index: label(text) for index, text in enumerate(labels)}
+    for left, right, node, left_length, right_length in merges:
+        names[node] = f"({names.pop(left)}:{left_length:.4f},{names.pop(right)}:{right_length:.4f})"
+    return (merges[-1:] and names[merges[-1][2]] or names.get(0, "")) + ";"
+
+def profile(rows: np.ndarray, symbols: int) -> np.ndarray:
+    columns = rows.shape[1]
+    offsets = rows.astype(np.int64) + np.arange(columns, dtype=np.int64) * (symbols + 1)
+    counts = np.bincount(offsets.ravel(), minlength=columns * (symbols + 1)).reshape(columns, symbols + 1)
+    return counts[:, :symbols] / len(rows)
+
+def _fill(scores: np.ndarray, gap_open: int, gap_extend: int):
+    m, n = scores.shape
+    opening = gap_open + gap_extend
+    ramp = gap_extend * np.arange(m + 1, dtype=np.int32)
+    h = np.empty((n + 1, m + 1), dtype=np.int32)
+    e = np.empty_like(h)
+    f = np.empty_like(h)
+    h_tilde = np.empty(m + 1, dtype=np.int32)
+    opened = np.empty(m + 1, dtype=np.int32)
+    shifted = np.empty(m, dtype=np.int32)
+    columns = np.ascontiguousarray(scores.T, dtype=np.int32)
+
+    h[0] = -(gap_open + ramp)
+    h[0, 0] = 0
+    e[0] = NEG_INF
+    f[0] = h[0]
+    f[0, 0] = NEG_INF
+    f[1:, 0] = NEG_INF
+    for j in range(1, n + 1):
+        np.subtract(e[j - 1], gap_extend, out=e[j])
+        np.subtract(h[j - 1], opening, out=opened)
+        np.maximum(e[j], opened, out=e[j])
+        np.add(h[j - 1, :-1], columns[j - 1], out=h_tilde[1:])
+        h_tilde[0] = NEG_INF
+        np.maximum(h_tilde, e[j], out=h_tilde)
+        np.add(h_tilde[:-1], ramp[:-1], out=shifted)
+        np.maximum.accumulate(shifted, out=shifted)
+        np.subtract(shifted, ramp[1:], out=f[j, 1:])
+        f[j, 1:] -= gap_open
+        np.maximum(h_tilde, f[j], out=h[j])
+    return h, e, f
+
+def _traceback(scores: np.ndarray, h: np.ndarray, e: np.ndarray, f: np.ndarray, gap_open: int, gap_extend: int) -> np.ndarray:
+    m, n = scores.shape
+    opening = gap_open + gap_extend
+    i, j = m, n
+    state = 0
+    ops = []
+    while i > 0 or j > 0:
+        if state == 0:
+            if j > 0 and h[j, i] == e[j, i]:
+                state = 1
+            elif i > 0 and (j == 0 or h[j, i] == f[j, i]):
+                state = 2
+            else:
+                ops.append(0)
+                i, j = i - 1, j - 1
+        elif state == 1:
+            ops.append(1)
+            if i == 0 or e[j, i] == h[j - 1, i] - opening:
+                state = 0
+            j -= 1
+        else:
+            ops.append(2)
+            if j == 0 or f[j, i] == h[j, i - 1] - opening:
+                state = 0
+            i -= 1
+    return np.array(ops[::-1], dtype=np.uint8)
+
+def align_profiles(
+    first: np.ndarray,
+    second: np.ndarray,
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1
+) -> np.ndarray:
+    if (first.shape[1] + 1) * (second.shape[1] + 1) > MAX_TRACEBACK_CELLS:
+        raise ValueError("Sequences too long for a full traceback")
+
+    alphabet, substitution = load_matrix(matrix)
+    symbols = len(alphabet)
+    scores = profile(first, symbols) @ substitution.astype(np.float64) @ profile(second, symbols).T
+    scores = np.rint(scores * SCORE_SCALE).astype(np.int32)
+    gap_open, gap_extend = gap_open * SCORE_SCALE, gap_extend * SCORE_SCALE
+
+    h, e, f = _fill(scores, gap_open, gap_extend)
+    ops = _traceback(scores, h, e, f, gap_open, gap_extend)
+
+    merged = np.full((len(first) + len(second), len(ops)), symbols, dtype=np.uint8)
+    merged[:len(first), ops != 1] = first
+    merged[len(first):, ops != 2] = second
+    return merged
+
+def progressive_align(
+    encoded: Sequence[np.ndarray],
+    merges: Sequence[Merge],
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1,
+    workers: int = 1
+) -> Tuple[np.ndarray, List[int]]:
+    alignments = {index: sequence[None, :] for index, sequence in enumerate(encoded)}
+    members = {index: [index] for index in range(len(encoded))}
+    if not merges:
+        return alignments[0], members[0]
+
+    if workers <= 1 or len(encoded) < PARALLEL_MIN_SEQUENCES:
+        for left, right, node, _, _ in merges:
+            alignments[node] = align_profiles(alignments.pop(left), alignments.pop(right), matrix, gap_open, gap_extend)
+            members[node] = members.pop(left) + members.pop(right)
+    else:
+        children = {node: (left, right) for left, right, node, _, _ in merges}
+        parents = {child: node for node, pair in children.items() for child in pair}
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+        pending = {}
+
+        def submit(node: int):
+            left, right = children[node]
+            future = pool.submit(
+                align_profiles, alignments.pop(left), alignments.pop(right), matrix, gap_open, gap_extend
+            )
+            members[node] = members.pop(left) + members.pop(right)
+            pending[future] = node
+
+        try:
+            for node, (left, right) in children.items():
+                if left in alignments and right in alignments:
+                    submit(node)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = pending.pop(future)
+                    alignments[node] = future.result()
+                    parent = parents.get(node)
+                    if parent is not None and all(child in alignments for child in children[parent]):
+                        submit(parent)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    root = merges[-1][2]
+    return alignments[root], members[root]
+
+def align_sequences(
+    sequences: Sequence[str],
+    labels: Optional[Sequence[str]] = None,
+    tree: str = "upgma",
+    matrix: str = "BLOSUM62",
+    gap_open: int = 11,
+    gap_extend: int = 1,
+    workers: Optional[int] = None
+) -> Dict:
+    sequences = ["".join(sequence.split()).upper() for sequence in sequences]
+    if len(sequences) < 2:
+        raise ValueError("At least two sequences are required")
+    if not all(sequences):
+        raise ValueError("Sequences cannot be empty")
+    labels = list(labels) if labels is not None else [f"seq{index + 1}" for index in range(len(sequences))]
+
+    alphabet, _ = load_matrix(matrix)
+    sequence_bytes = [sequence.encode("ascii", "replace") for sequence in sequences]
+    merges = guide_tree(kmer_distances(sequences), tree)
+    rows, order = progressive_align(
+        [encode(sequence, alphabet) for sequence in sequences], merges, matrix, gap_open, gap_extend,
+        workers if workers is not None else os.cpu_count() or 1
+    )
+
+    letters = np.frombuffer((alphabet + "-").encode("ascii"), dtype=np.uint8)
+    aligned = np.full_like(rows, ord("-"))
+    for row, index in enumerate(order):
+        aligned[index, rows[row] != len(alphabet)] = np.frombuffer(sequence_bytes[index], dtype=np.uint8)
+    text = [row.tobytes().decode("ascii") for row in aligned]
+
+    counts = profile(rows, len(alphabet)) * len(rows)
+    best = counts.argmax(axis=1)
+    conserved = counts[np.arange(len(best)), best] * 2 >= len(rows)
+    consensus = np.where(conserved, letters[best], ord(".")).astype(np.uint8).tobytes().decode("ascii")
+
+    return {
+        "tree": tree,
+        "newick": newick(merges, labels),
+        "length": rows.shape[1],
+        "consensus": consensus,
+        "sequences": [{"id": label, "aligned": row} for label, row in zip(labels, text)]
+    }
@@ -0,0 +1,137 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from Bio.Data import IUPACData
+from Bio.SeqUtils import ProtParamData
+from Bio.SeqUtils.IsoelectricPoint import positive_pKs, negative_pKs, pKcterminal, pKnterminal
+
+AMINO_ACIDS = IUPACData.protein_letters
+EXTRA_LETTERS = "".join(sorted(set(IUPACData.protein_weights) - set(AMINO_ACIDS)))
+LETTERS = AMINO_ACIDS + EXTRA_LETTERS
+STANDARD = len(AMINO_ACIDS)
+OTHER = len(LETTERS)
+CODES = OTHER + 1
+
+WATER = 18.0153
+BLOCK_RESIDUES = 1_000_000
+PI_LOW, PI_HIGH, PI_START, PI_TOLERANCE = 4.05, 12.0, 7.775, 0.0001
+
+CODE_TABLE = np.full(256, OTHER, dtype=np.uint8)
+for _code, _letter in enumerate(LETTERS):
+    CODE_TABLE[ord(_letter)] = _code
+
+WEIGHTS = np.zeros(CODES)
+WEIGHTS[:OTHER] = [IUPACData.protein_weights[letter] for letter in LETTERS]
+GRAVY = np.array([ProtParamData.kd[letter] for letter in AMINO_ACIDS])
+DIWV = np.zeros((CODES, CODES))
+DIWV[:STANDARD, :STANDARD] = [[ProtParamData.DIWV[first][second] for second in AMINO_ACIDS] for first in AMINO_ACIDS]
+DIWV = DIWV.ravel()
+AROMATIC = [AMINO_ACIDS.index(letter) for letter in "YWF"]
+
+POSITIVE = [AMINO_ACIDS.index(letter) for letter in ("K", "R", "H")]
+NEGATIVE = [AMINO_ACIDS.index(letter) for letter in ("D", "E", "C", "Y")]
+POSITIVE_PK = np.array([positive_pKs[letter] for letter in ("K", "R", "H")])
+NEGATIVE_PK = np.array([negative_pKs[letter] for letter in ("D", "E", "C", "Y")])
+N_TERMINAL_PK = np.full(CODES, positive_pKs["Nterm"])
+C_TERMINAL_PK = np.full(CODES, negative_pKs["Cterm"])
+for _letter, _pk in pKnterminal.items():
+    N_TERMINAL_PK[LETTERS.index(_letter)] = _pk
+for _letter, _pk in pKcterminal.items():
+    C_TERMINAL_PK[LETTERS.index(_letter)] = _pk
+
+PROPERTY_NAMES = (
+    "length", "molecular_weight", "aromaticity", "instability_index", "isoelectric_point", "gravy", "charge_at_ph7"
+)
+
+def clean(sequence: str) -> str:
+    return "".join(sequence.split()).upper()
+
+def encode(sequences: Sequence[str]) -> np.ndarray:
+    return CODE_TABLE[np.frombuffer("".join(sequences).encode("ascii", "replace"), dtype=np.uint8)]
+
+def charge_at_ph(ph: np.ndarray, positive: np.ndarray, negative: np.ndarray,
+                 n_terminal: np.ndarray, c_terminal: np.ndarray) -> np.ndarray:
+    ph = ph[:, None]
+    charge = 1.0 / (10 ** (ph[:, 0] - n_terminal) + 1.0)
+    charge = charge + (positive / (10 ** (ph - POSITIVE_PK) + 1.0)).sum(axis=1)
+    charge = charge - 1.0 / (10 ** (c_terminal - ph[:, 0]) + 1.0)
+    return charge - (negative / (10 ** (NEGATIVE_PK - ph) + 1.0)).sum(axis=1)
+
+def isoelectric_point(positive: np.ndarray, negative: np.ndarray,
+                      n_terminal: np.ndarray, c_terminal: np.ndarray) -> np.ndarray:
+    low = np.full(len(positive), PI_LOW)
+    high = np.full(len(positive), PI_HIGH)
+    ph = np.full(len(positive), PI_START)
+    active = high - low > PI_TOLERANCE
+    while active.any():
+        above = charge_at_ph(ph, positive, negative, n_terminal, c_terminal) > 0.0
+        low = np.where(active & above, ph, low)
+        high = np.where(active & ~above, ph, high)
+        ph = np.where(active, (low + high) / 2, ph)
+        active = high - low > PI_TOLERANCE
+    return ph
+
+def _block(sequences: Sequence[str]) -> Dict[str, np.ndarray]:
+    lengths = np.array([len(sequence) for sequence in sequences], dtype=np.int64)
+    codes = encode(sequences)
+    owner = np.repeat(np.arange(0, len(sequences) * CODES, CODES, dtype=np.int32), lengths)
+    counts = np.bincount(owner + codes, minlength=len(sequences) * CODES).reshape(len(sequences), CODES)
+
+    safe_lengths = np.maximum(lengths, 1)
+    standard = counts[:, :STANDARD].sum(axis=1) == lengths
+    weighable = counts[:, OTHER] == 0
+
+    first = np.zeros(len(sequences), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=first[1:])
+    last = first + safe_lengths - 1
+
+    dipeptides = np.zeros(len(codes))
+    np.cumsum(DIWV[codes[:-1].astype(np.int32) * CODES + codes[1:]], out=dipeptides[1:])
+    instability = dipeptides[np.minimum(last, len(codes) - 1)] - dipeptides[np.minimum(first, len(codes) - 1)] \
+        if len(codes) else np.zeros(len(sequences))
+    n_terminal = N_TERMINAL_PK[codes[np.minimum(first, len(codes) - 1)]] if len(codes) else N_TERMINAL_PK[:0]
+    c_terminal = C_TERMINAL_PK[codes[np.minimum(last, len(codes) - 1)]] if len(codes) else C_TERMINAL_PK[:0]
+    positive = counts[:, POSITIVE].astype(float)
+    negative = counts[:, NEGATIVE].astype(float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = {
+            "length": lengths.astype(float),
+            "molecular_weight": np.where(weighable, counts @ WEIGHTS - (lengths - 1) * WATER, np.nan),
+            "aromaticity": counts[:, AROMATIC].sum(axis=1) / safe_lengths,
+            "instability_index": np.where(standard, 10.0 / safe_lengths * instability, np.nan),
+            "isoelectric_point": isoelectric_point(positive, negative, n_terminal, c_terminal),
+            "gravy": np.where(standard, counts[:, :STANDARD] @ GRAVY / safe_lengths, np.nan),
+            "charge_at_ph7": charge_at_ph(np.full(len(sequences), 7.0), positive, negative, n_terminal, c_terminal)
+        }
+    empty = lengths == 0
+    for name in PROPERTY_NAMES[1:]:
+        values[name][empty] = np.nan
+    return values
+
+def compute(sequences: Sequence[str]) -> Dict[str, np.ndarray]:
+    sequences = [clean(sequence or "") for sequence in sequences]
+    blocks, start, residues = [], 0, 0
+    for end, sequence in enumerate(sequences, start=1):
+        residues += len(sequence)
+        if residues >= BLOCK_RESIDUES or end == len(sequences):
+            blocks.append(_block(sequences[start:end]))
+            start, residues = end, 0
+    if not blocks:
+        return {name: np.empty(0) for name in PROPERTY_NAMES}
+    return {name: np.concatenate([block[name] for block in blocks]) for name in PROPERTY_NAMES}
+
+def properties(sequences: Sequence[str]) -> List[Dict[str, Optional[float]]]:
+    values = compute(sequences)
+    rounding = {
+        "molecular_weight": 2, "aromaticity": 4, "instability_index": 2, "isoelectric_point": 2, "gravy": 4,
+        "charge_at_ph7": 2
+    }
+    columns = {
+        name: [None if np.isnan(value) else round(value, rounding[name]) for value in values[name].tolist()]
+        for name in rounding
+    }
+    lengths = values["length"].astype(int).tolist()
+    return [
+        {"length": length, **{name: columns[name][index] for name in rounding}}
+        for index, length in enumerate(lengths)
+    ]
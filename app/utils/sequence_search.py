@@ -0,0 +1,155 @@
+import math
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from Bio.Align import substitution_matrices
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+KMER_SIZE = 3
+NEIGHBORHOOD_THRESHOLD = 11
+PAD_SCORE = -100
+
+UNGAPPED_LAMBDA = 0.3176
+UNGAPPED_K = 0.134
+
+@lru_cache(maxsize=8)
+def load_matrix(name: str = "BLOSUM62") -> Tuple[str, np.ndarray]:
+    matrix = substitution_matrices.load(name)
+    return matrix.alphabet, np.asarray(matrix, dtype=np.int16)
+
+@lru_cache(maxsize=8)
+def encoding_table(alphabet: str) -> np.ndarray:
+    unknown = alphabet.index("X") if "X" in alphabet else len(alphabet) - 1
+    table = np.full(256, unknown, dtype=np.uint8)
+    for i, letter in enumerate(alphabet):
+        table[ord(letter)] = i
+        table[ord(letter.lower())] = i
+    return table
+
+def encode(sequence: str, alphabet: str) -> np.ndarray:
+    raw = np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    return encoding_table(alphabet)[raw]
+
+def _kmer_positions(sequence: str, k: int = KMER_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = encoding_table(AMINO_ACIDS + "X")[
+        np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    ].astype(np.int32)
+    if len(encoded) < k:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+
+    base = len(AMINO_ACIDS)
+    codes = np.zeros(len(encoded) - k + 1, dtype=np.int32)
+    valid = np.ones(len(codes), dtype=bool)
+    for offset in range(k):
+        window = encoded[offset:offset + len(codes)]
+        codes = codes * base + np.minimum(window, base - 1)
+        valid &= window < base
+    positions = np.nonzero(valid)[0]
+    return codes[positions], positions
+
+def kmer_codes(sequence: str, k: int = KMER_SIZE) -> np.ndarray:
+    return _kmer_positions(sequence, k)[0]
+
+def neighborhood(query: str, threshold: int = NEIGHBORHOOD_THRESHOLD, matrix: str = "BLOSUM62"):
+    alphabet, scores = load_matrix(matrix)
+    standard = np.array([alphabet.index(letter) for letter in AMINO_ACIDS])
+    encoded = encode(query, alphabet)
+    n_words = len(encoded) - KMER_SIZE + 1
+    if n_words <= 0:
+        return np.zeros(len(AMINO_ACIDS) ** KMER_SIZE + 1, dtype=np.int64), np.empty(0, dtype=np.int32)
+
+    rows = scores[:, standard].astype(np.int32)
+    words, positions = [], []
+    for start in range(0, n_words, 512):
+        index = np.arange(start, min(start + 512, n_words))
+        word_scores = (
+            rows[encoded[index]][:, :, None, None]
+            + rows[encoded[index + 1]][:, None, :, None]
+            + rows[encoded[index + 2]][:, None, None, :]
+        ).reshape(len(index), -1)
+        hit_positions, hit_words = np.nonzero(word_scores >= threshold)
+        words.append(hit_words)
+        positions.append(index[hit_positions])
+
+    words = np.concatenate(words)
+    positions = np.concatenate(positions).astype(np.int32)
+    order = np.argsort(words, kind="stable")
+    offsets = np.zeros(len(AMINO_ACIDS) ** KMER_SIZE + 1, dtype=np.int64)
+    np.cumsum(np.bincount(words, minlength=len(AMINO_ACIDS) ** KMER_SIZE), out=offsets[1:])
+    return offsets, positions[order]
+
+def seed_diagonals(subject: str, offsets: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    codes, subject_positions = _kmer_positions(subject)
+    if not len(codes) or not len(positions):
+        return np.empty(0, dtype=np.int64)
+
+    counts = offsets[codes + 1] - offsets[codes]
+    hits = counts > 0
+    if not hits.any():
+        return np.empty(0, dtype=np.int64)
+
+    counts = counts[hits]
+    starts = np.repeat(offsets[codes[hits]] - (np.cumsum(counts) - counts), counts)
+    query_positions = positions[starts + np.arange(counts.sum())]
+    diagonals, seeds = np.unique(
+        np.repeat(subject_positions[hits], counts) - query_positions, return_counts=True
+    )
+    if (seeds >= 2).any():
+        return diagonals[seeds >= 2]
+    return diagonals
+
+def best_ungapped_hsp(
+    query: str,
+    subject: str,
+    diagonals: Optional[np.ndarray] = None,
+    matrix: str = "BLOSUM62"
+) -> Optional[Dict]:
+    alphabet, scores = load_matrix(matrix)
+    q = encode(query, alphabet)
+    s = encode(subject, alphabet)
+    if diagonals is None:
+        diagonals = np.arange(-(len(q) - 1), len(s))
+    if not len(diagonals) or not len(q) or not len(s):
+        return None
+
+    i = np.arange(len(q))
+    j = i[None, :] + diagonals[:, None]
+    inside = (j >= 0) & (j < len(s))
+    lane = np.where(inside, scores[q[None, :], s[np.clip(j, 0, len(s) - 1)]], PAD_SCORE).astype(np.int32)
+
+    prefix = np.zeros((len(diagonals), len(q) + 1), dtype=np.int32)
+    np.cumsum(lane, axis=1, out=prefix[:, 1:])
+    running_min = np.minimum.accumulate(prefix, axis=1)
+    gain = prefix - running_min
+    ends = gain.argmax(axis=1)
+    best = gain[np.arange(len(diagonals)), ends]
+
+    row = int(best.argmax())
+    score = int(best[row])
+    if score <= 0:
+        return None
+
+    end = int(ends[row])
+    start = int(prefix[row, :end + 1].argmin())
+    diagonal = int(diagonals[row])
+    query_segment = query[start:end]
+    subject_segment = subject[start + diagonal:end + diagonal]
+    identities = sum(a == b for a, b in zip(query_segment.upper(), subject_segment.upper()))
+    return {
+        "score": score,
+        "query_start": start + 1,
+        "query_end": end,
+        "subject_start": start + diagonal + 1,
+        "subject_end": end + diagonal,
+        "length": end - start,
+        "identity": identities / (end - start),
+        "query_aligned": query_segment,
+        "subject_aligned": subject_segment
+    }
+
+def bit_score(score: int, lambda_: float = UNGAPPED_LAMBDA, k: float = UNGAPPED_K) -> float:
+    return (lambda_ * score - math.log(k)) / math.log(2)
+
+def evalue(score: int, query_length: int, database_length: int,
+           lambda_: float = UNGAPPED_LAMBDA, k: float = UNGAPPED_K) -> float:
+    return k * query_length * database_length * math.exp(-lambda_ * score)
@@ -0,0 +1,140 @@
+import json
+import os
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MANIFEST = "manifest.json"
+LOCK = "lock"
+FORMAT_VERSION = 1
+GARBAGE_RATIO = 0.5
+
+UPPERCASE = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz", b"ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+WHITESPACE = b" \t\r\n\x0b\x0c"
+
+def pack(sequence: str) -> bytes:
+    return sequence.encode("ascii", "replace").translate(UPPERCASE, WHITESPACE)
+
+def residues_file(generation: int) -> str:
+    return f"residues-{generation}.bin"
+
+def index_file(revision: int) -> str:
+    return f"index-{revision}.npy"
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return None
+
+def write_manifest(directory: str, manifest: Dict[str, Any]):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as out:
+        json.dump(manifest, out)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(path + ".tmp", path)
+
+class SequenceStore:
+    def __init__(self, directory: str, manifest: Dict[str, Any]):
+        self.directory = directory
+        self.manifest = manifest
+        index = np.load(os.path.join(directory, manifest["index"]), mmap_mode="r")
+        self.ids, self.starts, self.ends = index[0], index[1], index[2]
+        size = manifest["residues_bytes"]
+        self.residues = np.memmap(
+            os.path.join(directory, manifest["residues"]), dtype=np.uint8, mode="r", shape=(size,)
+        ) if size else np.empty(0, dtype=np.uint8)
+
+    @classmethod
+    def open(cls, directory: str) -> Optional["SequenceStore"]:
+        manifest = read_manifest(directory)
+        if manifest is None:
+            return None
+        return cls(directory, manifest)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def positions(self, protein_ids: Sequence[int]) -> np.ndarray:
+        protein_ids = np.asarray(protein_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, protein_ids)
+        found = positions < len(self.ids)
+        found[found] = self.ids[positions[found]] == protein_ids[found]
+        return np.where(found, positions, -1)
+
+    def codes(self, position: int) -> np.ndarray:
+        return self.residues[self.starts[position]:self.ends[position]]
+
+    def sequence(self, position: int) -> str:
+        return self.codes(position).tobytes().decode("ascii")
+
+    def sequences(self, positions: Iterable[int]) -> List[str]:
+        return [self.sequence(position) for position in positions]
+
+    def get(self, protein_id: int) -> Optional[str]:
+        position = int(self.positions([protein_id])[0])
+        return self.sequence(position) if position >= 0 else None
+
+    def live_bytes(self) -> int:
+        return int((self.ends - self.starts).sum())
+
+class SequenceStoreWriter:
+    def __init__(self, directory: str, generation: int, offset: int = 0):
+        self.directory = directory
+        self.generation = generation
+        self.offset = offset
+        self.file = open(os.path.join(directory, residues_file(generation)), "ab")
+        self.file.truncate(offset)
+
+    def append(self, rows: Sequence[Tuple[int, str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.append_packed([(protein_id, pack(sequence)) for protein_id, sequence in rows])
+
+    def append_packed(self, rows: Sequence[Tuple[int, bytes]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lengths = np.array([len(data) for _, data in rows], dtype=np.int64)
+        ends = self.offset + np.cumsum(lengths)
+        self.file.write(b"".join(data for _, data in rows))
+        self.offset = int(ends[-1]) if len(ends) else self.offset
+        return np.array([protein_id for protein_id, _ in rows], dtype=np.int64), ends - lengths, ends
+
+    def commit(self, ids: np.ndarray, starts: np.ndarray, ends: np.ndarray, **extra: Any) -> Dict[str, Any]:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        previous = read_manifest(self.directory)
+        revision = previous["revision"] + 1 if previous else 1
+        order = np.argsort(ids, kind="stable")
+        index = np.stack([ids[order], starts[order], ends[order]]).astype("<i8")
+        with open(os.path.join(self.directory, index_file(revision)), "wb") as out:
+            np.save(out, index)
+            out.flush()
+            os.fsync(out.fileno())
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "generation": self.generation,
+            "revision": revision,
+            "residues": residues_file(self.generation),
+            "index": index_file(revision),
+            "residues_bytes": self.offset,
+            "proteins": len(ids),
+            "live_bytes": int((ends - starts).sum()),
+            **extra
+        }
+        write_manifest(self.directory, manifest)
+
+        if previous:
+            remove(self.directory, previous["index"])
+            if previous["generation"] != self.generation:
+                remove(self.directory, previous["residues"])
+        return manifest
+
+    def abort(self):
+        self.file.close()
+
+def remove(directory: str, name: str):
+    try:
+        os.remove(os.path.join(directory, name))
+    except FileNotFoundError:
+        pass
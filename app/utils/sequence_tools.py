@@ -1,61 +1,138 @@
-from Bio import SeqIO
 from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
-from typing import List, Dict
-import io
+from typing import Iterable, Iterator, List, Dict, Mapping, Optional, Sequence
+import hashlib
+import numpy as np
+from app.utils import alignment, fasta, msa
+from app.utils.motifs import AhoCorasick, MotifScanner, load_library
 
 class SequenceTools:
     @staticmethod
-    def to_fasta(proteins: List[Dict]) -> str:
-        fasta_records = []
+    def normalize_sequence(sequence: str) -> str:
+        return "".join(sequence.split()).upper()
 
-        for protein in proteins:
-            header = f">{protein.get('uniprot_id', 'UNKNOWN')}|{protein.get('name', 'Unknown')}"
-            if protein.get('organism'):
-                header += f"|{protein['organism']}"
-
-            sequence = protein.get('sequence', '')
-            fasta_records.append(f"{header}\n{sequence}")
+    @staticmethod
+    def sequence_hash(sequence: Optional[str]) -> Optional[str]:
+        if not sequence:
+            return None
+        return hashlib.sha256(SequenceTools.normalize_sequence(sequence).encode("utf-8")).hexdigest()
 
-        return "\n".join(fasta_records)
+    @staticmethod
+    def fasta_header(protein: Mapping) -> str:
+        header = f"{protein.get('uniprot_id', 'UNKNOWN')}|{protein.get('name', 'Unknown')}"
+        if protein.get('organism'):
+            header += f"|{protein['organism']}"
+        return header
 
     @staticmethod
-    def from_fasta(fasta_content: str) -> List[Dict]:
-        proteins = []
+    def iter_fasta(
+        proteins: Iterable[Mapping],
+        width: int = fasta.LINE_WIDTH,
+        batch_size: int = 500
+    ) -> Iterator[str]:
+        return fasta.iter_fasta(
+            ((SequenceTools.fasta_header(protein), protein.get('sequence') or '') for protein in proteins),
+            width,
+            batch_size
+        )
 
-        fasta_io = io.StringIO(fasta_content)
+    @staticmethod
+    def to_fasta(proteins: List[Dict], width: int = fasta.LINE_WIDTH) -> str:
+        return "".join(SequenceTools.iter_fasta(proteins, width))
 
-        for record in SeqIO.parse(fasta_io, "fasta"):
-            protein = {
-                "name": record.id,
-                "sequence": str(record.seq),
-                "description": record.description
+    @staticmethod
+    def read_fasta(source: fasta.Source) -> Iterator[Dict]:
+        for title, sequence in fasta.read_fasta(source):
+            yield {
+                "name": title.split(None, 1)[0] if title.strip() else "",
+                "sequence": sequence,
+                "description": title
             }
-            proteins.append(protein)
 
-        return proteins
+    @staticmethod
+    def from_fasta(fasta_content: str) -> List[Dict]:
+        return list(SequenceTools.read_fasta(fasta_content.encode("utf-8")))
 
     @staticmethod
     def calculate_similarity(seq1: str, seq2: str) -> float:
-        if len(seq1) != len(seq2):
+        if not seq1 or not seq2:
             return 0.0
 
-        matches = sum(a == b for a, b in zip(seq1, seq2))
-        return matches / len(seq1)
+        return alignment.similarity(seq1.upper(), seq2.upper())
 
     @staticmethod
-    def find_motif(sequence: str, motif: str) -> List[int]:
-        positions = []
-        start = 0
+    def align(
+        query: str,
+        subject: str,
+        mode: str = "local",
+        matrix: str = "BLOSUM62",
+        gap_open: int = 11,
+        gap_extend: int = 1
+    ) -> Dict:
+        return alignment.align(
+            query.upper(), subject.upper(), mode=mode, matrix=matrix, gap_open=gap_open, gap_extend=gap_extend
+        )
 
-        while True:
-            pos = sequence.find(motif, start)
-            if pos == -1:
-                break
-            positions.append(pos)
-            start = pos + 1
+    @staticmethod
+    def score_alignments(
+        query: str,
+        subjects: Sequence[str],
+        mode: str = "local",
+        matrix: str = "BLOSUM62",
+        gap_open: int = 11,
+        gap_extend: int = 1
+    ) -> np.ndarray:
+        return alignment.score_many(
+            query.upper(), [subject.upper() for subject in subjects],
+            mode=mode, matrix=matrix, gap_open=gap_open, gap_extend=gap_extend
+        )
+
+    @staticmethod
+    def align_many(
+        query: str,
+        subjects: Sequence[str],
+        mode: str = "local",
+        matrix: str = "BLOSUM62",
+        gap_open: int = 11,
+        gap_extend: int = 1,
+        top: Optional[int] = None
+    ) -> List[Dict]:
+        return alignment.align_many(
+            query.upper(), [subject.upper() for subject in subjects],
+            mode=mode, matrix=matrix, gap_open=gap_open, gap_extend=gap_extend, top=top
+        )
+
+    @staticmethod
+    def align_multiple(
+        sequences: Sequence[str],
+        labels: Optional[Sequence[str]] = None,
+        tree: str = "upgma",
+        matrix: str = "BLOSUM62",
+        gap_open: int = 11,
+        gap_extend: int = 1,
+        workers: Optional[int] = None
+    ) -> Dict:
+        return msa.align_sequences(
+            sequences, labels, tree=tree, matrix=matrix, gap_open=gap_open, gap_extend=gap_extend, workers=workers
+        )
 
-        return positions
+    @staticmethod
+    def find_motif(sequence: str, motif: str) -> List[int]:
+        if not motif:
+            return []
+        return [start for start, _ in AhoCorasick([motif]).iter_matches(sequence)]
+
+    @staticmethod
+    def find_motifs(
+        sequence: str,
+        patterns: Optional[Mapping[str, str]] = None,
+        include_library: bool = True,
+        library_path: Optional[str] = None
+    ) -> List[Dict]:
+        hits = load_library(library_path).scan(sequence) if include_library else []
+        if patterns:
+            hits.extend(MotifScanner.from_patterns(patterns).scan(sequence))
+        hits.sort(key=lambda hit: (hit["start"], hit["end"], hit["pattern"]))
+        return hits
 
     @staticmethod
     def translate_dna_to_protein(dna_sequence: str) -> str:
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def iter_ndjson(rows: Iterable[Any], fields: Sequence[str], batch_size: int = 500) -> Iterator[str]:
+    buffer = []
+    for row in rows:
+        record = {field: getattr(row, field) for field in fields}
+        buffer.append(json.dumps(record, default=_json_default, separators=(",", ":")))
+        if len(buffer) >= batch_size:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+def iter_csv(rows: Iterable[Any], fields: Sequence[str], batch_size: int = 500) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(getattr(row, field)) for field in fields])
+        count += 1
+        if count >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            count = 0
+
+    yield buffer.getvalue()
@@ -1,10 +1,13 @@
 import re
-from typing import List, Dict, Tuple
+import pandas as pd
+from typing import List, Dict, Sequence, Tuple
 from Bio.Seq import Seq
-from Bio.SeqUtils.ProtParam import ProteinAnalysis
+from app.utils import sequence_properties
 
 class ProteinValidator:
     VALID_AMINO_ACIDS = set("ACDEFGHIKLMNPQRSTVWY")
+    UNIPROT_ID_PATTERN = r'^[OPQ][0-9][A-Z0-9]{3}[0-9]|[A-NR-Z][0-9]([A-Z][A-Z0-9]{2}[0-9]){1,2}$'
+    REQUIRED_COLUMNS = ("name", "sequence")
 
     @staticmethod
     def validate_sequence(sequence: str) -> Tuple[bool, List[str]]:
@@ -36,12 +39,66 @@ class ProteinValidator:
             errors.append("UniProt ID cannot be empty")
             return False, errors
 
-        pattern = r'^[OPQ][0-9][A-Z0-9]{3}[0-9]|[A-NR-Z][0-9]([A-Z][A-Z0-9]{2}[0-9]){1,2}$'
-        if not re.match(pattern, uniprot_id):
+        if not re.match(ProteinValidator.UNIPROT_ID_PATTERN, uniprot_id):
             errors.append("Invalid UniProt ID format")
 
         return len(errors) == 0, errors
 
+    @staticmethod
+    def validate_dataframe(
+        df: pd.DataFrame,
+        validate_sequences: bool = True,
+        validate_uniprot: bool = False,
+        row_offset: int = 0
+    ) -> Tuple[pd.DataFrame, List[Dict], List[Dict]]:
+        errors = []
+        warnings = []
+
+        missing = [column for column in ProteinValidator.REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            errors.append({"row": None, "error": f"Missing required columns: {', '.join(missing)}"})
+            return df.iloc[0:0], errors, warnings
+
+        df = df.copy()
+        df["sequence"] = (
+            df["sequence"].fillna("").astype(str).str.upper().str.replace(r"\s+", "", regex=True)
+        )
+        df["name"] = df["name"].where(df["name"].notna(), "").astype(str).str.strip()
+
+        invalid = pd.Series("", index=df.index)
+        invalid = invalid.mask(df["name"] == "", "Name cannot be empty")
+        invalid = invalid.mask((invalid == "") & (df["sequence"] == ""), "Sequence cannot be empty")
+
+        if validate_sequences:
+            lengths = df["sequence"].str.len()
+            bad_chars = df["sequence"].str.contains(r"[^ACDEFGHIKLMNPQRSTVWY]", regex=True)
+            invalid = invalid.mask((invalid == "") & bad_chars, "Invalid amino acids in sequence")
+            invalid = invalid.mask((invalid == "") & (lengths < 10), "Sequence too short (minimum 10 amino acids)")
+            invalid = invalid.mask((invalid == "") & (lengths > 50000), "Sequence too long (maximum 50,000 amino acids)")
+
+        if "uniprot_id" in df.columns:
+            uniprot = df["uniprot_id"].where(df["uniprot_id"].notna(), None)
+            df["uniprot_id"] = uniprot.map(lambda value: str(value).strip() if value is not None else None)
+            if validate_uniprot:
+                has_id = df["uniprot_id"].notna()
+                well_formed = df["uniprot_id"].fillna("").str.match(ProteinValidator.UNIPROT_ID_PATTERN)
+                invalid = invalid.mask((invalid == "") & has_id & ~well_formed, "Invalid UniProt ID format")
+            duplicated = df["uniprot_id"].notna() & df["uniprot_id"].duplicated(keep="first")
+            invalid = invalid.mask((invalid == "") & duplicated, "Duplicate UniProt ID in file")
+
+        for column in ("organism", "uniprot_id"):
+            if column in df.columns:
+                missing_values = df[column].isna() & (invalid == "")
+            else:
+                missing_values = invalid == ""
+            for index in df.index[missing_values]:
+                warnings.append({"row": int(index) + row_offset, "warning": f"Missing {column}"})
+
+        for index, message in invalid[invalid != ""].items():
+            errors.append({"row": int(index) + row_offset, "error": message})
+
+        return df[invalid == ""], errors, warnings
+
     @staticmethod
     def calculate_quality_score(protein_data: Dict) -> float:
         score = 0.0
@@ -81,24 +138,18 @@ class ProteinValidator:
 
     @staticmethod
     def calculate_sequence_properties(sequence: str) -> Dict:
-        try:
-            clean_seq = sequence.upper().replace(" ", "").replace("\n", "")
-            analyzer = ProteinAnalysis(clean_seq)
-
-            return {
-                "length": len(clean_seq),
-                "molecular_weight": round(analyzer.molecular_weight(), 2),
-                "aromaticity": round(analyzer.aromaticity(), 4),
-                "instability_index": round(analyzer.instability_index(), 2),
-                "isoelectric_point": round(analyzer.isoelectric_point(), 2),
-                "gravy": round(analyzer.gravy(), 4)
-            }
-        except:
+        if not sequence or not sequence.strip():
             return {}
+        return sequence_properties.properties([sequence])[0]
+
+    @staticmethod
+    def calculate_properties_batch(sequences: Sequence[str]) -> List[Dict]:
+        return sequence_properties.properties(sequences)
 
     @staticmethod
     def detect_duplicates(db, sequence: str, threshold: float = 0.95) -> List[Dict]:
-        return []
+        from app.services.duplicate_service import DuplicateService
+        return DuplicateService.find_duplicates(db, sequence, threshold)
 
     @staticmethod
     def check_completeness(protein_data: Dict) -> Dict[str, bool]:
@@ -0,0 +1,310 @@
+import os
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.utils.sequence_store import read_manifest, write_manifest, remove
+
+FORMAT_VERSION = 1
+MAX_LISTS = 4096
+TRAINING_POINTS_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+CHUNK_ROWS = 8192
+SEED = 20240601
+BUILD_LOCK = "build.lock"
+RADIUS_SLACK = 1e-3
+
+def vectors_file(generation: int) -> str:
+    return f"vectors-{generation}.f32"
+
+def ids_file(generation: int) -> str:
+    return f"ids-{generation}.i64"
+
+def dead_file(generation: int) -> str:
+    return f"dead-{generation}.u8"
+
+def centroids_file(generation: int) -> str:
+    return f"centroids-{generation}.npy"
+
+def offsets_file(generation: int) -> str:
+    return f"offsets-{generation}.npy"
+
+def lookup_file(generation: int) -> str:
+    return f"lookup-{generation}.npy"
+
+def tail_file(revision: int) -> str:
+    return f"tail-{revision}.npy"
+
+def list_count(rows: int) -> int:
+    return int(min(max(round(np.sqrt(rows)), 1), MAX_LISTS))
+
+def squared_distances(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    distances = (vectors * vectors).sum(axis=1)[:, None] - 2 * vectors @ centroids.T
+    distances += (centroids * centroids).sum(axis=1)[None, :]
+    return np.maximum(distances, 0)
+
+def nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), CHUNK_ROWS):
+        chunk = np.asarray(vectors[start:start + CHUNK_ROWS], dtype=np.float32)
+        labels[start:start + len(chunk)] = squared_distances(chunk, centroids).argmin(axis=1)
+    return labels
+
+def kmeans(sample: np.ndarray, clusters: int, iterations: int = KMEANS_ITERATIONS, seed: int = SEED) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), clusters, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        labels = nearest(sample, centroids)
+        order = np.argsort(labels, kind="stable")
+        present, starts = np.unique(labels[order], return_index=True)
+        sums = np.add.reduceat(sample[order].astype(np.float64), starts, axis=0)
+        counts = np.diff(np.append(starts, len(order)))
+        centroids[present] = (sums / counts[:, None]).astype(np.float32)
+    return centroids
+
+class VectorIndex:
+    def __init__(self, directory: str, manifest: Dict[str, Any]):
+        self.directory = directory
+        self.manifest = manifest
+        rows, dimensions = manifest["rows"], manifest["dimensions"]
+        generation = manifest["generation"]
+        self.vectors = np.memmap(
+            os.path.join(directory, vectors_file(generation)), dtype="<f4", mode="r", shape=(rows, dimensions)
+        ) if rows else np.empty((0, dimensions), dtype=np.float32)
+        self.ids = np.memmap(
+            os.path.join(directory, ids_file(generation)), dtype="<i8", mode="r", shape=(rows,)
+        ) if rows else np.empty(0, dtype=np.int64)
+        self.dead = np.memmap(
+            os.path.join(directory, dead_file(generation)), dtype=np.uint8, mode="r", shape=(rows,)
+        ) if rows else np.empty(0, dtype=np.uint8)
+        self.centroids = np.load(os.path.join(directory, centroids_file(generation)))
+        self.offsets = np.load(os.path.join(directory, offsets_file(generation)))
+        self.lookup = np.load(os.path.join(directory, lookup_file(generation)), mmap_mode="r")
+        self.tail = np.load(os.path.join(directory, manifest["tail"]), mmap_mode="r")
+        self.main_rows = manifest["main_rows"]
+
+    @classmethod
+    def open(cls, directory: str) -> Optional["VectorIndex"]:
+        manifest = read_manifest(directory)
+        if manifest is None:
+            return None
+        return cls(directory, manifest)
+
+    def __len__(self) -> int:
+        return self.manifest["rows"] - self.manifest["dead"]
+
+    def rows_of(self, protein_ids: Sequence[int]) -> np.ndarray:
+        protein_ids = np.asarray(protein_ids, dtype=np.int64)
+        rows = np.full(len(protein_ids), -1, dtype=np.int64)
+        lookup_ids, lookup_rows = self.lookup[0], self.lookup[1]
+        positions = np.minimum(np.searchsorted(lookup_ids, protein_ids), max(len(lookup_ids) - 1, 0))
+        if len(lookup_ids):
+            found = lookup_ids[positions] == protein_ids
+            rows[found] = lookup_rows[positions[found]]
+
+        tail_ids = np.asarray(self.ids[self.main_rows:])
+        if len(tail_ids):
+            order = np.lexsort((-np.arange(len(tail_ids)), tail_ids))
+            latest, first = np.unique(tail_ids[order], return_index=True)
+            positions = np.minimum(np.searchsorted(latest, protein_ids), len(latest) - 1)
+            found = latest[positions] == protein_ids
+            rows[found] = self.main_rows + order[first[positions[found]]]
+
+        alive = rows >= 0
+        alive[alive] = self.dead[rows[alive]] == 0
+        return np.where(alive, rows, -1)
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 10,
+        probes: int = 16,
+        exclude: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        ids, distances = self.search_many(
+            np.asarray(vector, dtype=np.float32)[None, :], k, probes, None if exclude is None else [exclude]
+        )
+        found = ids[0] >= 0
+        return ids[0][found], distances[0][found]
+
+    def search_many(
+        self,
+        vectors: np.ndarray,
+        k: int = 10,
+        probes: int = 16,
+        exclude: Optional[Sequence[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        count = len(vectors)
+        probes = min(probes, len(self.centroids))
+        candidate_ids = np.full((count, probes * k), -1, dtype=np.int64)
+        candidate_distances = np.full((count, probes * k), np.inf, dtype=np.float32)
+        candidate_rows = np.zeros((count, probes * k), dtype=np.int64)
+
+        for queries, slots, rows, ids, distances in self._probe(vectors, probes, exclude):
+            width = min(k, len(rows))
+            best = np.argpartition(distances, width - 1, axis=1)[:, :width] if width < len(rows) \
+                else np.broadcast_to(np.arange(len(rows)), (len(queries), len(rows)))
+            columns = slots[:, None] * k + np.arange(width)
+            candidate_ids[queries[:, None], columns] = ids[best]
+            candidate_rows[queries[:, None], columns] = rows[best]
+            candidate_distances[queries[:, None], columns] = np.take_along_axis(distances, best, axis=1)
+
+        candidate_ids[~np.isfinite(candidate_distances)] = -1
+        result_ids = np.full((count, k), -1, dtype=np.int64)
+        result_distances = np.full((count, k), np.inf)
+        for query in range(count):
+            found = candidate_ids[query] >= 0
+            ids, distances = candidate_ids[query][found], candidate_distances[query][found]
+            rows = candidate_rows[query][found]
+            order = np.lexsort((ids, distances))
+            ids, first = np.unique(ids[order], return_index=True)
+            distances, rows = distances[order][first], rows[order][first]
+            order = np.lexsort((ids, distances))[:k]
+            ids, rows = ids[order], rows[order]
+            exact = np.sqrt(((np.asarray(self.vectors[rows], dtype=np.float64) - vectors[query]) ** 2).sum(axis=1))
+            order = np.lexsort((ids, exact))
+            result_ids[query, :len(order)] = ids[order]
+            result_distances[query, :len(order)] = exact[order]
+        return result_ids, result_distances
+
+    def within(
+        self,
+        vectors: np.ndarray,
+        radii: np.ndarray,
+        probes: int = 16,
+        exclude: Optional[Sequence[int]] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        bounds = np.where(radii >= 0, (radii * (1 + RADIUS_SLACK) + RADIUS_SLACK) ** 2, -1)
+        found = [[] for _ in range(len(vectors))]
+        for queries, _, rows, _, distances in self._probe(vectors, min(probes, len(self.centroids)), exclude):
+            for query, column in zip(*np.nonzero(np.isfinite(distances) & (distances <= bounds[rows][None, :]))):
+                found[queries[query]].append(rows[column])
+
+        matches = []
+        for query, rows in enumerate(found):
+            rows = np.unique(np.array(rows, dtype=np.int64))
+            exact = np.sqrt(((np.asarray(self.vectors[rows], dtype=np.float64) - vectors[query]) ** 2).sum(axis=1))
+            inside = exact <= radii[rows]
+            matches.append((np.asarray(self.ids[rows[inside]]), exact[inside]))
+        return matches
+
+    def _probe(
+        self, vectors: np.ndarray, probes: int, exclude: Optional[Sequence[int]]
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        exclude = np.full(len(vectors), -1, dtype=np.int64) if exclude is None else np.asarray(exclude, dtype=np.int64)
+        lists = np.argsort(squared_distances(vectors, self.centroids), axis=1, kind="stable")[:, :probes]
+        flat = lists.ravel()
+        order = np.argsort(flat, kind="stable")
+        labels, starts = np.unique(flat[order], return_index=True)
+        tail_lists, tail_rows = self.tail[0], self.tail[1]
+        for label, start, end in zip(labels.tolist(), starts.tolist(), np.append(starts[1:], len(order)).tolist()):
+            queries, slots = np.divmod(order[start:end], probes)
+            tail = tail_rows[np.searchsorted(tail_lists, label):np.searchsorted(tail_lists, label, side="right")]
+            rows = np.concatenate([np.arange(self.offsets[label], self.offsets[label + 1]), np.sort(tail)])
+            rows = rows[np.asarray(self.dead[rows]) == 0]
+            if not len(rows):
+                continue
+
+            ids = np.asarray(self.ids[rows])
+            distances = squared_distances(vectors[queries], np.asarray(self.vectors[rows]))
+            distances[ids[None, :] == exclude[queries][:, None]] = np.inf
+            yield queries, slots, rows, ids, distances
+
+class VectorIndexWriter:
+    def __init__(self, directory: str, generation: int, dimensions: int, rows: int = 0):
+        self.directory = directory
+        self.generation = generation
+        self.dimensions = dimensions
+        self.rows = rows
+        self.files = []
+        for name, width in ((vectors_file(generation), 4 * dimensions), (ids_file(generation), 8), (dead_file(generation), 1)):
+            handle = open(os.path.join(directory, name), "ab")
+            handle.truncate(rows * width)
+            self.files.append(handle)
+
+    def append(self, ids: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        vectors_out, ids_out, dead_out = self.files
+        vectors_out.write(np.ascontiguousarray(vectors, dtype="<f4").tobytes())
+        ids_out.write(np.asarray(ids, dtype="<i8").tobytes())
+        dead_out.write(bytes(len(ids)))
+        rows = np.arange(self.rows, self.rows + len(ids), dtype=np.int64)
+        self.rows += len(ids)
+        return rows
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray, **extra: Any) -> Dict[str, Any]:
+        self.prepare(ids, vectors)
+        return self.commit(np.empty((2, 0), dtype=np.int64), main_rows=len(ids), dead=0, **extra)
+
+    def prepare(self, ids: np.ndarray, vectors: np.ndarray):
+        lists = list_count(len(ids))
+        if len(ids):
+            rng = np.random.default_rng(SEED)
+            sample = np.sort(rng.choice(len(ids), min(len(ids), lists * TRAINING_POINTS_PER_LIST), replace=False))
+            centroids = kmeans(np.asarray(vectors[sample], dtype=np.float32), lists)
+            labels = nearest(vectors, centroids)
+        else:
+            centroids = np.zeros((1, self.dimensions), dtype=np.float32)
+            labels = np.empty(0, dtype=np.int64)
+
+        order = np.argsort(labels, kind="stable")
+        for start in range(0, len(order), CHUNK_ROWS):
+            chunk = order[start:start + CHUNK_ROWS]
+            self.append(ids[chunk], np.asarray(vectors[chunk]))
+
+        sorted_ids = ids[order]
+        by_id = np.argsort(sorted_ids, kind="stable")
+        self.save(centroids_file(self.generation), centroids)
+        self.save(offsets_file(self.generation), np.searchsorted(labels[order], np.arange(len(centroids) + 1)))
+        self.save(lookup_file(self.generation), np.stack([sorted_ids[by_id], by_id]).astype("<i8"))
+
+    def save(self, name: str, array: np.ndarray):
+        with open(os.path.join(self.directory, name), "wb") as out:
+            np.save(out, array)
+            out.flush()
+            os.fsync(out.fileno())
+
+    def commit(self, tail: np.ndarray, main_rows: int, dead: int, **extra: Any) -> Dict[str, Any]:
+        for handle in self.files:
+            handle.flush()
+            os.fsync(handle.fileno())
+            handle.close()
+
+        previous = read_manifest(self.directory)
+        revision = previous["revision"] + 1 if previous else 1
+        self.save(tail_file(revision), tail.astype("<i8"))
+        manifest = {
+            "format": FORMAT_VERSION,
+            "generation": self.generation,
+            "revision": revision,
+            "dimensions": self.dimensions,
+            "rows": self.rows,
+            "main_rows": main_rows,
+            "dead": dead,
+            "tail": tail_file(revision),
+            **extra
+        }
+        write_manifest(self.directory, manifest)
+
+        if previous:
+            remove(self.directory, previous["tail"])
+            if previous["generation"] != self.generation:
+                for name in (vectors_file, ids_file, dead_file, centroids_file, offsets_file, lookup_file):
+                    remove(self.directory, name(previous["generation"]))
+        return manifest
+
+    def abort(self):
+        for handle in self.files:
+            handle.close()
+
+def mark_dead(directory: str, manifest: Dict[str, Any], rows: np.ndarray):
+    if not len(rows):
+        return
+    dead = np.memmap(
+        os.path.join(directory, dead_file(manifest["generation"])), dtype=np.uint8, mode="r+", shape=(manifest["rows"],)
+    )
+    dead[rows] = 1
+    dead.flush()
+
+def merge_tail(tail: np.ndarray, labels: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    merged = np.concatenate([np.asarray(tail, dtype=np.int64), np.stack([labels, rows]).astype(np.int64)], axis=1)
+    return merged[:, np.argsort(merged[0], kind="stable")]
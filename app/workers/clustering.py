@@ -0,0 +1,26 @@
+import numpy as np
+from typing import Any, Dict, Optional
+from app.utils.clustering import BAND_WIDTH, banded_identity, best_diagonal, encode_sequence, words
+from app.utils.sequence_store import SequenceStore
+
+_store: Optional[SequenceStore] = None
+_word_size: int = 5
+_band: int = BAND_WIDTH
+
+def init_worker(directory: str, manifest: Dict[str, Any], word_size: int, band: int = BAND_WIDTH):
+    global _store, _word_size, _band
+    _store = SequenceStore(directory, manifest)
+    _word_size = word_size
+    _band = band
+
+def pair_identities(queries: np.ndarray, subjects: np.ndarray) -> np.ndarray:
+    positions = np.unique(np.concatenate([queries, subjects])).tolist()
+    sequences = dict(zip(positions, _store.sequences(positions)))
+    encoded = {position: encode_sequence(sequence) for position, sequence in sequences.items()}
+    found = {position: words(sequence, _word_size) for position, sequence in sequences.items()}
+
+    queries, subjects = queries.tolist(), subjects.tolist()
+    diagonals = [best_diagonal(found[query], found[subject]) for query, subject in zip(queries, subjects)]
+    return banded_identity(
+        [encoded[query] for query in queries], [encoded[subject] for subject in subjects], diagonals, _band
+    )
@@ -0,0 +1,306 @@
+import json
+import os
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import select, update, func
+from typing import Any, Callable, Dict, Optional
+from app.core.cache import invalidate_tags
+from app.core.config import get_settings
+from app.models.import_job import ImportStatus
+from app.models.protein import Protein
+from app.schemas.protein import ProteinSearch, PROTEIN_FIELDS, parse_protein_fields, ProteinView
+from app.services.import_service import ImportService
+from app.services.cluster_service import ClusterService
+from app.services.duplicate_service import DuplicateService
+from app.services.job_service import JobContext, JobService
+from app.services.kmer_spectrum_service import KmerSpectrumService
+from app.services.motif_scan_service import MotifScanService
+from app.services.protein_neighbor_service import ProteinNeighborService
+from app.services.protein_service import ProteinService
+from app.services.sequence_search_service import SequenceSearchService
+from app.services.sequence_store_service import SequenceStoreService
+from app.services.vector_index_service import VectorIndexService
+from app.utils.sequence_tools import SequenceTools
+from app.utils.streaming import iter_ndjson, iter_csv
+from app.utils.validators import ProteinValidator
+
+settings = get_settings()
+
+JobHandler = Callable[[Session, JobContext], Optional[Dict[str, Any]]]
+
+HANDLERS: Dict[str, JobHandler] = {}
+
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "ndjson": ("ndjson", "application/x-ndjson"),
+    "fasta": ("fasta", "text/plain"),
+}
+
+def job_handler(kind: str):
+    def decorator(func: JobHandler) -> JobHandler:
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+def job_path(*parts: str) -> str:
+    path = os.path.join(settings.job_storage_dir, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def _iter_fasta(rows, batch_size: int = 500):
+    proteins = (
+        {
+            "uniprot_id": row.uniprot_id or "UNKNOWN",
+            "name": row.name,
+            "organism": row.organism,
+            "sequence": row.sequence
+        }
+        for row in rows
+    )
+    return SequenceTools.iter_fasta(proteins, batch_size=batch_size)
+
+def _counted(rows, context: JobContext, total: int, every: int = 5000):
+    for count, row in enumerate(rows, start=1):
+        yield row
+        if count % every == 0:
+            context.progress(count / total if total else None, f"{count} of {total} proteins")
+
+@job_handler("import")
+def run_import(db: Session, context: JobContext) -> Dict[str, Any]:
+    path = context.params["path"]
+    try:
+        job = ImportService.run_import(
+            db,
+            context.params["import_job_id"],
+            path,
+            chunk_size=context.params.get("chunk_size", settings.import_chunk_size),
+            context=context
+        )
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+    if job is None:
+        raise ValueError("Import job not found")
+    if job.status == ImportStatus.FAILED:
+        raise RuntimeError(job.errors[-1]["error"] if job.errors else "Import failed")
+    if job.rows_imported:
+        JobService.enqueue(db, "sequence_index", {"full": False})
+        JobService.enqueue(db, "sequence_store", {"full": False})
+        JobService.enqueue(db, "kmer_spectrum", {"full": False})
+        JobService.enqueue(db, "vector_index", {"full": False})
+
+    return {
+        "import_job_id": job.id,
+        "rows_total": job.rows_total,
+        "rows_imported": job.rows_imported,
+        "rows_failed": job.rows_failed,
+        "rows_per_second": job.rows_per_second
+    }
+
+@job_handler("export")
+def run_export(db: Session, context: JobContext) -> Dict[str, Any]:
+    output_format = context.params.get("format", "csv")
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {output_format}")
+
+    search = ProteinSearch(**context.params.get("search", {}))
+    fields = context.params.get("fields")
+    selected_fields = parse_protein_fields(",".join(fields) if fields else None, ProteinView.FULL)
+    if output_format == "fasta":
+        selected_fields = PROTEIN_FIELDS
+
+    total = db.scalar(
+        ProteinService.apply_search(select(func.count(Protein.id)), search)
+    )
+    rows = _counted(
+        ProteinService.stream_proteins(db, search=search, fields=selected_fields), context, total
+    )
+
+    if output_format == "csv":
+        chunks = iter_csv(rows, selected_fields)
+    elif output_format == "ndjson":
+        chunks = iter_ndjson(rows, selected_fields)
+    else:
+        chunks = _iter_fasta(rows)
+
+    extension, media_type = EXPORT_FORMATS[output_format]
+    path = job_path("exports", f"job-{context.job_id}.{extension}")
+    with open(path, "w", encoding="utf-8") as out:
+        for chunk in chunks:
+            out.write(chunk)
+
+    return {
+        "path": path,
+        "filename": f"proteins_export.{extension}",
+        "media_type": media_type,
+        "rows": total,
+        "size": os.path.getsize(path)
+    }
+
+@job_handler("quality_scan")
+def run_quality_scan(db: Session, context: JobContext) -> Dict[str, Any]:
+    batch_size = context.params.get("batch_size", 1000)
+    total = db.scalar(select(func.count(Protein.id)))
+    columns = [
+        Protein.id, Protein.uniprot_id, Protein.name, Protein.sequence, Protein.organism, Protein.function,
+        Protein.gene_name, Protein.protein_family, Protein.pdb_id, Protein.ec_number, Protein.quality_score
+    ]
+
+    scanned = 0
+    updated = 0
+    score_sum = 0.0
+    last_id = 0
+    while True:
+        proteins = db.scalars(
+            select(Protein).options(load_only(*columns, Protein.updated_at))
+            .filter(Protein.id > last_id).order_by(Protein.id).limit(batch_size)
+        ).all()
+        if not proteins:
+            break
+
+        changes = []
+        for protein in proteins:
+            score = ProteinValidator.calculate_quality_score(
+                {column.key: getattr(protein, column.key) for column in columns}
+            )
+            score_sum += score
+            if protein.quality_score != score:
+                changes.append({"id": protein.id, "quality_score": score, "updated_at": protein.updated_at})
+
+        if changes:
+            db.execute(update(Protein), changes)
+            db.commit()
+            updated += len(changes)
+            invalidate_tags(*ProteinService.bulk_cache_tags([change["id"] for change in changes]))
+
+        scanned += len(proteins)
+        last_id = proteins[-1].id
+        db.expunge_all()
+        context.progress(scanned / total if total else None, f"{scanned} of {total} proteins scanned")
+
+    return {
+        "scanned": scanned,
+        "updated": updated,
+        "average_score": score_sum / scanned if scanned else None
+    }
+
+@job_handler("sequence_index")
+def run_sequence_index(db: Session, context: JobContext) -> Dict[str, Any]:
+    state = SequenceSearchService.build_index(db, full=context.params.get("full", False), context=context)
+    return {
+        "generation": state.generation,
+        "blocks": state.block_count,
+        "proteins": state.protein_count,
+        "residues": state.residue_count,
+        "max_protein_id": state.max_protein_id
+    }
+
+@job_handler("kmer_spectrum")
+def run_kmer_spectrum(db: Session, context: JobContext) -> Dict[str, Any]:
+    state = KmerSpectrumService.build_index(db, full=context.params.get("full", False), context=context)
+    return {
+        "generation": state.generation,
+        "blocks": state.block_count,
+        "proteins": state.protein_count,
+        "max_protein_id": state.max_protein_id
+    }
+
+@job_handler("sequence_hash_backfill")
+def run_sequence_hash_backfill(db: Session, context: JobContext) -> Dict[str, Any]:
+    updated = ProteinService.backfill_sequence_hashes(
+        db, batch_size=context.params.get("batch_size", 10000), context=context
+    )
+    return {"updated": updated}
+
+@job_handler("property_backfill")
+def run_property_backfill(db: Session, context: JobContext) -> Dict[str, Any]:
+    updated = ProteinService.backfill_properties(
+        db, batch_size=context.params.get("batch_size", 5000), context=context
+    )
+    return {"updated": updated}
+
+@job_handler("sequence_store")
+def run_sequence_store(db: Session, context: JobContext) -> Dict[str, Any]:
+    manifest = SequenceStoreService.sync(db, full=context.params.get("full", False), context=context)
+    return {
+        "generation": manifest["generation"],
+        "proteins": manifest["proteins"],
+        "residues": manifest["live_bytes"],
+        "file_bytes": manifest["residues_bytes"],
+        "max_protein_id": manifest["max_protein_id"]
+    }
+
+@job_handler("vector_index")
+def run_vector_index(db: Session, context: JobContext) -> Dict[str, Any]:
+    manifest = VectorIndexService.sync(db, full=context.params.get("full", False), context=context)
+    return {
+        "generation": manifest["generation"],
+        "vectors": manifest["rows"] - manifest["dead"],
+        "indexed_rows": manifest["main_rows"],
+        "pending_rows": manifest["rows"] - manifest["main_rows"],
+        "max_protein_id": manifest["max_protein_id"]
+    }
+
+@job_handler("protein_neighbors")
+def run_protein_neighbors(db: Session, context: JobContext) -> Dict[str, Any]:
+    return ProteinNeighborService.refresh(
+        db,
+        protein_ids=context.params.get("protein_ids"),
+        full=context.params.get("full", False),
+        context=context
+    )
+
+@job_handler("motif_scan")
+def run_motif_scan(db: Session, context: JobContext) -> Dict[str, Any]:
+    specs = MotifScanService.motif_specs(
+        context.params.get("patterns"),
+        include_library=context.params.get("include_library", False),
+        library_path=settings.prosite_patterns_path
+    )
+    search = ProteinSearch(**context.params["search"]) if context.params.get("search") else None
+    return MotifScanService.scan(
+        db,
+        context.job_id,
+        specs,
+        search=search,
+        chunk_size=context.params.get("chunk_size"),
+        workers=context.params.get("workers"),
+        context=context
+    )
+
+@job_handler("sequence_cluster")
+def run_sequence_cluster(db: Session, context: JobContext) -> Dict[str, Any]:
+    search = ProteinSearch(**context.params["search"]) if context.params.get("search") else None
+    return ClusterService.cluster(
+        db,
+        context.job_id,
+        threshold=context.params.get("threshold", 0.9),
+        word_size=context.params.get("word_size"),
+        search=search,
+        batch_size=context.params.get("batch_size"),
+        max_candidates=context.params.get("max_candidates"),
+        workers=context.params.get("workers"),
+        context=context
+    )
+
+@job_handler("duplicate_report")
+def run_duplicate_report(db: Session, context: JobContext) -> Dict[str, Any]:
+    threshold = context.params.get("threshold", settings.duplicate_identity_threshold)
+    report = DuplicateService.report(db, threshold=threshold, context=context)
+    clusters = report.pop("clusters")
+    edges = report.pop("edges")
+
+    path = job_path("reports", f"duplicates-{context.job_id}.ndjson")
+    with open(path, "w", encoding="utf-8") as out:
+        for number, members in enumerate(clusters, start=1):
+            out.write(json.dumps({"cluster": number, "size": len(members), "protein_ids": members}) + "\n")
+        for edge in edges:
+            out.write(json.dumps({"pair": edge}) + "\n")
+
+    return {
+        "path": path,
+        "filename": "duplicates.ndjson",
+        "media_type": "application/x-ndjson",
+        "clusters": len(clusters),
+        **report
+    }
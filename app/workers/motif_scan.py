@@ -0,0 +1,20 @@
+import numpy as np
+from typing import Any, Dict, Optional, Sequence, Tuple
+from app.utils.motifs import Motif, MotifScanner
+from app.utils.sequence_store import SequenceStore
+
+MotifSpec = Tuple[str, str, Optional[str]]
+
+_scanner: Optional[MotifScanner] = None
+_store: Optional[SequenceStore] = None
+
+def init_worker(specs: Sequence[MotifSpec], directory: str, manifest: Dict[str, Any]):
+    global _scanner, _store
+    _scanner = MotifScanner(Motif(name, pattern, description) for name, pattern, description in specs)
+    _store = SequenceStore(directory, manifest)
+
+def scan_positions(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    hits = _scanner.scan_many(_store.sequences(positions.tolist()))
+    lengths = [len(found) for found in hits]
+    rows = np.array([hit for found in hits for hit in found], dtype=np.int32).reshape(-1, 3)
+    return np.repeat(_store.ids[positions], lengths), rows[:, 0], rows[:, 1] + 1, rows[:, 2]
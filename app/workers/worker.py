@@ -0,0 +1,98 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from typing import List, Optional
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+from app.services.job_service import JobService, JobContext, JobCancelled
+from app.workers.handlers import HANDLERS
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+class Worker:
+    def __init__(self, worker_id: Optional[str] = None, kinds: Optional[List[str]] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = kinds or list(HANDLERS)
+        self.stopping = False
+        self.last_recovery = 0.0
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def run(self, once: bool = False):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info("Worker %s started for %s", self.worker_id, ", ".join(self.kinds))
+
+        while not self.stopping:
+            self.recover_stale()
+            if not self.run_next():
+                if once:
+                    break
+                JobService.wait_for_work(settings.job_poll_interval)
+
+    def recover_stale(self):
+        now = time.monotonic()
+        if now - self.last_recovery < settings.job_poll_interval:
+            return
+        self.last_recovery = now
+
+        db = SessionLocal()
+        try:
+            requeued = JobService.requeue_stale(db, settings.job_stale_after, settings.job_max_attempts)
+            if requeued:
+                logger.warning("Requeued %s stale jobs", requeued)
+        finally:
+            db.close()
+
+    def run_next(self) -> bool:
+        db = SessionLocal()
+        try:
+            job = JobService.claim(db, self.worker_id, self.kinds)
+            if not job:
+                return False
+            self.execute(db, job)
+            return True
+        finally:
+            db.close()
+
+    def execute(self, db, job: Job):
+        context = JobContext(job.id, job.params, job.created_by)
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(context, stop_heartbeat), daemon=True
+        )
+        heartbeat.start()
+
+        work_db = SessionLocal()
+        try:
+            result = HANDLERS[job.kind](work_db, context)
+            if context.cancelled:
+                JobService.mark_cancelled(db, job)
+            else:
+                JobService.complete(db, job, result)
+        except JobCancelled:
+            work_db.rollback()
+            JobService.mark_cancelled(db, job)
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            work_db.rollback()
+            JobService.fail(db, job, str(e))
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+            work_db.close()
+
+    def _heartbeat(self, context: JobContext, stop: threading.Event):
+        interval = max(1, settings.job_stale_after // 3)
+        while not stop.wait(interval):
+            try:
+                context.heartbeat()
+            except Exception:
+                logger.exception("Heartbeat failed for job %s", context.job_id)
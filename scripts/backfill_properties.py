@@ -0,0 +1,24 @@
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import SessionLocal
+from app.services.protein_service import ProteinService
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute stored sequence properties for proteins that lack them")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = ProteinService.backfill_properties(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Updated {updated} proteins")
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.core.database import engine, Base
-from app.models import User, Protein, ProteinVersion, AuditLog
+from app.models import User, Protein, ProteinVersion, AuditLog, ImportJob, Job, SequenceIndexState, SequenceIndexBlock, KmerPosting, MotifScanHit, ClusterAssignment, SpectrumIndexState, SpectrumBlock, ProteinNeighbor
 from app.core.security import get_password_hash
 from app.models.user import UserRole
 from sqlalchemy.orm import Session
@@ -0,0 +1,41 @@
+import sys
+import argparse
+import logging
+import multiprocessing
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import get_settings
+
+def run_worker(kinds, once):
+    from app.workers.worker import Worker
+    Worker(kinds=kinds).run(once=once)
+
+def main():
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Run Protein Lab background job workers")
+    parser.add_argument("--concurrency", type=int, default=settings.job_worker_concurrency)
+    parser.add_argument("--kinds", nargs="*", help="Only run jobs of these kinds")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+
+    if args.concurrency <= 1:
+        run_worker(args.kinds, args.once)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(args.kinds, args.once), name=f"worker-{i}")
+        for i in range(args.concurrency)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
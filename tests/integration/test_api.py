@@ -1,9 +1,34 @@
 import pytest
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from app.api.main import app
+from app.core.database import get_async_db
+from app.utils.dependencies import get_current_active_user
 
 client = TestClient(app)
 
+class FakeSession:
+    def __init__(self, rows, protein=None):
+        self.rows = rows
+        self.protein = protein
+
+    async def execute(self, query):
+        return self.rows
+
+    async def scalar(self, query):
+        return self.protein
+
+def _related(session, protein_id):
+    async def get_db():
+        yield session
+
+    app.dependency_overrides[get_async_db] = get_db
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=1, is_active=True)
+    try:
+        return client.get(f"/api/proteins/{protein_id}/related")
+    finally:
+        app.dependency_overrides.clear()
+
 class TestAPI:
     def test_root_endpoint(self):
         response = client.get("/")
@@ -29,3 +54,17 @@ class TestAPI:
     def test_proteins_endpoint_unauthorized(self):
         response = client.get("/api/proteins/")
         assert response.status_code == 401
+
+    def test_related_proteins(self):
+        row = SimpleNamespace(
+            neighbor_id=7, uniprot_id="P12345", name="Insulin", organism=None, length=110, distance=0.123456
+        )
+        response = _related(FakeSession([row]), 3)
+        assert response.status_code == 200
+        assert response.json() == [{
+            "protein_id": 7, "uniprot_id": "P12345", "name": "Insulin", "organism": None, "length": 110,
+            "distance": 0.1235
+        }]
+
+        assert _related(FakeSession([], protein=SimpleNamespace(id=3)), 3).json() == []
+        assert _related(FakeSession([]), 3).status_code == 404
@@ -0,0 +1,73 @@
+import threading
+import time
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCache, TwoTierCache, make_key, cache_result
+from app.schemas.protein import ProteinSearch
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(max_entries=2, ttl=60)
+        lru.set("a", b"1")
+        lru.set("b", b"2")
+        lru.get("a")
+        lru.set("c", b"3")
+        assert lru.get("b") is None
+        assert lru.get("a") == b"1"
+        assert lru.get("c") == b"3"
+
+    def test_entries_expire(self):
+        lru = LRUCache(max_entries=10, ttl=0.01)
+        lru.set("a", b"1")
+        time.sleep(0.02)
+        assert lru.get("a") is None
+
+class TestCacheKeys:
+    def test_keys_are_canonical_and_bounded(self):
+        key1 = make_key("p", search=ProteinSearch(organism="Homo sapiens"), limit=10)
+        key2 = make_key("p", limit=10, search=ProteinSearch(organism="Homo sapiens"))
+        assert key1 == key2
+        assert len(key1) == len("cache:p:") + 32
+
+    def test_positional_and_keyword_calls_share_a_key(self):
+        @cache_result(expire=60, key_prefix="test")
+        def lookup(db, protein_id):
+            return protein_id
+
+        assert lookup.cache_key(Session(), 5) == lookup.cache_key(protein_id=5)
+
+class TestTwoTierCache:
+    def test_single_flight(self):
+        tier = TwoTierCache(LRUCache(ttl=60))
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"value": 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(tier.get_or_compute("k", compute, 60)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"value": 42}] * 8
+        stats = tier.stats.snapshot()
+        assert stats["misses"] == 1
+        assert stats["local_hits"] == 7
+
+    def test_tag_invalidation(self):
+        tier = TwoTierCache(LRUCache(ttl=60))
+        key = tier.tagged_key("k", tier.generations(["protein:1"]))
+        tier.set(key, "old", 60)
+
+        tier.invalidate_tags("protein:1")
+        fresh_key = tier.tagged_key("k", tier.generations(["protein:1"]))
+        assert fresh_key != key
+        assert tier.get_or_compute(fresh_key, lambda: "new", 60) == "new"
+        assert tier.generations(["protein:2"]) == [0]
@@ -0,0 +1,122 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from app.services.cluster_service import ClusterService
+from app.utils.clustering import (
+    WordIndex, banded_identity, best_diagonal, encode_sequence, required_words, word_size_for, words
+)
+from app.utils.sequence_search import load_matrix
+from app.utils.sequence_store import SequenceStore, SequenceStoreWriter
+from app.workers.clustering import init_worker, pair_identities
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+def _identity(query, subject, gap_open=11, gap_extend=1):
+    alphabet, substitution = load_matrix("BLOSUM62")
+    neg = (float("-inf"), 0)
+    h = [[(0, 0)] * (len(subject) + 1)] + [[neg] * (len(subject) + 1) for _ in query]
+    e = [[neg] * (len(subject) + 1) for _ in range(len(query) + 1)]
+    for i in range(1, len(query) + 1):
+        f = neg
+        for j in range(len(subject) + 1):
+            e[i][j] = max((e[i - 1][j][0] - gap_extend, e[i - 1][j][1]),
+                          (h[i - 1][j][0] - gap_open - gap_extend, h[i - 1][j][1]))
+            best = e[i][j]
+            if j:
+                f = max((f[0] - gap_extend, f[1]), (h[i][j - 1][0] - gap_open - gap_extend, h[i][j - 1][1]))
+                score = substitution[alphabet.index(query[i - 1]), alphabet.index(subject[j - 1])]
+                diag = (h[i - 1][j - 1][0] + int(score), h[i - 1][j - 1][1] + (query[i - 1] == subject[j - 1]))
+                best = max(best, diag, f)
+            h[i][j] = best
+    return max(h[-1])[1] / len(query)
+
+def _mutate(rng, sequence, rate):
+    out = []
+    for residue in sequence:
+        roll = rng.random()
+        if roll < rate * 0.6:
+            out.append(rng.choice(AMINO_ACIDS))
+        elif roll < rate * 0.8:
+            continue
+        elif roll < rate:
+            out.append(residue + rng.choice(AMINO_ACIDS))
+        else:
+            out.append(residue)
+    return "".join(out) or "W"
+
+class TestClustering:
+    def test_banded_identity_matches_full_alignment(self):
+        rng = random.Random(5)
+        queries, subjects, diagonals = [], [], []
+        for _ in range(30):
+            subject = "".join(rng.choice(AMINO_ACIDS) for _ in range(rng.randint(10, 40)))
+            queries.append(_mutate(rng, subject[rng.randint(0, 5):], rng.choice([0.0, 0.1, 0.3, 0.6])))
+            subjects.append(subject)
+            diagonals.append(best_diagonal(words(queries[-1], 2), words(subject, 2)))
+
+        identities = banded_identity(
+            [encode_sequence(query) for query in queries], [encode_sequence(subject) for subject in subjects],
+            diagonals, band=60
+        )
+        assert np.allclose(identities, [_identity(query, subject) for query, subject in zip(queries, subjects)])
+
+    def test_best_diagonal_and_word_filter(self):
+        subject = "MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQ"
+        query = subject[7:]
+        assert best_diagonal(words(query, 3), words(subject, 3)) == 7
+        assert word_size_for(0.9) == 5 and word_size_for(0.5) == 3 and word_size_for(0.4) == 2
+        with pytest.raises(ValueError):
+            word_size_for(0.2)
+        codes = np.unique(words(query, 5)[0])
+        assert required_words(len(query), len(codes), 1.0, 5) == len(codes)
+        assert required_words(len(query), len(codes), 0.5, 5) == 1
+
+    def test_word_index_counts_shared_words(self):
+        index = WordIndex()
+        index.add([0, 1], [np.array([1, 2, 3]), np.array([3, 4])])
+        index.add([2], [np.array([4, 5, 6, 7, 8])])
+        owners, counts = index.shared(np.array([3, 4, 8, 9]))
+        assert dict(zip(owners.tolist(), counts.tolist())) == {0: 1, 1: 2, 2: 2}
+        assert len(index) == 10
+
+    def test_pair_identities_from_store(self, tmp_path):
+        writer = SequenceStoreWriter(str(tmp_path), 1)
+        rows = [(1, "MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQ"), (2, "KTAYIAKQRQISFVKSHFSRQ"), (3, "GSHMLEDPVDAFQ")]
+        manifest = writer.commit(*writer.append(rows))
+        init_worker(str(tmp_path), manifest, 3)
+        positions = SequenceStore.open(str(tmp_path)).positions([1, 2, 3])
+
+        identities = pair_identities(positions[[1, 2]], positions[[0, 0]])
+        assert identities[0] == 1.0
+        assert identities[1] < 0.5
+
+    def test_word_size_validation(self):
+        assert ClusterService.word_size(0.9) == 5
+        assert ClusterService.word_size(0.9, 3) == 3
+        with pytest.raises(ValueError):
+            ClusterService.word_size(0.9, 8)
+
+    def test_in_batch_family_joins_one_representative(self, tmp_path):
+        rng = random.Random(11)
+        root = "".join(rng.choice(AMINO_ACIDS) for _ in range(300))
+
+        def substitute(sequence, count):
+            residues = list(sequence)
+            for position in rng.sample(range(len(residues)), count):
+                residues[position] = rng.choice(AMINO_ACIDS.replace(residues[position], ""))
+            return "".join(residues)
+
+        variants = [substitute(root, 18) for _ in range(2)]
+        rows = [(1, root)] + [(protein_id, substitute(variants[protein_id % 2], 3)) for protein_id in range(2, 201)]
+
+        writer = SequenceStoreWriter(str(tmp_path), 1)
+        manifest = writer.commit(*writer.append(rows))
+        store = SequenceStore.open(str(tmp_path))
+        positions = store.positions(list(range(1, 201)))
+        with ThreadPoolExecutor(1, initializer=init_worker, initargs=(str(tmp_path), manifest, 5)) as pool:
+            batches = list(ClusterService.assign(pool, store, positions, 0.9, 5, 2000, 20))
+
+        _, representatives, identities, _ = batches[-1]
+        assert representatives.tolist() == [0] * 200
+        assert (identities[1:] >= 0.9).all()
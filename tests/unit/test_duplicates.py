@@ -0,0 +1,48 @@
+import numpy as np
+from types import SimpleNamespace
+from app.services.duplicate_service import DuplicateService
+from app.utils import alignment
+from app.utils.minhash import fingerprint
+
+class Rows(list):
+    def all(self):
+        return list(self)
+
+class FakeSession:
+    def __init__(self, proteins):
+        self.proteins = proteins
+
+    def execute(self, statement):
+        if "sequence_hash" in [column.name for column in statement.selected_columns]:
+            return Rows()
+        return Rows(
+            SimpleNamespace(
+                id=protein_id, uniprot_id=f"P{protein_id:05d}", name=f"protein {protein_id}", organism=None,
+                sequence=sequence, length=len(sequence), sequence_hash=None, **fingerprint(sequence)
+            )
+            for protein_id, sequence in self.proteins.items()
+        )
+
+def _long_pair():
+    rng = np.random.default_rng(5)
+    sequence = "".join(rng.choice(list("ACDEFGHIKLMNPQRSTVWY"), size=7500))
+    edited = sequence[:2000] + "W" + sequence[2001:5000] + sequence[5004:]
+    return sequence, edited
+
+class TestDuplicates:
+    def test_long_candidates_are_verified(self):
+        sequence, edited = _long_pair()
+        assert (len(sequence) + 1) * (len(edited) + 1) > alignment.MAX_TRACEBACK_CELLS
+
+        matches = DuplicateService.find_duplicates(FakeSession({1: edited}), sequence, threshold=0.95)
+        assert [match["protein_id"] for match in matches] == [1]
+        assert 0.99 < matches[0]["identity"] < 1.0
+
+    def test_report_verifies_long_pairs(self, monkeypatch):
+        sequence, edited = _long_pair()
+        monkeypatch.setattr(DuplicateService, "backfill", lambda db, context=None: 0)
+        monkeypatch.setattr(DuplicateService, "candidate_pairs", lambda db: ({(1, 2)}, 0))
+
+        report = DuplicateService.report(FakeSession({1: sequence, 2: edited}), threshold=0.95)
+        assert report["verified_pairs"] == 1 and report["clusters"] == [[1, 2]]
+        assert report["edges"][0]["identity"] > 0.99
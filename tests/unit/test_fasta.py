@@ -0,0 +1,43 @@
+import gzip
+import io
+from app.utils.fasta import read_fasta, write_fasta, format_record, parse_header
+
+FASTA = b"""; comment
+>sp|P69905|HBA_HUMAN Hemoglobin subunit alpha OS=Homo sapiens OX=9606 GN=HBA1 PE=1 SV=2
+MVLSPADKTN
+VKAAWGKVGA\r
+>empty
+>P12345|Insulin|Homo sapiens
+mk tl
+"""
+
+class TestFasta:
+    def test_read_records(self):
+        records = list(read_fasta(FASTA))
+        assert [title for title, _ in records][1:] == ["empty", "P12345|Insulin|Homo sapiens"]
+        assert [sequence for _, sequence in records] == ["MVLSPADKTNVKAAWGKVGA", "", "mktl"]
+
+    def test_sources_and_block_boundaries(self):
+        expected = list(read_fasta(FASTA))
+        assert list(read_fasta(gzip.compress(FASTA))) == expected
+        assert list(read_fasta(io.StringIO(FASTA.decode()))) == expected
+        assert list(read_fasta(io.BytesIO(FASTA))) == expected
+        for block_size in range(1, 20):
+            assert list(read_fasta(FASTA, block_size=block_size)) == expected
+
+    def test_write_wraps_and_round_trips(self, tmp_path):
+        records = [("long", "A" * 130), ("short", "MKT")]
+        assert format_record("long", "A" * 130).split("\n")[1:] == ["A" * 60, "A" * 60, "A" * 10, ""]
+        path = tmp_path / "out.fasta.gz"
+        assert write_fasta(records, path) == 2
+        assert gzip.open(path).read().startswith(b">long\n")
+        assert list(read_fasta(path)) == records
+
+    def test_parse_header(self):
+        uniprot = parse_header(next(read_fasta(FASTA))[0])
+        assert uniprot == {
+            "uniprot_id": "P69905", "name": "Hemoglobin subunit alpha", "organism": "Homo sapiens", "gene_name": "HBA1"
+        }
+        assert parse_header("P12345|Insulin|Homo sapiens")["organism"] == "Homo sapiens"
+        assert parse_header("UNKNOWN|Insulin")["uniprot_id"] is None
+        assert parse_header("my protein")["name"] == "my protein"
@@ -0,0 +1,20 @@
+import pandas as pd
+from app.services.import_service import ImportService
+
+class TestImport:
+    def test_to_proteins_reports_invalid_rows(self):
+        df = pd.DataFrame(
+            {
+                "name": ["Insulin", "Actin", "Myosin"],
+                "sequence": ["MALWMRLLPL", "MDDDIAALVV", "MSSDSEMAIF"],
+                "length": ["10", "ten", None],
+                "keywords": ["hormone, secreted", None, "motor"]
+            },
+            index=[5, 6, 7]
+        )
+        errors = []
+        proteins, rows = ImportService.to_proteins(df, errors, row_offset=2)
+
+        assert [protein.name for protein in proteins] == ["Insulin", "Myosin"] and rows == [5, 7]
+        assert proteins[0].length == 10 and proteins[0].keywords == ["hormone", "secreted"]
+        assert len(errors) == 1 and errors[0]["row"] == 8 and errors[0]["error"].startswith("length:")
@@ -0,0 +1,63 @@
+import pytest
+from types import SimpleNamespace
+from app.services import job_service
+from app.services.job_service import JobContext, JobCancelled, JobService, settings
+from app.workers.handlers import HANDLERS, _iter_fasta
+
+class TestJobs:
+    def test_handlers_registered(self):
+        assert {"import", "export", "quality_scan"} <= set(HANDLERS)
+
+    def test_context_raises_once_cancelled(self):
+        context = JobContext(job_id=1, params={"format": "csv"})
+        context.check_cancelled()
+        context.cancelled = True
+        with pytest.raises(JobCancelled):
+            context.check_cancelled()
+
+    def test_fasta_export_batches(self):
+        rows = [
+            SimpleNamespace(uniprot_id="P12345", name="Insulin", organism="Homo sapiens", sequence="MALWMRLLPL"),
+            SimpleNamespace(uniprot_id=None, name="Actin", organism=None, sequence="MDDDIAALVV"),
+        ]
+        chunks = list(_iter_fasta(rows, batch_size=1))
+        assert chunks == [">P12345|Insulin|Homo sapiens\nMALWMRLLPL\n", ">UNKNOWN|Actin\nMDDDIAALVV\n"]
+
+    def test_size_params_are_bounded(self, monkeypatch):
+        assert JobService.bounded(None, 2000, 20000) == 2000
+        assert JobService.bounded(10 ** 9, 2000, 20000) == 20000
+        assert JobService.bounded(-5, 2000, 20000) == 1
+        monkeypatch.setattr(settings, "job_max_workers", 4)
+        assert JobService.workers(None, 0) == 4 and JobService.workers(64, 0) == 4 and JobService.workers(None, 2) == 2
+
+    def test_notify_keeps_wakeup_list_bounded(self, monkeypatch):
+        queue = []
+        class Pipeline:
+            def rpush(self, key, value):
+                queue.append(value)
+                return self
+            def ltrim(self, key, start, end):
+                queue[:] = queue[start:]
+                return self
+            def execute(self):
+                pass
+        monkeypatch.setattr(job_service, "redis_client", SimpleNamespace(pipeline=lambda transaction: Pipeline()))
+        for _ in range(job_service.QUEUE_LIMIT * 3):
+            JobService.notify()
+        assert len(queue) == job_service.QUEUE_LIMIT
+
+    def test_enqueue_merged_caps_ids_per_job(self, monkeypatch):
+        monkeypatch.setattr(settings, "job_merge_limit", 4)
+        queued = []
+        monkeypatch.setattr(
+            JobService, "enqueue",
+            lambda db, kind, params, user=None: queued.append(params) or SimpleNamespace(params=params)
+        )
+        db = SimpleNamespace(scalar=lambda query: None)
+        JobService.enqueue_merged(db, "protein_neighbors", "protein_ids", [9, 1, 5, 3, 1, 7, 2])
+        assert queued == [{"protein_ids": [1, 2, 3, 5]}, {"protein_ids": [7, 9]}]
+
+        job = SimpleNamespace(params={"protein_ids": [7, 9]})
+        db = SimpleNamespace(scalar=lambda query: job, commit=lambda: None)
+        assert JobService.enqueue_merged(db, "protein_neighbors", "protein_ids", [8, 9]) is job
+        assert job.params == {"protein_ids": [7, 8, 9]} and len(queued) == 2
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from app.services.kmer_spectrum_service import KmerSpectrumService
+from app.services.sequence_search_service import IndexNotBuilt
+from app.utils.kmer_spectrum import (
+    SpectrumIndex, SpectrumMatrix, from_bytes, spectrum, spectrum_values, superseded, to_bytes
+)
+
+SEQUENCES = ["MKTAYIAKQRQISFVKSHFSRQ", "MKTAYIAKQRQISFVKSHFSRE", "GSHMLEDPVDAFQLGKGAW", "AAAAAAAA"]
+
+def _dense(sequence):
+    vector = np.zeros(8000)
+    indices, counts = spectrum(sequence)
+    vector[indices] = counts
+    return vector
+
+class TestKmerSpectrum:
+    def test_spectrum_round_trip(self):
+        indices, counts = spectrum("aaaAC")
+        assert indices.tolist() == [0, 1] and counts.tolist() == [2, 1]
+        restored = from_bytes(to_bytes((indices, counts)))
+        assert restored[0].tolist() == [0, 1] and restored[1].tolist() == [2, 1]
+        assert spectrum_values("MK") == {"kmer_spectrum": None}
+
+    def test_scores_match_dense_computation(self):
+        index = SpectrumIndex(SpectrumMatrix.from_sequences(SEQUENCES))
+        queries = SpectrumMatrix.from_sequences(["MKTAYIAKQRQISFVKSHF", "AAAAAC"])
+        cosine, jaccard, shared = index.scores(queries)
+
+        for row, query in enumerate(["MKTAYIAKQRQISFVKSHF", "AAAAAC"]):
+            for column, subject in enumerate(SEQUENCES):
+                a, b = _dense(query), _dense(subject)
+                assert cosine[row, column] == pytest.approx(a @ b / np.linalg.norm(a) / np.linalg.norm(b))
+                both, either = ((a > 0) & (b > 0)).sum(), ((a > 0) | (b > 0)).sum()
+                assert shared[row, column] == both
+                assert jaccard[row, column] == pytest.approx(both / either)
+
+    def test_best_matches(self):
+        index = SpectrumIndex(SpectrumMatrix.from_sequences(SEQUENCES))
+        queries = SpectrumMatrix.from_sequences([SEQUENCES[0]])
+
+        positions, cosine, _, _ = index.best_matches(queries, limit=2)[0]
+        assert positions.tolist() == [0, 1] and cosine[0] == pytest.approx(1.0)
+        positions = index.best_matches(queries, metric="jaccard", exclude=np.array([True, False, False, False]))[0][0]
+        assert positions.tolist() == [1]
+        assert not len(index.best_matches(queries, min_score=0.99, exclude=np.array([1, 0, 0, 0], dtype=bool))[0][0])
+        with pytest.raises(ValueError):
+            index.best_matches(queries, metric="euclidean")
+
+    def test_empty_index(self):
+        index = SpectrumIndex(SpectrumMatrix.from_rows([]))
+        positions = index.best_matches(SpectrumMatrix.from_sequences(SEQUENCES[:2]))[0][0]
+        assert len(index) == 0 and not len(positions)
+
+    def test_superseded_keeps_latest_copy(self):
+        masks = superseded([np.array([1, 2, 3]), np.array([2, 4]), np.array([3, 2])])
+        assert [mask.tolist() for mask in masks] == [[False, True, True], [True, False], [False, False]]
+        assert superseded([]) == []
+
+    def test_rank_requires_built_index(self):
+        with pytest.raises(IndexNotBuilt, match="kmer_spectrum"):
+            KmerSpectrumService.rank(SimpleNamespace(get=lambda model, key: None), sequences=SEQUENCES[:1])
@@ -0,0 +1,35 @@
+from app.utils.minhash import (
+    NUM_HASHES, BANDS, signature, band_hashes, estimate_jaccard, jaccard_floor, fingerprint, from_bytes
+)
+from app.services.duplicate_service import DuplicateService
+
+SEQUENCE = "MKTLLLTLVVVTIVFPSSLGLDLWKRAEHCGQMNPYRSTVWACDEFGHIKLMNPQRSTVWYMKTLLLTLVVV"
+
+class TestMinHash:
+    def test_signature_is_deterministic(self):
+        first = signature(SEQUENCE)
+        assert len(first) == NUM_HASHES
+        assert (first == signature(SEQUENCE.lower())).all()
+        assert signature("MKT") is None
+
+    def test_near_duplicates_share_a_band(self):
+        variant = SEQUENCE[:30] + "A" + SEQUENCE[31:]
+        first, second = signature(SEQUENCE), signature(variant)
+        assert len(band_hashes(first)) == BANDS
+        assert set(band_hashes(first).tolist()) & set(band_hashes(second).tolist())
+        assert estimate_jaccard(first, second)[0] >= jaccard_floor(0.95)
+
+    def test_unrelated_sequences_estimate_low(self):
+        other = "GGSGGSPPAPPAGGSGGSPPAPPAGGSGGSPPAPPAGGSGGSPPAPPA"
+        assert estimate_jaccard(signature(SEQUENCE), signature(other))[0] < 0.1
+
+    def test_fingerprint_round_trip(self):
+        values = fingerprint(SEQUENCE)
+        assert (from_bytes(values["minhash"]) == signature(SEQUENCE)).all()
+        assert values["minhash_bands"] == band_hashes(signature(SEQUENCE)).tolist()
+        assert fingerprint(None) == {"minhash": None, "minhash_bands": None}
+
+    def test_candidate_requires_similar_length(self):
+        sig = signature(SEQUENCE)
+        assert DuplicateService.is_candidate(len(SEQUENCE), sig, len(SEQUENCE), sig, 0.95)
+        assert not DuplicateService.is_candidate(len(SEQUENCE), sig, len(SEQUENCE) * 2, sig, 0.95)
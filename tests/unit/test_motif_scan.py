@@ -0,0 +1,25 @@
+import pytest
+from app.services.motif_scan_service import MotifScanService
+from app.utils.sequence_store import SequenceStore, SequenceStoreWriter
+from app.workers.motif_scan import init_worker, scan_positions
+
+class TestMotifScan:
+    def test_scan_store_positions(self, tmp_path):
+        writer = SequenceStoreWriter(str(tmp_path), 1)
+        manifest = writer.commit(*writer.append([(7, "MRGDSAAE"), (9, "AAAA"), (12, "RGD")]))
+        init_worker([("rgd", "R-G-D", None), ("casein", "[ST]-x(2)-[DE]", None)], str(tmp_path), manifest)
+        store = SequenceStore.open(str(tmp_path))
+
+        protein_ids, motifs, starts, ends = scan_positions(store.positions([7, 9, 12]))
+
+        hits = list(zip(protein_ids.tolist(), motifs.tolist(), starts.tolist(), ends.tolist()))
+        assert hits == [(7, 0, 2, 4), (7, 1, 5, 8), (12, 0, 1, 3)]
+
+    def test_motif_specs(self):
+        specs = MotifScanService.motif_specs({"rgd": "R-G-D"}, include_library=True)
+        assert specs[-1] == ("rgd", "R-G-D", None)
+        assert any(name == "PS00016" for name, _, _ in specs)
+        with pytest.raises(ValueError):
+            MotifScanService.motif_specs({"bad": "R-(G"})
+        with pytest.raises(ValueError):
+            MotifScanService.motif_specs()
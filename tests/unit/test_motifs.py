@@ -0,0 +1,44 @@
+import pytest
+from app.utils.motifs import AhoCorasick, Motif, MotifScanner, PatternError, compile_prosite
+
+class TestMotifs:
+    def test_compile_prosite(self):
+        assert compile_prosite("[ST]-x(2)-[DE]") == "[ST].{2}[DE]"
+        assert compile_prosite("<M-{P}-[G>]") == "^M[^P](?:G|$)"
+        assert compile_prosite("[KRHQSA]-[DENQ]-E-L>.") == "[KRHQSA][DENQ]EL$"
+        with pytest.raises(PatternError):
+            compile_prosite("[ST]-x(3,2)")
+
+    def test_aho_corasick_reports_overlapping_words(self):
+        automaton = AhoCorasick(["TLL", "LL", "LLT"])
+        assert sorted(automaton.iter_matches("MTLLLT")) == [(1, 0), (2, 1), (3, 1), (3, 2)]
+
+    def test_scanner_matches_regex(self):
+        patterns = {
+            "casein": "[ST]-x(2)-[DE]",
+            "tyrosine": "[RK]-x(2,3)-[DE]-x(2,3)-Y",
+            "literal": "G-K-S",
+            "start": "<M-K",
+            "end": "[ST]-x-[RK]>",
+            "tail": "L-x-[V>]"
+        }
+        sequences = ["MKTSAKDEEGYRKSAEDAALYGKSLGKSTLRK", "MKLSV", "ASTLV"]
+        scanner = MotifScanner.from_patterns(patterns)
+        for sequence, hits in zip(sequences, scanner.scan_many(sequences)):
+            expected = sorted(
+                (index, match.start(), match.end())
+                for index, motif in enumerate(scanner.motifs)
+                for match in motif.finditer(sequence)
+            )
+            assert sorted(hits) == expected
+
+    def test_scan_reports_one_based_positions(self):
+        hits = MotifScanner.prosite().scan("MKTANRGDSLLNGSA")
+        assert {"pattern": "PS00016", "description": "Cell attachment sequence", "start": 6, "end": 8,
+                "match": "RGD"} in hits
+        assert any(hit["pattern"] == "PS00001" and hit["match"] == "NGSA" for hit in hits)
+
+    def test_literal_patterns_use_automaton(self):
+        scanner = MotifScanner([Motif("rgd", "R-G-D"), Motif("casein", "[ST]-x(2)-[DE]")])
+        assert scanner.literals == [0]
+        assert scanner.scan("RGDSAAE")[0]["pattern"] == "rgd"
@@ -0,0 +1,81 @@
+import random
+import numpy as np
+import pytest
+from app.utils.alignment import align
+from app.utils.msa import align_profiles, align_sequences, kmer_distances, upgma, neighbor_joining, newick
+from app.utils.sequence_search import load_matrix, encode
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+def _mutate(rng, sequence, rate=0.2):
+    out = []
+    for residue in sequence:
+        roll = rng.random()
+        if roll < rate * 0.6:
+            out.append(rng.choice(AMINO_ACIDS))
+        elif roll < rate * 0.8:
+            continue
+        elif roll < rate:
+            out.append(residue + rng.choice(AMINO_ACIDS))
+        else:
+            out.append(residue)
+    return "".join(out)
+
+class TestMsa:
+    def test_pairwise_merge_matches_global_alignment(self):
+        rng = random.Random(3)
+        alphabet, substitution = load_matrix("BLOSUM62")
+        for _ in range(20):
+            first = "".join(rng.choice(AMINO_ACIDS) for _ in range(rng.randint(1, 50)))
+            second = _mutate(rng, first, 0.5) or "W"
+            rows = align_profiles(encode(first, alphabet)[None, :], encode(second, alphabet)[None, :])
+
+            score, previous = 0, None
+            for a, b in rows.T:
+                state = "first" if a == len(alphabet) else "second" if b == len(alphabet) else None
+                if state is None:
+                    score += int(substitution[a, b])
+                else:
+                    score -= 1 if state == previous else 12
+                previous = state
+            assert score == align(first, second, mode="global")["score"]
+
+    def test_guide_trees(self):
+        sequences = ["MKTAYIAKQRQISFVKSHFSRQ", "MKTAYIAKQRQISFVKSHFSRE", "GSHMLEDPVDAFQLGKGAW", "GSHMLEDPVDAFQLGKGAY"]
+        distances = kmer_distances(sequences)
+        assert np.allclose(distances, distances.T)
+        assert distances[0, 1] < distances[0, 2]
+
+        pairs = {frozenset(merge[:2]) for merge in upgma(distances)}
+        assert frozenset((0, 1)) in pairs and frozenset((2, 3)) in pairs
+        joins = neighbor_joining(distances)
+        assert len(joins) == 3 and frozenset(joins[0][:2]) in (frozenset((0, 1)), frozenset((2, 3)))
+        assert newick(upgma(distances), ["a", "b", "c d", "e"]).count("(") == 3
+        assert "'c d'" in newick(upgma(distances), ["a", "b", "c d", "e"])
+
+    @pytest.mark.parametrize("tree", ["upgma", "nj"])
+    def test_alignment_preserves_sequences(self, tree):
+        rng = random.Random(7)
+        root = "".join(rng.choice(AMINO_ACIDS) for _ in range(80))
+        sequences = [_mutate(rng, root) for _ in range(40)] + ["xxMKT"]
+        result = align_sequences(sequences, tree=tree, workers=1)
+
+        assert [row["id"] for row in result["sequences"]][-1] == "seq41"
+        assert {len(row["aligned"]) for row in result["sequences"]} == {result["length"]}
+        assert len(result["consensus"]) == result["length"]
+        assert [row["aligned"].replace("-", "") for row in result["sequences"]] == [s.upper() for s in sequences]
+        assert result["consensus"].count(".") < result["length"] / 2
+
+    def test_parallel_matches_serial(self):
+        rng = random.Random(11)
+        root = "".join(rng.choice(AMINO_ACIDS) for _ in range(60))
+        sequences = [_mutate(rng, root) for _ in range(36)]
+        assert align_sequences(sequences, workers=2) == align_sequences(sequences, workers=1)
+
+    def test_rejects_invalid_input(self):
+        with pytest.raises(ValueError):
+            align_sequences(["MKT"])
+        with pytest.raises(ValueError):
+            align_sequences(["MKT", "  "])
+        with pytest.raises(ValueError):
+            align_sequences(["MKT", "MKV"], tree="clustal")
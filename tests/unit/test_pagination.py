@@ -0,0 +1,16 @@
+import pytest
+from app.utils.pagination import encode_cursor, decode_cursor
+
+class TestPagination:
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(["Insulin", 42])
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == ["Insulin", 42]
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_empty_cursor_payload(self):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor([]))
@@ -0,0 +1,101 @@
+import pytest
+from types import SimpleNamespace
+from app.models.audit_log import AuditLog, AuditAction
+from app.models.protein import Protein, ProteinVersion
+from app.schemas.protein import ProteinCreate
+from app.services import protein_service
+from app.services.protein_service import ProteinService
+
+class FakeSession:
+    def __init__(self, existing):
+        self.uniprot_ids = set(existing)
+        self.next_id = 1
+        self.rows = {"proteins": [], "protein_versions": [], "audit_logs": []}
+        self.commits = 0
+
+    def scalars(self, statement, rows=None):
+        if rows is None:
+            return iter(self.uniprot_ids)
+        ids = list(range(self.next_id, self.next_id + len(rows)))
+        self.next_id += len(rows)
+        self.uniprot_ids.update(row["uniprot_id"] for row in rows if row["uniprot_id"])
+        self.rows[statement.table.name].extend(rows)
+        return SimpleNamespace(all=lambda: ids)
+
+    def execute(self, statement, rows):
+        self.rows[statement.table.name].extend(rows)
+
+    def commit(self):
+        self.commits += 1
+
+def _protein(uniprot_id, name):
+    return ProteinCreate(uniprot_id=uniprot_id, name=name, sequence="MKTAYIAKQRQISFVKSHFSRQ")
+
+@pytest.fixture
+def side_effects(monkeypatch):
+    calls = {"tags": [], "vectors": [], "neighbors": []}
+    monkeypatch.setattr(protein_service, "invalidate_tags", lambda *tags: calls["tags"].extend(tags))
+    monkeypatch.setattr(
+        protein_service.VectorIndexService, "insert", lambda proteins: calls["vectors"].extend(proteins)
+    )
+    monkeypatch.setattr(
+        ProteinService, "queue_neighbors", lambda db, ids, user=None: calls["neighbors"].extend(ids)
+    )
+    return calls
+
+class TestProteinBulk:
+    def test_partition_chunk_flags_duplicates(self):
+        chunk = [_protein("P1", "a"), _protein("P2", "b"), _protein("P1", "c"), _protein(None, "d"), _protein(None, "e")]
+        seen = {"P9"}
+        accepted, results = ProteinService._partition_chunk(chunk + [_protein("P9", "f")], 10, {"P2"}, seen)
+
+        assert [index for index, _ in accepted] == [10, 13, 14]
+        assert [result["status"] for result in results] == [
+            "created", "conflict", "conflict", "created", "created", "conflict"
+        ]
+        assert [result["index"] for result in results] == list(range(10, 16))
+        assert results[1]["error"] == "Protein with this UniProt ID already exists"
+        assert seen == {"P1", "P9"}
+
+    def test_bulk_create_reports_conflicts_and_writes_history(self, side_effects):
+        db = FakeSession({"X1"})
+        user = SimpleNamespace(id=7)
+        proteins = [
+            _protein("A1", "a"), _protein("B1", "b"), _protein("B1", "b again"),
+            _protein("X1", "existing"), _protein("A1", "a again"), _protein(None, "c"),
+            _protein(None, "d")
+        ]
+        results = ProteinService.bulk_create(db, proteins, user, chunk_size=3)
+
+        assert [(result["status"], result.get("id")) for result in results] == [
+            ("created", 1), ("created", 2), ("conflict", None), ("conflict", None), ("conflict", None),
+            ("created", 3), ("created", 4)
+        ]
+        assert [result["index"] for result in results] == list(range(7))
+        assert db.commits == 3
+
+        assert [row["name"] for row in db.rows[Protein.__tablename__]] == ["a", "b", "c", "d"]
+        assert all(row["created_by"] == 7 and row["length"] == 22 for row in db.rows[Protein.__tablename__])
+        versions = db.rows[ProteinVersion.__tablename__]
+        assert [(row["protein_id"], row["version_number"], row["name"]) for row in versions] == [
+            (1, 1, "a"), (2, 1, "b"), (3, 1, "c"), (4, 1, "d")
+        ]
+        assert all(row["changed_by"] == 7 for row in versions)
+        audits = db.rows[AuditLog.__tablename__]
+        assert [(row["entity_id"], row["action"], row["details"]["uniprot_id"]) for row in audits] == [
+            (1, AuditAction.CREATE, "A1"), (2, AuditAction.CREATE, "B1"), (3, AuditAction.CREATE, None),
+            (4, AuditAction.CREATE, None)
+        ]
+
+        assert side_effects["neighbors"] == [1, 2, 3, 4]
+        assert [protein_id for protein_id, _ in side_effects["vectors"]] == [1, 2, 3, 4]
+        assert {"protein:1", "protein:4", "protein-list"} <= set(side_effects["tags"])
+
+    def test_bulk_create_skips_writes_when_all_conflict(self, side_effects):
+        db = FakeSession({"A1"})
+        results = ProteinService.bulk_create(db, [_protein("A1", "a")], SimpleNamespace(id=1))
+
+        assert results == [{
+            "index": 0, "uniprot_id": "A1", "status": "conflict", "error": "Protein with this UniProt ID already exists"
+        }]
+        assert db.commits == 0 and not any(db.rows.values()) and not side_effects["neighbors"]
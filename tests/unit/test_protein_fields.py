@@ -0,0 +1,24 @@
+import pytest
+from app.schemas.protein import (
+    Protein, ProteinSummary, ProteinView, parse_protein_fields, protein_projection
+)
+
+class TestProteinFields:
+    def test_default_view_is_summary(self):
+        fields = parse_protein_fields(None)
+        assert "sequence" not in fields
+        assert protein_projection(fields) is ProteinSummary
+
+    def test_full_view(self):
+        fields = parse_protein_fields(None, ProteinView.FULL)
+        assert protein_projection(fields) is Protein
+
+    def test_explicit_fields_include_id(self):
+        fields = parse_protein_fields("name, sequence")
+        assert set(fields) == {"id", "name", "sequence"}
+        model = protein_projection(fields)
+        assert set(model.model_fields) == {"id", "name", "sequence"}
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            parse_protein_fields("name,password")
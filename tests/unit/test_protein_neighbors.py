@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from app.services.protein_neighbor_service import ProteinNeighborService
+from app.services.vector_index_service import VectorIndexService, settings
+from app.utils.descriptors import descriptors
+from app.utils.vector_index import VectorIndex, VectorIndexWriter
+
+K = 5
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+def _sequences(count, seed):
+    rng = np.random.default_rng(seed)
+    return ["".join(rng.choice(list(AMINO_ACIDS), size=int(rng.integers(30, 120)))) for _ in range(count)]
+
+def _search(index, protein_ids, k):
+    ids = np.array(protein_ids, dtype=np.int64)
+    rows = index.rows_of(ids)
+    return index.search_many(np.asarray(index.vectors[rows]), k, len(index.centroids), exclude=ids)
+
+def _full(index):
+    ids = np.asarray(index.ids)[np.asarray(index.dead) == 0]
+    return ProteinNeighborService.top_lists(ids.tolist(), *_search(index, ids, K), K)
+
+def _neighbor_ids(lists):
+    return {protein_id: [neighbor_id for neighbor_id, _ in neighbors] for protein_id, neighbors in lists.items()}
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "vector_index_dir", str(tmp_path))
+    sequences = _sequences(300, 0)
+    ids = np.arange(1, len(sequences) + 1, dtype=np.int64)
+    VectorIndexWriter(str(tmp_path), 1, descriptors(sequences[:1]).shape[1]).build(
+        ids, descriptors(sequences), synced_at="", max_protein_id=len(ids)
+    )
+    return str(tmp_path)
+
+class TestProteinNeighbors:
+    def test_merge_keeps_top_k(self):
+        current = {1: [(2, 0.1), (3, 0.2), (4, 0.3)], 5: [(6, 0.1)]}
+        candidates = {1: [(7, 0.15), (3, 0.25)], 5: [(8, 0.5)]}
+        merged = ProteinNeighborService.merge(current, candidates, 3)
+        assert merged == {1: [(2, 0.1), (7, 0.15), (3, 0.25)], 5: [(6, 0.1), (8, 0.5)]}
+        assert ProteinNeighborService.merge({1: [(2, 0.1)]}, {1: [(3, 0.9)]}, 1) == {}
+
+    def test_reverse_candidates_skip_pending(self):
+        matches = [(np.array([2, 3]), np.array([0.1, 0.2])), (np.array([1, 4, 2]), np.array([0.1, 0.3, 0.4]))]
+        candidates = ProteinNeighborService.reverse_candidates([1, 5], matches, {1, 5})
+        assert candidates == {2: [(1, 0.1), (5, 0.4)], 3: [(1, 0.2)], 4: [(5, 0.3)]}
+
+    def test_row_radii(self):
+        radii = ProteinNeighborService.row_radii(np.array([4, 1, 9]), np.array([1, 4]), np.array([0.5, np.inf]))
+        assert radii.tolist() == [np.inf, 0.5, -1.0]
+
+    def test_incremental_refresh_matches_full_recompute(self, index_dir):
+        lists = _full(VectorIndex.open(index_dir))
+        added = list(range(301, 311))
+        VectorIndexService.insert(list(zip(added, _sequences(len(added), 1))), blocking=True)
+
+        index = VectorIndex.open(index_dir)
+        ids = np.array(sorted(lists), dtype=np.int64)
+        radii = ProteinNeighborService.row_radii(
+            np.asarray(index.ids), ids, np.array([lists[protein_id][-1][1] for protein_id in ids.tolist()])
+        )
+        vectors = np.asarray(index.vectors[index.rows_of(added)])
+        matches = index.within(vectors, radii, len(index.centroids), exclude=added)
+        candidates = ProteinNeighborService.reverse_candidates(added, matches, set(added))
+        lists.update(ProteinNeighborService.top_lists(added, *_search(index, added, K), K))
+        lists.update(ProteinNeighborService.merge({key: lists[key] for key in candidates}, candidates, K))
+
+        expected = _full(index)
+        assert _neighbor_ids(lists) == _neighbor_ids(expected)
+        assert lists[added[0]] == pytest.approx(expected[added[0]])
+
+    def test_delete_recomputes_stale_lists(self, index_dir):
+        lists = _full(VectorIndex.open(index_dir))
+        deleted = lists[1][0][0]
+        stale = [protein_id for protein_id, neighbors in lists.items() if deleted in dict(neighbors)]
+        VectorIndexService.insert([], [deleted], blocking=True)
+
+        index = VectorIndex.open(index_dir)
+        del lists[deleted]
+        lists.update(ProteinNeighborService.top_lists(stale, *_search(index, stale, K), K))
+
+        assert 1 in stale and index.rows_of([deleted]).tolist() == [-1]
+        assert _neighbor_ids(lists) == _neighbor_ids(_full(index))
@@ -0,0 +1,82 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import select
+from app.models.protein import Protein
+from app.models.user import User
+from app.schemas.protein import ProteinCreate, ProteinUpdate, ProteinSearch, ProteinSort
+from app.services import protein_service
+from app.services.protein_service import ProteinService
+from app.utils.pagination import encode_cursor
+from app.utils.sequence_properties import properties
+
+SEQUENCE = "MKTLLLTLVVVTIVFPSSLGLDLWKRAEHCGQMNPYRSTVW"
+
+class BackfillSession:
+    def __init__(self, batches):
+        self.batches = [
+            [
+                SimpleNamespace(id=protein_id, sequence=SEQUENCE, molecular_weight=None, updated_at=None)
+                for protein_id in ids
+            ]
+            for ids in batches
+        ] + [[]]
+        self.updates = []
+
+    def scalar(self, query):
+        return sum(len(batch) for batch in self.batches)
+
+    def execute(self, statement, rows=None):
+        if rows is not None:
+            self.updates.append(rows)
+            return None
+        return SimpleNamespace(all=self.batches.pop(0).copy)
+
+    def commit(self):
+        pass
+
+class TestProteinProperties:
+    def test_values_are_computed_on_create(self):
+        user = User(id=1)
+        values = ProteinService.protein_values(ProteinCreate(name="Test", sequence=SEQUENCE), user)
+        expected = properties([SEQUENCE])[0]
+        for field in ("molecular_weight", "isoelectric_point", "gravy", "instability_index", "aromaticity"):
+            assert values[field] == expected[field]
+
+    def test_supplied_molecular_weight_is_kept(self):
+        user = User(id=1)
+        rows = ProteinService.protein_rows(
+            [ProteinCreate(name="A", sequence=SEQUENCE, molecular_weight=1234.5), ProteinCreate(name="B", sequence="PETER")],
+            user
+        )
+        assert rows[0]["molecular_weight"] == 1234.5
+        assert rows[1]["isoelectric_point"] == properties(["PETER"])[0]["isoelectric_point"]
+
+    def test_sequence_update_recomputes(self):
+        protein = Protein(sequence=SEQUENCE, version=1, isoelectric_point=1.0, molecular_weight=1.0)
+        ProteinService.apply_update(protein, ProteinUpdate(sequence="DDDDEEEC"), User(id=1))
+        expected = properties(["DDDDEEEC"])[0]
+        assert protein.isoelectric_point == expected["isoelectric_point"]
+        assert protein.molecular_weight == expected["molecular_weight"]
+
+    def test_range_filter(self):
+        query = ProteinService.apply_search(
+            select(Protein.id), ProteinSearch(min_isoelectric_point=5, max_isoelectric_point=7, min_gravy=0)
+        )
+        sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+        assert "proteins.isoelectric_point >= 5" in sql
+        assert "proteins.isoelectric_point <= 7" in sql
+        assert "proteins.gravy >= 0" in sql
+
+    def test_property_cursor(self):
+        assert ProteinService.decode_cursor(encode_cursor([6.5, 3]), ProteinSort.ISOELECTRIC_POINT) == [6.5, 3]
+        with pytest.raises(ValueError):
+            ProteinService.decode_cursor(encode_cursor(["x", 3]), ProteinSort.ISOELECTRIC_POINT)
+
+    def test_backfill_invalidates_each_batch(self, monkeypatch):
+        session = BackfillSession([[1, 2], [3]])
+        tags = []
+        monkeypatch.setattr(protein_service, "invalidate_tags", lambda *bumped: tags.append(bumped))
+
+        assert ProteinService.backfill_properties(session, batch_size=2) == 3
+        assert [[row["id"] for row in rows] for rows in session.updates] == [[1, 2], [3]]
+        assert tags == [("protein:1", "protein:2", "protein-list"), ("protein:3", "protein-list")]
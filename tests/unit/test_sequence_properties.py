@@ -0,0 +1,31 @@
+import pytest
+from Bio.SeqUtils.ProtParam import ProteinAnalysis
+from app.utils.sequence_properties import compute, properties
+from app.utils.validators import ProteinValidator
+
+SEQUENCES = ["MKTLLLTLVVVTIVFPSSLGLDLWKRAEHCGQMNPYRSTVW", "PETER", "INGAR", "DDDDEEEC", "M"]
+
+class TestSequenceProperties:
+    def test_matches_protparam(self):
+        values = compute(SEQUENCES)
+        for index, sequence in enumerate(SEQUENCES):
+            analysis = ProteinAnalysis(sequence)
+            assert values["molecular_weight"][index] == pytest.approx(analysis.molecular_weight(), abs=1e-6)
+            assert values["aromaticity"][index] == pytest.approx(analysis.aromaticity(), abs=1e-9)
+            assert values["instability_index"][index] == pytest.approx(analysis.instability_index(), abs=1e-6)
+            assert values["gravy"][index] == pytest.approx(analysis.gravy(), abs=1e-9)
+            assert values["isoelectric_point"][index] == pytest.approx(analysis.isoelectric_point(), abs=1e-3)
+            assert values["charge_at_ph7"][index] == pytest.approx(analysis.charge_at_pH(7.0), abs=1e-9)
+
+    def test_undefined_values_are_none(self):
+        empty, unknown = properties(["", "MKXB"])
+        assert empty["length"] == 0 and empty["isoelectric_point"] is None
+        assert unknown["molecular_weight"] is None
+        assert unknown["gravy"] is None
+        assert unknown["isoelectric_point"] is not None
+
+    def test_single_sequence_helper(self):
+        assert ProteinValidator.calculate_sequence_properties("") == {}
+        result = ProteinValidator.calculate_sequence_properties("pet er")
+        assert result["length"] == 5
+        assert result["isoelectric_point"] == 4.53
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from app.utils.sequence_search import (
+    kmer_codes, neighborhood, seed_diagonals, best_ungapped_hsp, evalue, bit_score
+)
+from app.services.sequence_search_service import SequenceSearchService, IndexNotBuilt
+
+QUERY = "MKTLLLTLVVVTIVFPSSLGLDLWKRAEHCGQ"
+
+class TestSequenceSearch:
+    def test_kmer_codes_skip_nonstandard_residues(self):
+        assert kmer_codes("AAA").tolist() == [0]
+        assert len(kmer_codes("AAXAA")) == 0
+        assert len(kmer_codes(QUERY)) == len(QUERY) - 2
+
+    def test_neighborhood_contains_exact_words(self):
+        offsets, positions = neighborhood(QUERY)
+        for position, code in enumerate(kmer_codes(QUERY)):
+            assert position in positions[offsets[code]:offsets[code + 1]]
+
+    def test_hsp_locates_embedded_match(self):
+        subject = "GGGGGGGG" + QUERY[5:25] + "PPPPPPPP"
+        offsets, positions = neighborhood(QUERY)
+        diagonals = seed_diagonals(subject, offsets, positions)
+        hsp = best_ungapped_hsp(QUERY, subject, diagonals)
+        assert hsp["query_start"] <= 6 and hsp["query_end"] >= 25
+        assert hsp["subject_aligned"].find(QUERY[5:25]) >= 0
+        assert hsp == best_ungapped_hsp(QUERY, subject)
+
+    def test_evalue_decreases_with_score(self):
+        assert evalue(60, 300, 10 ** 8) < evalue(40, 300, 10 ** 8)
+        assert bit_score(60) > bit_score(40)
+
+    def test_posting_rows_group_proteins_by_kmer(self):
+        rows = SequenceSearchService.posting_rows(1, 0, [(7, "AAAC"), (3, "AAAA")])
+        postings = {row["kmer"]: np.frombuffer(row["protein_ids"], dtype="<i4").tolist() for row in rows}
+        assert postings[0] == [3, 7]
+        assert postings[1] == [7]
+
+    def test_search_requires_built_index(self):
+        for state in (None, SimpleNamespace(built_at=None)):
+            with pytest.raises(IndexNotBuilt, match="sequence_index"):
+                SequenceSearchService.search(SimpleNamespace(get=lambda model, key: state), QUERY)
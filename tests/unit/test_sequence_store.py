@@ -0,0 +1,37 @@
+import numpy as np
+from app.utils.sequence_store import SequenceStore, SequenceStoreWriter, pack
+
+def write_store(directory, rows):
+    writer = SequenceStoreWriter(str(directory), 1)
+    return writer.commit(*writer.append(rows), synced_at="", max_protein_id=max(i for i, _ in rows))
+
+class TestSequenceStore:
+    def test_pack(self):
+        assert pack("mk tl\nLV") == b"MKTLLV"
+
+    def test_round_trip(self, tmp_path):
+        write_store(tmp_path, [(9, "PETER"), (3, "mkt ll"), (12, "")])
+        store = SequenceStore.open(str(tmp_path))
+        assert list(store.ids) == [3, 9, 12]
+        assert store.get(3) == "MKTLL"
+        assert store.get(12) == ""
+        assert store.get(4) is None
+        assert store.positions([12, 5, 9]).tolist() == [2, -1, 1]
+        assert isinstance(store.codes(1), np.memmap)
+
+    def test_append_keeps_open_readers(self, tmp_path):
+        manifest = write_store(tmp_path, [(1, "AAAA"), (2, "CCCC")])
+        reader = SequenceStore.open(str(tmp_path))
+
+        writer = SequenceStoreWriter(str(tmp_path), manifest["generation"], manifest["residues_bytes"])
+        ids, starts, ends = writer.append([(2, "DDD"), (5, "EE")])
+        updated = writer.commit(
+            np.concatenate([reader.ids[:1], ids]), np.concatenate([reader.starts[:1], starts]),
+            np.concatenate([reader.ends[:1], ends])
+        )
+
+        assert reader.sequences([0, 1]) == ["AAAA", "CCCC"]
+        store = SequenceStore.open(str(tmp_path))
+        assert store.sequences(range(len(store))) == ["AAAA", "DDD", "EE"]
+        assert updated["residues_bytes"] == 13
+        assert updated["live_bytes"] == 9
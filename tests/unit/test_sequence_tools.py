@@ -1,4 +1,6 @@
+import numpy as np
 import pytest
+from app.utils import alignment
 from app.utils.sequence_tools import SequenceTools
 
 class TestSequenceTools:
@@ -30,6 +32,67 @@ MKTLLLTLVVVTIVFPSSL"""
         similarity = SequenceTools.calculate_similarity(seq1, seq2)
         assert similarity == 1.0
 
+    def test_calculate_similarity_different_lengths(self):
+        similarity = SequenceTools.calculate_similarity("MKTLLLTLVVVTIVFPSSL", "MKTLLLTLVVTIVFPSSL")
+        assert 0.9 < similarity < 1.0
+
+    def test_similarity_matches_alignment_identity(self):
+        rng = np.random.default_rng(3)
+        for _ in range(50):
+            query = "".join(rng.choice(list("ACDEFGHIKLMNPQRSTVWY"), size=int(rng.integers(5, 80))))
+            subject = "".join(rng.choice(list(query + "WY"), size=int(rng.integers(5, 80))))
+            expected = alignment.align(query, subject, mode="global")["identity"]
+            assert alignment.similarity(query, subject) == expected
+
+    def test_calculate_similarity_beyond_traceback_limit(self):
+        sequence = "MKTAYIAKQRQISFVKSHFSRQ" * 330
+        with pytest.raises(ValueError):
+            SequenceTools.align(sequence, sequence, mode="global")
+        assert SequenceTools.calculate_similarity(sequence, sequence) == 1.0
+
+    def test_sequence_hash_normalizes(self):
+        digest = SequenceTools.sequence_hash("MKTLLLTLVVVTIVFPSSL")
+        assert len(digest) == 64
+        assert SequenceTools.sequence_hash("mktlll tlvvv\ntivfpssl") == digest
+        assert SequenceTools.sequence_hash("MKTLLLTLVVVTIVFPSSA") != digest
+        assert SequenceTools.sequence_hash("") is None
+
+    def test_align_local(self):
+        result = SequenceTools.align("WWWWMKTLLLTLVVVWWWW", "PPPPMKTLLLTLVVVPPPP")
+        assert result["query_aligned"] == "MKTLLLTLVVV"
+        assert result["query_start"] == 5
+        assert result["subject_end"] == 15
+        assert result["identity"] == 1.0
+
+    def test_align_global_gaps(self):
+        result = SequenceTools.align("MKTLLLTLVVVTIVFPSSL", "MKTLLLVVVTIVFPSSL", mode="global")
+        assert result["gaps"] == 2
+        assert result["length"] == 19
+        assert result["subject_aligned"].replace("-", "") == "MKTLLLVVVTIVFPSSL"
+
+    def test_score_alignments_matches_pairwise(self):
+        query = "MKTLLLTLVVVTIVFPSSL"
+        subjects = ["MKTLLLTLVVVTIVFPSSL", "MKTLLLVVVTIVFPSSL", "GGGG", "PSSLMKTLLL"]
+        scores = SequenceTools.score_alignments(query, subjects)
+        assert scores.tolist() == [SequenceTools.align(query, subject)["score"] for subject in subjects]
+
+    def test_score_alignments_paths_agree(self, monkeypatch):
+        query = "MKTLLLTLVVVTIVFPSSLGLDL"
+        subjects = ["MKTLLLVVVTIVFPSSL", "PSSLGGGMKTLLLTLV", "MKTAYIAKQRQISFVKSHFSRQ", "W"]
+        for mode in ("local", "global"):
+            prefix = SequenceTools.score_alignments(query, subjects, mode=mode, gap_open=5, gap_extend=2)
+            monkeypatch.setattr(alignment, "PREFIX_MAX_SUBJECTS", 0)
+            assert SequenceTools.score_alignments(query, subjects, mode=mode, gap_open=5, gap_extend=2).tolist() \
+                == prefix.tolist()
+            monkeypatch.undo()
+            assert prefix.tolist() == [
+                SequenceTools.align(query, subject, mode=mode, gap_open=5, gap_extend=2)["score"] for subject in subjects
+            ]
+
+    def test_align_many_ranks_by_score(self):
+        results = SequenceTools.align_many("MKTLLLTLVVV", ["GGGG", "MKTLLLTLVVV", "MKTLL"], top=2)
+        assert [result["index"] for result in results] == [1, 2]
+
     def test_find_motif(self):
         sequence = "MKTLLLTLVVVTIVFPSSLTLL"
         motif = "TLL"
@@ -0,0 +1,22 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from app.utils.streaming import iter_ndjson, iter_csv
+
+ROWS = [
+    SimpleNamespace(id=1, name="Insulin", keywords=["Hormone"], created_at=datetime(2024, 1, 15)),
+    SimpleNamespace(id=2, name="Actin", keywords=None, created_at=datetime(2024, 2, 1)),
+]
+
+class TestStreaming:
+    def test_ndjson_batches(self):
+        chunks = list(iter_ndjson(ROWS, ["id", "name", "keywords", "created_at"], batch_size=1))
+        assert len(chunks) == 2
+        record = json.loads(chunks[0])
+        assert record == {"id": 1, "name": "Insulin", "keywords": ["Hormone"], "created_at": "2024-01-15T00:00:00"}
+
+    def test_csv_has_header_and_rows(self):
+        lines = "".join(iter_csv(ROWS, ["id", "name", "keywords"])).splitlines()
+        assert lines[0] == "id,name,keywords"
+        assert lines[1] == '1,Insulin,"[""Hormone""]"'
+        assert lines[2] == "2,Actin,"
@@ -1,4 +1,5 @@
 import pytest
+import pandas as pd
 from app.utils.validators import ProteinValidator
 
 class TestProteinValidator:
@@ -53,3 +54,20 @@ class TestProteinValidator:
         score = ProteinValidator.calculate_quality_score(protein_data)
         assert score > 0
         assert score <= 10
+
+    def test_validate_dataframe(self):
+        df = pd.DataFrame({
+            "name": ["Good", "Bad", "Dup", None],
+            "sequence": ["mktl lltlvvvtivf", "MKTLXXX", "MKTLLLTLVVVTIVF", "MKTLLLTLVVVTIVF"],
+            "uniprot_id": ["P12345", "P12346", "P12345", None]
+        })
+        valid, errors, warnings = ProteinValidator.validate_dataframe(df)
+        assert list(valid["name"]) == ["Good"]
+        assert valid["sequence"].iloc[0] == "MKTLLLTLVVVTIVF"
+        assert {error["row"] for error in errors} == {1, 2, 3}
+        assert any(warning["warning"] == "Missing organism" for warning in warnings)
+
+    def test_validate_dataframe_missing_columns(self):
+        valid, errors, _ = ProteinValidator.validate_dataframe(pd.DataFrame({"name": ["A"]}))
+        assert valid.empty
+        assert "sequence" in errors[0]["error"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from app.services.sequence_store_service import SequenceStoreService
+from app.services.vector_index_service import VectorIndexService, settings
+from app.utils.descriptors import DIMENSIONS, descriptors
+from app.utils.vector_index import VectorIndex, VectorIndexWriter, mark_dead, merge_tail, nearest
+
+def _build(directory, vectors):
+    ids = np.arange(1, len(vectors) + 1, dtype=np.int64)
+    VectorIndexWriter(str(directory), 1, vectors.shape[1]).build(ids, vectors, synced_at="", max_protein_id=len(ids))
+    return VectorIndex.open(str(directory))
+
+class TestVectorIndex:
+    def test_descriptors(self):
+        vectors = descriptors(["MKTAYIAKQR", "MKTAYIAKQR", "", "XXXX"])
+        assert vectors.shape == (4, DIMENSIONS) and vectors.dtype == np.float32
+        assert np.array_equal(vectors[0], vectors[1])
+        assert np.isfinite(vectors).all()
+        assert (vectors[0][:20] ** 2).sum() == pytest.approx(1.0)
+
+    def test_search_matches_brute_force(self, tmp_path):
+        vectors = np.random.default_rng(0).normal(size=(2000, 8)).astype(np.float32)
+        index = _build(tmp_path, vectors)
+        query = vectors[17]
+
+        ids, distances = index.search(query, k=5, probes=len(index.centroids))
+        expected = np.argsort(((vectors - query) ** 2).sum(axis=1))[:5] + 1
+        assert ids.tolist() == expected.tolist()
+        assert distances[0] == pytest.approx(0.0, abs=1e-6)
+        assert 18 not in index.search(query, k=5, probes=len(index.centroids), exclude=18)[0].tolist()
+
+    def test_search_many_matches_single_queries(self, tmp_path):
+        vectors = np.random.default_rng(2).normal(size=(1000, 8)).astype(np.float32)
+        index = _build(tmp_path, vectors)
+
+        ids, distances = index.search_many(vectors[:20], k=4, probes=3, exclude=np.arange(1, 21))
+        for row in range(20):
+            single_ids, single_distances = index.search(vectors[row], k=4, probes=3, exclude=row + 1)
+            assert ids[row].tolist() == single_ids.tolist()
+            assert distances[row] == pytest.approx(single_distances)
+        assert (ids[:, None, :] != np.arange(1, 21)[:, None, None]).all()
+
+    def test_tail_append_and_dead_rows(self, tmp_path):
+        vectors = np.random.default_rng(1).normal(size=(500, 8)).astype(np.float32)
+        index = _build(tmp_path, vectors)
+        manifest = index.manifest
+
+        writer = VectorIndexWriter(str(tmp_path), 1, 8, manifest["rows"])
+        moved = np.full((1, 8), 50, dtype=np.float32)
+        rows = writer.append(np.array([3]), moved)
+        superseded = index.rows_of([3])
+        updated = writer.commit(
+            merge_tail(index.tail, nearest(moved, index.centroids), rows), main_rows=manifest["main_rows"],
+            dead=1, synced_at="", max_protein_id=500
+        )
+        mark_dead(str(tmp_path), updated, superseded)
+
+        index = VectorIndex.open(str(tmp_path))
+        assert len(index) == 500 and index.rows_of([3]).tolist() == [500]
+        assert index.search(moved[0], k=1, probes=1)[0].tolist() == [3]
+        mark_dead(str(tmp_path), updated, index.rows_of([3]))
+        assert VectorIndex.open(str(tmp_path)).rows_of([3, 4]).tolist()[0] == -1
+
+    def test_insert_skips_while_index_is_locked(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "vector_index_dir", str(tmp_path))
+        vectors = descriptors(["MKTAYIAKQRQISFVKSHFSRQ", "GSHMLEDPVDAFQLGKGAW", "MSTNPKPQRKTKRNTNRRPQDVKFPGG"])
+        row = _build(tmp_path, vectors).rows_of([1])[0]
+
+        with SequenceStoreService.lock(str(tmp_path)):
+            assert VectorIndexService.insert([(4, "MKTAYIAKQRQISFVKSHFSRE")]) is None
+        assert VectorIndex.open(str(tmp_path)).rows_of([4]).tolist() == [-1]
+
+        manifest = VectorIndexService.insert([(4, "MKTAYIAKQRQISFVKSHFSRE"), (1, "MKTAYIAKQRQISFVKSHFSRQ")])
+        index = VectorIndex.open(str(tmp_path))
+        assert manifest["rows"] == 4 and index.rows_of([4, 1]).tolist() == [3, row]